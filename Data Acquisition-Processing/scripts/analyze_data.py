@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analysis import Analyzer
+import argparse
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate statistics and plots for the dataset")
+    parser.add_argument('--summary', action='store_true', help='Print summary statistics and save source/keyword tables')
+    parser.add_argument('--visualize', action='store_true', help='Save the plots to data/analysis_results')
+    parser.add_argument('--all', action='store_true', help='Run everything')
+    args = parser.parse_args()
+
+    analyzer = Analyzer()
+    if analyzer.df is None:
+        sys.exit(1)
+    if args.summary or args.all or not args.visualize:
+        analyzer.generate_summary()
+    if args.visualize or args.all:
+        analyzer.visualize()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Collection throughput benchmark against the local mock news server.
+Runs each collector end to end (no response cache, temporary output directory) and reports
+wall time, requests per second, 429s, injected errors, client retries and rows kept.
+Needs no network or API keys, so it can run in CI:
+
+    python scripts/bench_collection.py --latency 0.05 --rate-limit 20 --error-rate 0.02 --json bench.json
+"""
+import sys
+import os
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_news_server import MockNewsServer
+
+SCENARIOS = ['newsapi', 'newsapi-async', 'thenewsapi', 'gnews', 'targeted']
+
+
+def configure(server: MockNewsServer, workdir: Path, args):
+    """Point config at the mock server and a scratch directory, before collectors are built."""
+    from src import config
+    from src.scheduling import ProviderQuota
+    import gnews.gnews
+
+    config.NEWS_API_BASE_URL = f"{server.base_url}/v2/everything"
+    config.THENEWSAPI_BASE_URL = f"{server.base_url}/v1/news/all"
+    gnews.gnews.BASE_URL = f"{server.base_url}/rss"
+    config.NEWS_API_KEY = config.THENEWSAPI_KEY = 'mock-key'
+    config.START_DATE, config.END_DATE = args.start, args.end
+    config.GNEWS_YEARS = range(int(args.start[:4]), int(args.end[:4]) + 1)
+
+    config.RAW_ARTICLES_FILE = workdir / 'raw_articles.csv'
+    config.RAW_ARTICLES_THENEWSAPI_FILE = workdir / 'raw_articles_thenewsapi.csv'
+    config.RAW_ARTICLES_GNEWS_FILE = workdir / 'raw_articles_gnews.csv'
+    config.SUPPLEMENTAL_ARTICLES_FILE = workdir / 'supplemental_articles.csv'
+    config.MANIFEST_DIR = workdir / 'manifests'
+    config.PLAN_DIR = workdir / 'plans'
+    config.QUOTA_USAGE_FILE = workdir / 'quota_usage.json'
+    config.RETRY_BACKOFF = args.backoff
+
+    # Client-side pacing for the run; no daily caps
+    for provider in config.PROVIDER_QUOTAS:
+        config.PROVIDER_QUOTAS[provider] = (args.rps, 0)
+    config.NEWS_API_REQUESTS_PER_SECOND = args.rps
+    ProviderQuota._instances.clear()
+
+
+def run_scenario(name: str, server: MockNewsServer):
+    from src.cache import ResponseCache
+    from src.collection import NewsAPICollector, TheNewsAPICollector, GNewsCollector, TargetedCollector
+
+    cache = ResponseCache(enabled=False)
+    collectors = {
+        'newsapi': lambda: NewsAPICollector(cache),
+        'newsapi-async': lambda: NewsAPICollector(cache),
+        'thenewsapi': lambda: TheNewsAPICollector(cache),
+        'gnews': lambda: GNewsCollector(cache),
+        'targeted': lambda: TargetedCollector(cache),
+    }
+    collector = collectors[name]()
+    server.reset_stats()
+    start = time.perf_counter()
+    if name == 'newsapi-async':
+        collector.collect(use_async=True, fresh=True)
+    else:
+        collector.collect(fresh=True)
+    elapsed = time.perf_counter() - start
+
+    statuses = [w['status'] for w in collector.manifest.windows.values()]
+    stats = server.stats
+    return {
+        'scenario': name,
+        'seconds': round(elapsed, 3),
+        'requests': stats['requests'],
+        'requests_per_second': round(stats['requests'] / elapsed, 2) if elapsed else 0,
+        'rate_limited': stats['429'],
+        'server_errors': stats['500'],
+        'client_retries': cache.retries,
+        'windows_done': statuses.count('done'),
+        'windows_failed': statuses.count('failed'),
+        'rows': collector.manifest.rows_written,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark collectors against the mock news server")
+    parser.add_argument('--scenario', choices=SCENARIOS + ['all'], default='all')
+    parser.add_argument('--start', default='2019-01-01', help='Collection start date')
+    parser.add_argument('--end', default='2019-12-31', help='Collection end date')
+    parser.add_argument('--latency', type=float, default=0.05, help='Mock mean latency (seconds)')
+    parser.add_argument('--rate-limit', type=float, default=0, help='Mock server requests/s before 429s')
+    parser.add_argument('--error-rate', type=float, default=0, help='Mock server share of 500 responses')
+    parser.add_argument('--rps', type=float, default=50, help='Client-side request rate per provider')
+    parser.add_argument('--backoff', type=float, default=0.05, help='Client retry backoff base (seconds)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    server = MockNewsServer(latency=args.latency, rate_limit=args.rate_limit,
+                            error_rate=args.error_rate, seed=args.seed).start()
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            configure(server, Path(tmp), args)
+            for name in (SCENARIOS if args.scenario == 'all' else [args.scenario]):
+                print(f"\n=== {name} ===")
+                results.append(run_scenario(name, server))
+    finally:
+        server.stop()
+
+    print("\n" + "=" * 100)
+    print(f"{'scenario':15s} {'seconds':>8s} {'requests':>9s} {'req/s':>7s} {'429s':>6s} {'500s':>6s} "
+          f"{'retries':>8s} {'done':>6s} {'failed':>7s} {'rows':>7s}")
+    for r in results:
+        print(f"{r['scenario']:15s} {r['seconds']:8.2f} {r['requests']:9d} {r['requests_per_second']:7.1f} "
+              f"{r['rate_limited']:6d} {r['server_errors']:6d} {r['client_retries']:8d} "
+              f"{r['windows_done']:6d} {r['windows_failed']:7d} {r['rows']:7d}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+        print(f"\n✓ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
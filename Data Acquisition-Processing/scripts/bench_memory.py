@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Peak memory of the in-memory vs the out-of-core (--chunksize) merge, by input size.
+Generates synthetic raw archives (unique titles plus a share of exact, URL and
+' - Publisher' near-duplicates), runs each merge in a fresh process, and reports peak RSS,
+wall time and whether both paths wrote byte-identical output:
+
+    python scripts/bench_memory.py --sizes 25000 100000 400000 --chunksize 50000 --json mem.json
+"""
+import sys
+import os
+import argparse
+import json
+import resource
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_archive(n: int, workdir: Path, seed: int = 0):
+    """Two raw collector files with n rows in total, in collection (not date) order."""
+    from src import config
+
+    base = pd.read_csv(config.INITIAL_DATASET)
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(sorted({w for t in base['title'].dropna() for w in t.split() if w.isalpha()}))
+    sources = base['source'].dropna().unique()
+
+    titles = [' '.join(rng.choice(vocabulary, rng.integers(7, 14))) for _ in range(n)]
+    urls = [f"https://example{i % 97}.com/news/{i}-{rng.integers(1 << 30)}" for i in range(n)]
+    source = rng.choice(sources, n)
+    # Duplicates of earlier rows: syndicated copies, the same link twice, and the exact title again
+    for i in rng.choice(np.arange(1, n), n // 20, replace=False):
+        j = rng.integers(i)
+        kind = rng.integers(3)
+        if kind == 0:
+            titles[i] = f"{titles[j]} - {source[i]}"
+        elif kind == 1:
+            urls[i] = urls[j] + '?utm_source=feed'
+        else:
+            titles[i] = titles[j]
+    days = rng.integers(0, (pd.Timestamp('2025-12-31') - pd.Timestamp('2015-01-01')).days, n)
+    df = pd.DataFrame({
+        'article_id': [f"B{i}" for i in range(n)],
+        'source': source,
+        'date': (pd.Timestamp('2015-01-01') + pd.to_timedelta(days, unit='D')).strftime('%Y-%m-%d'),
+        'title': titles,
+        'description': [t + ' ' + s for t, s in zip(titles, source)],
+        'url': urls,
+        'snippet': '',
+    })
+    df.iloc[: n // 2].to_csv(workdir / 'raw_articles_thenewsapi.csv', index=False)
+    df.iloc[n // 2:].to_csv(workdir / 'raw_articles_gnews.csv', index=False)
+
+
+def child(mode: str, workdir: Path, chunksize: int):
+    """Run one merge in this process and print its peak RSS."""
+    from src import config
+
+    config.RAW_ARTICLES_THENEWSAPI_FILE = workdir / 'raw_articles_thenewsapi.csv'
+    config.RAW_ARTICLES_GNEWS_FILE = workdir / 'raw_articles_gnews.csv'
+    config.FINAL_ARTICLES_FILE = workdir / mode / 'final_articles.csv'
+    config.NEAR_DUPLICATES_FILE = workdir / mode / 'near_duplicates.csv'
+    config.MERGED_DIR = workdir / mode / 'merged'
+    config.INTERMEDIATE_DIR = workdir / mode
+    (workdir / mode).mkdir(exist_ok=True)
+    from src.processing import DataProcessor
+
+    start = time.perf_counter()
+    DataProcessor().merge_datasets(chunksize=chunksize if mode == 'chunked' else None)
+    seconds = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux
+    print(json.dumps({'seconds': round(seconds, 2), 'peak_rss_mb': round(peak_kb / 1024, 1)}))
+
+
+def run_child(mode: str, workdir: Path, chunksize: int):
+    result = subprocess.run(
+        [sys.executable, __file__, '--child', mode, '--workdir', str(workdir), '--chunksize', str(chunksize)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak RSS of in-memory vs chunked merge by input size")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[25000, 100000, 400000])
+    parser.add_argument('--chunksize', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='Write results to this JSON file')
+    parser.add_argument('--child', choices=['memory', 'chunked'], help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args.child, Path(args.workdir), args.chunksize)
+
+    results = []
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(tmp)
+            make_archive(n, workdir, args.seed)
+            input_mb = sum(f.stat().st_size for f in workdir.glob('*.csv')) / 1e6
+            row = {'rows': n, 'input_mb': round(input_mb, 1)}
+            for mode in ('memory', 'chunked'):
+                print(f"{n:,} rows: {mode} merge...")
+                stats = run_child(mode, workdir, args.chunksize)
+                row.update({f'{mode}_{k}': v for k, v in stats.items()})
+            outputs = [(workdir / mode / 'final_articles.csv').read_bytes() for mode in ('memory', 'chunked')]
+            row['identical'] = outputs[0] == outputs[1]
+            results.append(row)
+
+    print("\n" + "=" * 84)
+    print(f"{'rows':>9s} {'input MB':>9s} {'memory MB':>10s} {'chunked MB':>11s} "
+          f"{'memory s':>9s} {'chunked s':>10s} {'identical':>10s}")
+    for r in results:
+        print(f"{r['rows']:9,d} {r['input_mb']:9.1f} {r['memory_peak_rss_mb']:10.1f} {r['chunked_peak_rss_mb']:11.1f} "
+              f"{r['memory_seconds']:9.2f} {r['chunked_seconds']:10.2f} {str(r['identical']):>10s}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+        print(f"\n✓ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
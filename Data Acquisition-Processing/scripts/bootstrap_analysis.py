@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Confidence intervals for the reported statistics (topic and sentiment shares, chi-square,
+ANOVA, sentiment trend):
+
+    python scripts/bootstrap_analysis.py                      # resample the annotated articles
+    python scripts/annotate_data.py --input data/final_articles.csv --output data/coded_population.csv
+    python scripts/bootstrap_analysis.py --mode sampling --input data/coded_population.csv
+    python scripts/bootstrap_analysis.py --replicates 10000 --workers 8
+
+`bootstrap` resamples the dataset with replacement within each leaning (estimate
+uncertainty); `sampling` redraws the balanced sample of generate_balanced_sample.py from an
+annotated population with the configured targets (how much the results depend on the draw).
+Both need the annotation columns; sampling also needs a population larger than the sample,
+so the annotated sample itself (coded_articles.csv) does not work there.
+"""
+import sys
+import os
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import config
+from src.bootstrap import bootstrap_design, encode, run_bootstrap, sampling_design, statistics
+from src.sampling import StratifiedSampler
+from src.sources import SourceClassifier
+from src.storage import dataset_exists, read_dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bootstrap confidence intervals for the reported statistics")
+    parser.add_argument('--input', default=str(config.DATA_DIR / 'coded_articles.csv'),
+                        help='Annotated dataset (PRIMARY_TOPIC and sentiment columns)')
+    parser.add_argument('--mode', choices=['bootstrap', 'sampling'], default='bootstrap',
+                        help='Resample the dataset, or redraw the balanced sample from it')
+    parser.add_argument('--replicates', type=int, default=config.BOOTSTRAP_REPLICATES)
+    parser.add_argument('--confidence', type=float, default=config.BOOTSTRAP_CONFIDENCE)
+    parser.add_argument('--workers', type=int, help='Processes (default: one per CPU)')
+    parser.add_argument('--seed', type=int, default=config.SAMPLE_SEED)
+    parser.add_argument('--output', default=str(config.BOOTSTRAP_FILE))
+    args = parser.parse_args()
+
+    if not dataset_exists(args.input):
+        print(f"Error: {args.input} not found.")
+        sys.exit(1)
+    df = read_dataset(args.input)
+    print(f"Loaded {len(df)} articles from {args.input}")
+    missing = [c for c in ('PRIMARY_TOPIC', 'date') if c not in df.columns]
+    if not {'SENTIMENT (Pos/Neg/Neu)', 'sentiment'} & set(df.columns):
+        missing.append("'SENTIMENT (Pos/Neg/Neu)' or 'sentiment'")
+    if 'source' not in df.columns and (args.mode == 'sampling' or 'leaning' not in df.columns):
+        missing.append('source')
+    if missing:
+        print(f"Error: {args.input} is not an annotated dataset (missing {', '.join(missing)}); "
+              "run annotate_data.py on it first.")
+        sys.exit(1)
+
+    if args.mode == 'sampling':
+        # The population generate_balanced_sample.py draws from: North American sources only
+        classifier = SourceClassifier(version=config.SAMPLE_SOURCE_VERSION)
+        df[['is_north_american', 'leaning']] = classifier.classify(df['source'])
+        df = df[df['is_north_american']].reset_index(drop=True)
+        sampler = StratifiedSampler(config.SAMPLE_STRATA, marginals=config.SAMPLE_MARGINALS,
+                                    total=config.SAMPLE_SIZE, seed=args.seed)
+        design = sampling_design(df, sampler)
+        if all(take >= len(rows) for rows, take in zip(design.rows, design.take)):
+            # Every replicate would be the same rows, giving zero-width intervals
+            print(f"Error: the sample takes every row of every stratum of {args.input}, so redrawing it "
+                  "has no randomness. Use an annotated population larger than the sample.")
+            sys.exit(1)
+        # Point estimates from the seeded draw the sample script would make
+        drawn = sampler.sample(df.assign(_row=np.arange(len(df)))).rows['_row'].to_numpy()
+    else:
+        design = bootstrap_design(pd.Categorical(df['leaning'].astype('string')).codes
+                                  if 'leaning' in df.columns else np.zeros(len(df), dtype=int))
+        drawn = np.arange(len(df))
+
+    codes = encode(df)
+    estimate = statistics(codes, drawn[None, :])[0]
+    print(f"{args.replicates} {args.mode} replicates of {sum(design.take)} articles...")
+    start = time.time()
+    result = run_bootstrap(codes, design, estimate, args.replicates, args.seed, args.workers, args.confidence)
+    print(f"✓ Done in {time.time() - start:.1f}s")
+
+    with pd.option_context('display.float_format', '{:.4g}'.format, 'display.width', 120):
+        print(result.estimates.to_string(index=False))
+    result.estimates.to_csv(args.output, index=False)
+    print(f"\nSaved {args.confidence:.0%} intervals to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
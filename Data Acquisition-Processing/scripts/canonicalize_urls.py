@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Add a canonical_url column to an article dataset.
+Google News RSS links are decoded to the publisher URL offline where the id format
+allows; the rest go through a bounded, cached network resolver (skip with --offline).
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+from src import config
+from src.storage import read_dataset, write_dataset
+from src.urls import GNewsResolver, canonicalize_urls
+
+def main():
+    parser = argparse.ArgumentParser(description="Add a canonical_url column to an article dataset")
+    parser.add_argument('--input', default=str(config.FINAL_ARTICLES_FILE), help='Input dataset (.csv or .parquet name)')
+    parser.add_argument('--output', help='Output dataset (default: overwrite input)')
+    parser.add_argument('--offline', action='store_true', help='Only decode ids locally, no network lookups')
+    parser.add_argument('--limit', type=int, default=config.GNEWS_RESOLVE_LIMIT, help='Max new network lookups')
+    args = parser.parse_args()
+
+    df = read_dataset(args.input)
+    resolver = None if args.offline else GNewsResolver(limit=args.limit)
+    df['canonical_url'] = canonicalize_urls(df['url'], resolver)
+
+    output = write_dataset(df, args.output or args.input)
+    print(f"✓ Saved {len(df)} rows with canonical_url to {output}")
+    print(f"  {df['canonical_url'].nunique()} unique canonical URLs, "
+          f"{df['canonical_url'].str.contains('news.google.com', na=False).sum()} still Google News links")
+
+if __name__ == "__main__":
+    main()
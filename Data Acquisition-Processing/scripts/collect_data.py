@@ -5,22 +5,52 @@ import os
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.collection import NewsAPICollector, TheNewsAPICollector, GNewsCollector
+from src.collection import (NewsAPICollector, TheNewsAPICollector, GNewsCollector,
+                            TargetedCollector, LeftSourcesCollector)
+from src.cache import ResponseCache
+from src.scheduling import QuotaScheduler, coverage_from_dataset
+from src.seen_index import SeenIndex
+from src import config
 import argparse
 
 def main():
     parser = argparse.ArgumentParser(description="Collect Trump media coverage data")
     parser.add_argument('--source', choices=['newsapi', 'thenewsapi', 'gnews', 'all'], default='all', help='Source to collect from')
+    parser.add_argument('--async', dest='use_async', action='store_true', help='Fetch date windows concurrently (rate-limited)')
+    parser.add_argument('--replay', action='store_true', help='Serve every request from the response cache (offline)')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the response cache')
+    parser.add_argument('--fresh', action='store_true', help='Ignore checkpoints and restart collection from scratch')
+    parser.add_argument('--adaptive', action='store_true', help='Split saturated date windows and merge sparse ones (plan saved to data/plans)')
+    parser.add_argument('--skip-seen', action='store_true', help='Skip articles already in the shared seen-index (incremental collection)')
+    parser.add_argument('--scheduled', action='store_true', help='Run every provider at once, spending each daily quota on the largest coverage gaps (implies --skip-seen)')
     args = parser.parse_args()
 
+    cache = ResponseCache(replay=args.replay, enabled=not args.no_cache)
+    seen = None
+    if args.skip_seen or args.scheduled:
+        seen = SeenIndex()
+        seen.sync_dataset(config.DATA_DIR / 'final_articles.csv')
+
+    if args.scheduled:
+        collectors = [
+            NewsAPICollector(cache, seen, adaptive=args.adaptive),
+            TheNewsAPICollector(cache, seen, adaptive=args.adaptive),
+            GNewsCollector(cache, seen),
+            TargetedCollector(cache, seen),
+            LeftSourcesCollector(cache, seen),
+        ]
+        coverage = coverage_from_dataset(config.DATA_DIR / 'final_articles.csv')
+        QuotaScheduler(collectors, coverage).run(fresh=args.fresh)
+        return
+
     if args.source in ['newsapi', 'all']:
-        NewsAPICollector().collect()
+        NewsAPICollector(cache, seen).collect(use_async=args.use_async, fresh=args.fresh, adaptive=args.adaptive)
         
     if args.source in ['thenewsapi', 'all']:
-        TheNewsAPICollector().collect()
+        TheNewsAPICollector(cache, seen).collect(fresh=args.fresh, adaptive=args.adaptive)
         
     if args.source in ['gnews', 'all']:
-        GNewsCollector().collect()
+        GNewsCollector(cache, seen).collect(fresh=args.fresh)
 
 if __name__ == "__main__":
     main()
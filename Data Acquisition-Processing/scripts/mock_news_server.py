@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for NewsAPI, TheNewsAPI and Google News RSS.
+Serves synthetic, deterministic, paginated results in each provider's response shape, with
+configurable latency, 429 rate limiting and injected server errors, so collection can be
+load-tested without the network. Point the collectors at it through the *_BASE_URL
+environment variables, e.g.
+
+    python scripts/mock_news_server.py --port 8765 --rate-limit 20
+    NEWS_API_BASE_URL=http://127.0.0.1:8765/v2/everything \\
+    THENEWSAPI_BASE_URL=http://127.0.0.1:8765/v1/news/all \\
+    GNEWS_BASE_URL=http://127.0.0.1:8765/rss \\
+    python scripts/collect_data.py --no-cache
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape
+
+PUBLISHERS = [
+    ('cnn', 'CNN', 'cnn.com'), ('fox-news', 'Fox News', 'foxnews.com'),
+    ('reuters', 'Reuters', 'reuters.com'), ('associated-press', 'Associated Press', 'apnews.com'),
+    ('the-new-york-times', 'The New York Times', 'nytimes.com'),
+    ('the-washington-post', 'The Washington Post', 'washingtonpost.com'),
+    ('breitbart-news', 'Breitbart News', 'breitbart.com'), ('usa-today', 'USA Today', 'usatoday.com'),
+    ('msnbc', 'MSNBC', 'msnbc.com'), ('cbc-news', 'CBC News', 'cbc.ca'),
+]
+TOPICS = ['tariffs', 'impeachment', 'rally', 'election', 'immigration', 'indictment', 'summit',
+          'approval rating', 'executive order', 'campaign', 'trade deal', 'court ruling']
+VERBS = ['defends', 'slams', 'announces', 'weighs', 'signs', 'rejects', 'touts', 'faces']
+DATE_FMT = '%Y-%m-%d'
+
+
+def _seed(*parts) -> int:
+    return int(hashlib.md5('|'.join(map(str, parts)).encode('utf-8')).hexdigest()[:12], 16)
+
+
+class ArticleGenerator:
+    """Deterministic synthetic articles: the same query always yields the same results."""
+
+    def __init__(self, per_day: int = 40):
+        self.per_day = per_day
+
+    def total(self, query: str, start: datetime, end: datetime, filt: str = '') -> int:
+        days = max(1, (end - start).days + 1)
+        # Some variation per query so windows differ in density
+        return int(days * self.per_day * (0.5 + random.Random(_seed(query, filt)).random()))
+
+    def article(self, query: str, start: datetime, end: datetime, filt: str, index: int,
+                domains: Optional[List[str]] = None) -> Dict:
+        rng = random.Random(_seed(query, start.date(), end.date(), filt, index))
+        days = max(1, (end - start).days + 1)
+        published = start + timedelta(days=index % days, seconds=rng.randrange(86400))
+        source_id, name, domain = rng.choice(PUBLISHERS)
+        if domains:
+            domain = domains[index % len(domains)]
+            name = domain.split('.')[0].capitalize()
+        topic, verb = rng.choice(TOPICS), rng.choice(VERBS)
+        slug = f"{published:%Y/%m/%d}/trump-{verb}-{topic.replace(' ', '-')}-{index}"
+        return {
+            'source_id': source_id, 'source_name': name, 'domain': domain,
+            'title': f"Trump {verb} {topic} ({published:%b %d}, #{index})",
+            'description': f"Donald Trump {verb} {topic} as {name} reports on the latest developments.",
+            'url': f"https://www.{domain}/{slug}",
+            'published': published,
+            'author': rng.choice(['Staff', 'Jane Doe', 'John Smith', None]),
+        }
+
+
+class MockNewsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.05, jitter: float = 0.5,
+                 rate_limit: float = 0, error_rate: float = 0, per_day: int = 40, seed: int = 0):
+        super().__init__((host, port), MockHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.generator = ArticleGenerator(per_day)
+        self.random = random.Random(seed)
+        self.stats = Counter()
+        self.lock = threading.Lock()
+        self.tokens = max(1.0, rate_limit)
+        self.updated = time.monotonic()
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockNewsServer':
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats.clear()
+
+    def admit(self) -> Tuple[Optional[int], float]:
+        """Decide a request's fate: (None, 0) to serve it, or (status, retry_after)."""
+        with self.lock:
+            self.stats['requests'] += 1
+            if self.rate_limit:
+                now = time.monotonic()
+                self.tokens = min(max(1.0, self.rate_limit), self.tokens + (now - self.updated) * self.rate_limit)
+                self.updated = now
+                if self.tokens < 1:
+                    self.stats['429'] += 1
+                    return 429, (1 - self.tokens) / self.rate_limit
+                self.tokens -= 1
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.stats['500'] += 1
+                return 500, 0
+            self.stats['200'] += 1
+            return None, 0
+
+    def delay(self) -> float:
+        with self.lock:
+            return max(0.0, self.latency * (1 + self.jitter * (2 * self.random.random() - 1)))
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    server: MockNewsServer
+
+    def log_message(self, format, *args):
+        pass  # keep benchmark output clean
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        routes = {
+            '/v2/everything': self.newsapi,
+            '/v1/news/all': self.thenewsapi,
+            '/rss/search': self.gnews,
+        }
+        if parts.path == '/__stats':
+            return self.send_json(200, dict(self.server.stats))
+        handler = routes.get(parts.path)
+        if handler is None:
+            return self.send_json(404, {'status': 'error', 'message': f'unknown endpoint {parts.path}'})
+
+        time.sleep(self.server.delay())
+        status, retry_after = self.server.admit()
+        if status == 429:
+            return self.send_json(429, {'status': 'error', 'code': 'rateLimited',
+                                        'message': 'Too many requests'},
+                                  {'Retry-After': f"{retry_after:.3f}"})
+        if status:
+            return self.send_json(status, {'status': 'error', 'code': 'unexpectedError',
+                                           'message': 'Injected server error'})
+        handler(params)
+
+    def send_json(self, status: int, body: Dict, headers: Optional[Dict] = None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def window(self, params: Dict, start_key: str, end_key: str) -> Tuple[datetime, datetime]:
+        start = datetime.strptime(params.get(start_key, '2015-01-01')[:10], DATE_FMT)
+        end = datetime.strptime(params.get(end_key, params.get(start_key, '2025-12-31'))[:10], DATE_FMT)
+        return start, max(start, end)
+
+    def page(self, query, start, end, filt, page, size, domains=None) -> Tuple[int, List[Dict]]:
+        gen = self.server.generator
+        total = gen.total(query, start, end, filt)
+        first = (page - 1) * size
+        return total, [gen.article(query, start, end, filt, i, domains)
+                       for i in range(first, min(first + size, total))]
+
+    def newsapi(self, params: Dict):
+        start, end = self.window(params, 'from', 'to')
+        page, size = int(params.get('page', 1)), min(100, int(params.get('pageSize', 100)))
+        total, articles = self.page(params.get('q', ''), start, end, params.get('sources', ''), page, size)
+        self.send_json(200, {'status': 'ok', 'totalResults': total, 'articles': [{
+            'source': {'id': a['source_id'], 'name': a['source_name']},
+            'author': a['author'],
+            'title': a['title'],
+            'description': a['description'],
+            'url': a['url'],
+            'publishedAt': a['published'].strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'content': a['description'] + ' [+1200 chars]',
+        } for a in articles]})
+
+    def thenewsapi(self, params: Dict):
+        start, end = self.window(params, 'published_after', 'published_before')
+        page, size = int(params.get('page', 1)), min(100, int(params.get('limit', 3)))
+        domains = [d for d in params.get('domains', '').split(',') if d]
+        total, articles = self.page(params.get('search', ''), start, end, params.get('domains', ''),
+                                    page, size, domains)
+        self.send_json(200, {
+            'meta': {'found': total, 'returned': len(articles), 'limit': size, 'page': page},
+            'data': [{
+                'uuid': hashlib.md5(a['url'].encode('utf-8')).hexdigest(),
+                'title': a['title'],
+                'description': a['description'],
+                'snippet': a['description'][:60],
+                'url': a['url'],
+                'language': 'en',
+                'published_at': a['published'].strftime('%Y-%m-%dT%H:%M:%S.000000Z'),
+                'source': a['domain'],
+            } for a in articles],
+        })
+
+    def gnews(self, params: Dict):
+        query = params.get('q', '')
+        after = re.search(r'after:(\d{4}-\d{2}-\d{2})', query)
+        before = re.search(r'before:(\d{4}-\d{2}-\d{2})', query)
+        start = datetime.strptime(after.group(1), DATE_FMT) if after else datetime(2015, 1, 1)
+        end = datetime.strptime(before.group(1), DATE_FMT) if before else start + timedelta(days=30)
+        site = re.search(r'site:(\S+)', query)
+        _, articles = self.page(query, start, end, '', 1, 100, [site.group(1)] if site else None)
+        items = ''.join(
+            f"<item><title>{escape(a['title'])} - {escape(a['source_name'])}</title>"
+            f"<link>{escape(a['url'])}</link>"
+            f"<guid isPermaLink=\"false\">{hashlib.md5(a['url'].encode('utf-8')).hexdigest()}</guid>"
+            f"<pubDate>{format_datetime(a['published'].replace(tzinfo=timezone.utc), usegmt=True)}</pubDate>"
+            f"<description>{escape(a['description'])}</description>"
+            f"<source url=\"https://{a['domain']}\">{escape(a['source_name'])}</source></item>"
+            for a in articles
+        )
+        body = (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+                f'<title>"{escape(query)}" - Google News</title>{items}</channel></rss>').encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock NewsAPI / TheNewsAPI / Google News RSS server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05, help='Mean response latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.5, help='Latency spread as a fraction of the mean')
+    parser.add_argument('--rate-limit', type=float, default=0, help='Requests per second before 429s (0 = off)')
+    parser.add_argument('--error-rate', type=float, default=0, help='Fraction of requests answered with 500')
+    parser.add_argument('--per-day', type=int, default=40, help='Average synthetic articles per day per query')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = MockNewsServer(args.host, args.port, args.latency, args.jitter, args.rate_limit,
+                            args.error_rate, args.per_day, args.seed)
+    print(f"Mock news server on {server.base_url} (stats at /__stats); Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nServed: {dict(server.stats)}")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
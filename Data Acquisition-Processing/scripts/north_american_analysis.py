@@ -3,56 +3,31 @@
 Analyze North American vs International sources
 Determine if we have enough for a 500-article North American-only sample
 """
-import pandas as pd
 import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src import config
+from src.sampling import StratifiedSampler
+from src.sources import SourceClassifier
+from src.storage import read_dataset
 
 def analyze_north_american_sources():
     """Analyze which sources are North American and assess feasibility"""
     
     # Load complete dataset
     data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
-    df = pd.read_csv(os.path.join(data_dir, 'final_articles.csv'))
-    
-    # Comprehensive North American source classification
-    north_american_sources = get_north_american_sources()
-    
-    def is_north_american(source):
-        s = str(source).lower().strip()
-        
-        # Explicit exclusions for known false positives
-        # These sources appeared in "US" searches but are clearly international.
-        # Excluding them is critical for valid sentiment analysis.
-        if 'timesofindia' in s or 'indiatimes' in s:
-            return False
-            
-        # Direct match
-        if s in north_american_sources:
-            return True
-        # Substring match
-        for na_source in north_american_sources:
-            # Skip very short common words for substring matching to avoid false positives
-            if len(na_source) < 5 and na_source != 'cnn' and na_source != 'npr' and na_source != 'pbs' and na_source != 'vox':
-                 if s == na_source:
-                     return True
-                 continue
-                 
-            if na_source in s:
-                return True
-        return False
-    
-    df['is_north_american'] = df['source'].apply(is_north_american)
-    
-    # Apply political leaning
-    source_map = create_source_map()
-    def get_leaning(source):
-        s = str(source).lower().strip()
-        if s in source_map: return source_map[s]
-        for key, val in source_map.items():
-            if key in s: return val
-        return 'Other'
-    
-    df['leaning'] = df['source'].apply(get_leaning)
-    df['sentiment'] = df['SENTIMENT (Pos/Neg/Neu)'].replace({
+    df = read_dataset(os.path.join(data_dir, 'final_articles.csv'))
+    
+    # Comprehensive North American source classification and political leaning.
+    # Explicit exclusions for known false positives: these sources appeared in "US"
+    # searches but are clearly international. Excluding them is critical for valid
+    # sentiment analysis.
+    classifier = SourceClassifier(version=config.SAMPLE_SOURCE_VERSION,
+                                  exclusions=('timesofindia', 'indiatimes'))
+    df[['is_north_american', 'leaning']] = classifier.classify(df['source'])
+    df['sentiment'] = df['SENTIMENT (Pos/Neg/Neu)'].astype('string').replace({
         'Positive': 'POS', 'Negative': 'NEG', 'Neutral': 'NEU'
     })
     
@@ -142,11 +117,9 @@ def analyze_north_american_sources():
         print("CREATING RECOMMENDED 501-ARTICLE SAMPLE")
         print("="*80)
         
-        sample = pd.concat([
-            na_df[na_df['leaning'] == 'Left'].sample(n=167, random_state=42),
-            na_df[na_df['leaning'] == 'Center'].sample(n=167, random_state=42),
-            na_df[na_df['leaning'] == 'Right'].sample(n=167, random_state=42)
-        ])
+        # Same seeded draw as generate_balanced_sample.py (src/sampling.py)
+        sampler = StratifiedSampler(['leaning'], quotas={'Left': 167, 'Center': 167, 'Right': 167})
+        sample = sampler.sample(na_df).rows
         
         output_path = os.path.join(data_dir, 'north_american_sample_501.csv')
         sample.to_csv(output_path, index=False)
@@ -170,132 +143,11 @@ def analyze_north_american_sources():
 
 def get_north_american_sources():
     """Return list of North American news sources"""
-    return {
-        # Major US Networks/National
-        'cnn', 'cnn.com', 'msnbc', 'msnbc.com',
-        'fox news', 'foxnews.com', 'radio.foxnews.com',
-        'abc news', 'abcnews.go.com',
-        'cbs news', 'cbsnews.com',
-        'nbc news', 'nbcnews.com',
-        
-        # US Print/Digital
-        'the new york times', 'nytimes.com',
-        'washington post', 'washingtonpost.com',
-        'wall street journal', 'wsj.com',
-        'usa today', 'usatoday.com',
-        'new york post', 'nypost.com',
-        
-        # US News Sites
-        'politico', 'politico.com',
-        'huffpost', 'huffpost.com', 'huffingtonpost.com',
-        'breitbart', 'breitbart.com',
-        'vox', 'vox.com',
-        'slate', 'slate.com',
-        'salon', 'salon.com',
-        'the daily beast', 'thedailybeast.com',
-        'alternet', 'alternet.org',
-        'businessinsider', 'businessinsider.com',
-        'axios', 'axios.com',
-        'newsweek', 'newsweek.com',
-        'time', 'time.com', 'time magazine',
-        'the atlantic', 'theatlantic.com',
-        'new yorker', 'newyorker.com',
-        'vanity fair', 'vanityfair.com',
-        'rolling stone', 'rollingstone.com',
-        'mother jones', 'motherjones.com',
-        'the nation', 'thenation.com',
-        'forbes', 'forbes.com',
-        'daily wire', 'dailywire.com',
-        'washington examiner', 'washingtonexaminer.com',
-        'the federalist', 'thefederalist.com',
-        'national review', 'nationalreview.com',
-        'newsmax', 'newsmax.com',
-        'one america news', 'oann', 'oann.com',
-        'the blaze', 'theblaze.com',
-        'townhall', 'townhall.com',
-        'redstate', 'redstate.com',
-        'daily caller', 'dailycaller.com',
-        'boston globe', 'bostonglobe.com',
-        
-        # US Wire Services / Public
-        'associated press', 'ap', 'apnews.com',
-        'reuters', 'reuters.com',  # US operations
-        'bloomberg', 'bloomberg.com',  # US HQ
-        'npr', 'npr.org',
-        'pbs', 'pbs.org',
-        'the hill', 'thehill.com',
-        
-        # US Gov/Institutional
-        'national archives', 'archives.gov', '.gov',
-        'u.s. department', 'department of',
-        'brookings', 'brookings.edu',
-        
-        # US Entertainment that covers politics
-        'eonline', 'eonline.com',
-        'people', 'people.com',
-        'us magazine', 'usmagazine.com',
-        'tmz', 'tmz.com',
-        
-        # Canadian Sources
-        'national post', 'nationalpost.com',
-        'globe and mail', 'theglobeandmail.com',
-        'toronto star', 'thestar.com',
-        'toronto sun', 'torontosun.com',
-        'cbc', 'cbc.ca',
-        'ctv', 'ctvnews.ca',
-        'global news', 'globalnews.ca',
-        'macleans', 'macleans.ca',
-        'national observer', 'nationalobserver.com',
-        'national newswatch', 'nationalnewswatch.com',
-        '680news', '680news.com',
-        'the american presidency project', 'presidency.ucsb.edu',
-    }
+    return SourceClassifier(version=config.SAMPLE_SOURCE_VERSION).north_american
 
 def create_source_map():
     """Political leaning classification"""
-    return {
-        # LEFT
-        'cnn': 'Left', 'cnn.com': 'Left',
-        'msnbc': 'Left', 'msnbc.com': 'Left',
-        'the new york times': 'Left', 'nytimes.com': 'Left',
-        'washington post': 'Left', 'washingtonpost.com': 'Left',
-        'politico': 'Left', 'politico.com': 'Left',
-        'huffpost': 'Left', 'huffpost.com': 'Left',
-        'vox': 'Left', 'vox.com': 'Left',
-        'alternet': 'Left', 'alternet.org': 'Left',
-        'abc news': 'Left', 'abcnews.go.com': 'Left',
-        'cbs news': 'Left', 'cbsnews.com': 'Left',
-        'nbc news': 'Left', 'nbcnews.com': 'Left',
-        'slate': 'Left', 'slate.com': 'Left',
-        'salon': 'Left', 'salon.com': 'Left',
-        'mother jones': 'Left', 'motherjones.com': 'Left',
-        'new yorker': 'Left', 'newyorker.com': 'Left',
-        'the atlantic': 'Left', 'theatlantic.com': 'Left',
-        'vanity fair': 'Left', 'vanityfair.com': 'Left',
-        
-        # CENTER
-        'reuters': 'Center', 'reuters.com': 'Center',
-        'usa today': 'Center', 'usatoday.com': 'Center',
-        'bloomberg': 'Center', 'bloomberg.com': 'Center',
-        'npr': 'Center', 'npr.org': 'Center',
-        'pbs': 'Center', 'pbs.org': 'Center',
-        'the hill': 'Center', 'thehill.com': 'Center',
-        
-        # RIGHT
-        'fox news': 'Right', 'foxnews.com': 'Right',
-        'breitbart': 'Right', 'breitbart.com': 'Right',
-        'new york post': 'Right', 'nypost.com': 'Right',
-        'daily wire': 'Right', 'dailywire.com': 'Right',
-        'national post': 'Right', 'nationalpost.com': 'Right',
-        'washington examiner': 'Right', 'washingtonexaminer.com': 'Right',
-        'wall street journal': 'Right', 'wsj.com': 'Right', 'online.wsj.com': 'Right',
-        
-        # RECLASSIFIED / ADDED for Balance
-        'national archives': 'Center', 'archives.gov': 'Center',
-        'the american presidency project': 'Center', 'presidency.ucsb.edu': 'Center',
-        'forbes': 'Center', 'forbes.com': 'Center',
-        'businessinsider': 'Center', 'businessinsider.com': 'Center',
-    }
+    return SourceClassifier(version=config.SAMPLE_SOURCE_VERSION).leanings
 
 def print_classification_criteria():
     """Print the inclusion/exclusion criteria used"""
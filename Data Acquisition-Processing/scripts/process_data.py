@@ -5,14 +5,27 @@ import os
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src import config
 from src.processing import DataProcessor
 import argparse
 
 def main():
     parser = argparse.ArgumentParser(description="Merge and process data from different sources")
+    parser.add_argument('--incremental', action='store_true',
+                        help='Merge only rows collected since the last merge into data/merged/')
+    parser.add_argument('--export', action='store_true',
+                        help='Write data/merged/ out as the final articles file')
+    parser.add_argument('--chunksize', type=int, nargs='?', const=config.CHUNK_SIZE,
+                        help='Full merge out of core, reading this many rows at a time')
     args = parser.parse_args()
     
-    DataProcessor().merge_datasets()
+    processor = DataProcessor()
+    if args.incremental:
+        processor.merge_incremental()
+    else:
+        processor.merge_datasets(chunksize=args.chunksize)
+    if args.export:
+        processor.export()
 
 if __name__ == "__main__":
     main()
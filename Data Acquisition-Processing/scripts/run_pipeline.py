@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Run the pipeline (collect -> merge -> annotate / sample -> analyze), skipping every stage
+whose inputs, command and code have not changed since its last successful run:
+
+    python scripts/run_pipeline.py                   # every stage except collection and annotation
+    python scripts/run_pipeline.py --dry-run         # what would run, and why
+    python scripts/run_pipeline.py --stages collect merge sample
+    python scripts/run_pipeline.py --stages annotate analyze
+    python scripts/run_pipeline.py --force merge
+"""
+import sys
+import os
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import config
+from src.pipeline import Pipeline, default_stages
+
+
+def main():
+    names = [stage.name for stage in default_stages()]
+    parser = argparse.ArgumentParser(description="Run the data pipeline with content-hash caching")
+    parser.add_argument('--stages', nargs='+', choices=names,
+                        help='Stages to consider (default: all but collect and annotate, which spend API quota)')
+    parser.add_argument('--force', nargs='+', choices=names, default=[], help='Rerun these even if up to date')
+    parser.add_argument('--workers', type=int, default=config.PIPELINE_MAX_WORKERS,
+                        help='Independent stages run at the same time')
+    parser.add_argument('--dry-run', action='store_true', help='Only report which stages would run')
+    args = parser.parse_args()
+
+    results = Pipeline(workers=args.workers).run(args.stages, force=args.force, dry_run=args.dry_run)
+    if any(r['status'] in ('failed', 'blocked') for r in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
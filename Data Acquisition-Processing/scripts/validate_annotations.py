@@ -14,6 +14,7 @@ from sklearn.metrics import cohen_kappa_score, confusion_matrix, classification_
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src import config
+from src.storage import read_dataset
 
 # Alternative prompt (same categories, different wording)
 # We want to see if the LLM is robust. If we ask the same question slightly differently,
@@ -78,7 +79,7 @@ def validate_consistency(sample_size=100):
     model = genai.GenerativeModel('gemini-2.0-flash-lite')
     
     # Load coded articles
-    df = pd.read_csv(config.DATA_DIR / 'coded_articles.csv')
+    df = read_dataset(config.DATA_DIR / 'coded_articles.csv')
     
     # Rename sentiment column
     if 'SENTIMENT (Pos/Neg/Neu)' in df.columns:
@@ -2,27 +2,30 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-import os
 from scipy import stats
 from sklearn.feature_extraction.text import TfidfVectorizer
 from . import config
+from .sources import REGISTRY
+from .storage import dataset_exists, read_dataset
 
 class Analyzer:
+    COLUMNS = ['source', 'date', 'title', 'leaning', 'PRIMARY_TOPIC', 'SENTIMENT (Pos/Neg/Neu)']
+
     def __init__(self):
         # Try to load coded articles first, as it has the annotations
-        if os.path.exists(config.DATA_DIR / 'coded_articles.csv'):
+        # Only the columns the analyses use; descriptions, URLs and snippets are never loaded
+        if dataset_exists(config.DATA_DIR / 'coded_articles.csv'):
             print(f"Loading annotated data from {config.DATA_DIR / 'coded_articles.csv'}...")
-            self.df = pd.read_csv(config.DATA_DIR / 'coded_articles.csv')
-        elif os.path.exists(config.FINAL_ARTICLES_FILE):
+            self.df = read_dataset(config.DATA_DIR / 'coded_articles.csv', columns=self.COLUMNS)
+        elif dataset_exists(config.FINAL_ARTICLES_FILE):
             print(f"Loading raw data from {config.FINAL_ARTICLES_FILE} (no annotations)...")
-            self.df = pd.read_csv(config.FINAL_ARTICLES_FILE)
+            self.df = read_dataset(config.FINAL_ARTICLES_FILE, columns=self.COLUMNS)
         else:
             print(f"Error: No data found.")
             self.df = None
             return
 
-        # Preprocessing
-        self.df['date'] = pd.to_datetime(self.df['date'], errors='coerce')
+        # Preprocessing (dates come back parsed from read_dataset)
         self.df['year'] = self.df['date'].dt.year
         
         # Ensure annotation columns exist even if empty
@@ -35,9 +38,9 @@ class Analyzer:
         self.df.rename(columns={'SENTIMENT (Pos/Neg/Neu)': 'sentiment'}, inplace=True)
         
         # Standardize Sentiment Values
-        self.df['sentiment'] = self.df['sentiment'].replace({
+        self.df['sentiment'] = self.df['sentiment'].astype('string').replace({
             'Positive': 'POS', 'Negative': 'NEG', 'Neutral': 'NEU'
-        })
+        }).astype('category')
 
     def generate_summary(self):
         if self.df is None: return
@@ -62,15 +65,9 @@ class Analyzer:
     def analyze_sources(self):
         if self.df is None: return
         
-        source_leanings = {
-            'cnn.com': 'Left', 'msnbc.com': 'Left', 'washingtonpost.com': 'Left', 'nytimes.com': 'Left',
-            'foxnews.com': 'Right', 'breitbart.com': 'Right', 'nypost.com': 'Right',
-            'reuters.com': 'Center', 'apnews.com': 'Center', 'usatoday.com': 'Center'
-        }
-        
-        def get_leaning(source):
-            return source_leanings.get(str(source).lower(), 'Other')
-            
+        # Exact domain / name lookup in the source registry
+        get_leaning = REGISTRY.leaning
+
         self.df['leaning'] = self.df['source'].apply(get_leaning)
         
         print("\nLeaning Distribution:")
@@ -152,14 +149,14 @@ class Analyzer:
         print("\n2. Sentiment Analysis by Topic")
         # Convert sentiment to numeric for analysis
         sent_map = {'POS': 1, 'NEU': 0, 'NEG': -1}
-        self.df['sentiment_score'] = self.df['sentiment'].map(sent_map)
+        self.df['sentiment_score'] = self.df['sentiment'].map(sent_map).astype(float)
         
-        topic_sent = self.df.groupby('PRIMARY_TOPIC')['sentiment_score'].agg(['mean', 'count', 'std'])
+        topic_sent = self.df.groupby('PRIMARY_TOPIC', observed=True)['sentiment_score'].agg(['mean', 'count', 'std'])
         topic_sent['se'] = topic_sent['std'] / np.sqrt(topic_sent['count']) # Standard Error
         print(topic_sent.sort_values('mean'))
         
         # ANOVA to test if sentiment differs by topic
-        topics_list = [group['sentiment_score'].dropna().values for name, group in self.df.groupby('PRIMARY_TOPIC')]
+        topics_list = [group['sentiment_score'].dropna().values for name, group in self.df.groupby('PRIMARY_TOPIC', observed=True)]
         f_stat, p_val = stats.f_oneway(*topics_list)
         print(f"\nANOVA (Sentiment by Topic): F={f_stat:.2f}, p={p_val:.4e}")
         
@@ -5,6 +5,7 @@ import time
 import json
 from typing import Dict, Optional
 from . import config
+from .storage import dataset_exists, read_dataset, write_dataset
 
 class Annotator:
     def __init__(self):
@@ -84,12 +85,16 @@ class Annotator:
         
         print(f"Annotating {input_path} -> {output_path}")
         
-        if os.path.exists(output_path):
-            df = pd.read_csv(output_path)
+        if dataset_exists(output_path):
+            df = read_dataset(output_path)
+            # The annotation columns are filled in row by row; keep them as plain strings
+            for column in ('PRIMARY_TOPIC', 'SENTIMENT (Pos/Neg/Neu)'):
+                if column in df.columns:
+                    df[column] = df[column].astype(object)
             print(f"Resuming... {len(df)} articles already in output.")
             
             # Load original input to get the full list
-            df_input = pd.read_csv(input_path)
+            df_input = read_dataset(input_path)
             
             # Identify missing
             if 'article_id' in df.columns and 'article_id' in df_input.columns:
@@ -109,7 +114,7 @@ class Annotator:
                     df = pd.concat([df, to_append], ignore_index=True)
         else:
             print(f"Starting fresh from {input_path}")
-            df = pd.read_csv(input_path)
+            df = read_dataset(input_path)
             df['PRIMARY_TOPIC'] = ''
             df['SENTIMENT (Pos/Neg/Neu)'] = ''
             df.to_csv(output_path, index=False)
@@ -141,5 +146,6 @@ class Annotator:
                 df.to_csv(output_path, index=False)
                 print(f"  Saved progress ({success_count} session total)...")
         
-        df.to_csv(output_path, index=False)
+        # Progress saves above are CSV checkpoints; the finished file also gets its typed copy
+        write_dataset(df, output_path)
         print(f"✓ Completed! Annotated {success_count} articles.")
@@ -0,0 +1,203 @@
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from . import config
+from .sampling import StratifiedSampler
+from .sources import REGISTRY
+
+SENTIMENT_SCORES = {'POS': 1, 'NEU': 0, 'NEG': -1}  # same scoring as Analyzer.analyze_statistics
+MAX_CELLS_PER_BATCH = 20_000_000  # replicates × rows gathered at once, bounds worker memory
+
+
+class Codes(NamedTuple):
+    """The columns the statistics use, as integer codes (-1 / NaN where missing)."""
+    topic: np.ndarray
+    sentiment: np.ndarray
+    leaning: np.ndarray
+    score: np.ndarray
+    day: np.ndarray
+    topics: List[str]
+    sentiments: List[str]
+    leanings: List[str]
+
+
+def encode(df: pd.DataFrame) -> Codes:
+    """Codes for an annotated dataset, with the Analyzer's column cleaning."""
+    sentiment = df['SENTIMENT (Pos/Neg/Neu)'] if 'SENTIMENT (Pos/Neg/Neu)' in df.columns else df['sentiment']
+    sentiment = sentiment.astype('string').replace({'Positive': 'POS', 'Negative': 'NEG', 'Neutral': 'NEU'})
+    leaning = df['leaning'] if 'leaning' in df.columns else df['source'].map(REGISTRY.leaning)
+    topic = pd.Categorical(df['PRIMARY_TOPIC'].astype('string'))
+    sentiment = pd.Categorical(sentiment)
+    leaning = pd.Categorical(leaning.astype('string'))
+    dates = pd.to_datetime(df['date'], errors='coerce')
+    return Codes(
+        topic=topic.codes.astype(np.int64), sentiment=sentiment.codes.astype(np.int64),
+        leaning=leaning.codes.astype(np.int64),
+        score=pd.Series(sentiment).map(SENTIMENT_SCORES).to_numpy(dtype=float),
+        # Days since the epoch; only differences matter for the slope, so this equals toordinal()
+        day=((dates - pd.Timestamp(0)) // pd.Timedelta(days=1)).to_numpy(dtype=float, na_value=np.nan),
+        topics=list(topic.categories), sentiments=list(sentiment.categories), leanings=list(leaning.categories),
+    )
+
+
+def _counts(codes: np.ndarray, k: int) -> np.ndarray:
+    """(replicates, k) counts of each code per row of a (replicates, n) code matrix; -1 is skipped."""
+    b = codes.shape[0]
+    flat = (np.arange(b)[:, None] * k + codes)[codes >= 0]
+    return np.bincount(flat, minlength=b * k).reshape(b, k).astype(float)
+
+
+def metric_names(codes: Codes) -> List[str]:
+    return ([f'topic_share:{t}' for t in codes.topics] + [f'sentiment_share:{s}' for s in codes.sentiments]
+            + ['chi2_leaning_topic', 'chi2_p', 'anova_f_sentiment_topic', 'anova_p',
+               'sentiment_slope_per_day', 'sentiment_slope_r2', 'sentiment_slope_p'])
+
+
+def statistics(codes: Codes, index: np.ndarray) -> np.ndarray:
+    """Every reported metric for each row of an index matrix, as (replicates, metrics).
+
+    The same statistics as Analyzer.analyze_statistics (topic and sentiment shares, the
+    leaning × topic chi-square, the one-way ANOVA of sentiment score by topic, and the
+    linear trend of sentiment over time), computed from per-replicate counts and sums with
+    bincount, so thousands of replicates take one pass each rather than one SciPy call.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        topic, sentiment = codes.topic[index], codes.sentiment[index]
+        n_topics, n_leanings = len(codes.topics), len(codes.leanings)
+        topic_counts = _counts(topic, n_topics)
+        sentiment_counts = _counts(sentiment, len(codes.sentiments))
+        topic_share = topic_counts / topic_counts.sum(axis=1, keepdims=True)
+        sentiment_share = sentiment_counts / sentiment_counts.sum(axis=1, keepdims=True)
+
+        # Chi-square on the leaning × topic table; empty rows/columns are left out, as crosstab would
+        leaning = codes.leaning[index]
+        joint = np.where((leaning >= 0) & (topic >= 0), leaning * n_topics + topic, -1)
+        table = _counts(joint, n_leanings * n_topics).reshape(-1, n_leanings, n_topics)
+        total = table.sum(axis=(1, 2))
+        rows, cols = table.sum(axis=2), table.sum(axis=1)
+        expected = rows[:, :, None] * cols[:, None, :] / total[:, None, None]
+        chi2 = np.where(expected > 0, (table - expected) ** 2 / expected, 0).sum(axis=(1, 2))
+        dof = ((rows > 0).sum(axis=1) - 1) * ((cols > 0).sum(axis=1) - 1)
+        chi2_p = stats.chi2.sf(chi2, np.maximum(dof, 1))
+
+        # One-way ANOVA of sentiment score by topic
+        score = codes.score[index]
+        scored = np.where(np.isnan(score), -1, topic)
+        score = np.nan_to_num(score)
+        n_g = _counts(scored, n_topics)
+        b = index.shape[0]
+        flat = (np.arange(b)[:, None] * n_topics + scored)[scored >= 0]
+        sum_g = np.bincount(flat, weights=score[scored >= 0], minlength=b * n_topics).reshape(b, n_topics)
+        sq_g = np.bincount(flat, weights=score[scored >= 0] ** 2, minlength=b * n_topics).reshape(b, n_topics)
+        n, k = n_g.sum(axis=1), (n_g > 0).sum(axis=1)
+        grand = sum_g.sum(axis=1) / n
+        between = (np.where(n_g > 0, sum_g ** 2 / n_g, 0)).sum(axis=1) - n * grand ** 2
+        within = sq_g.sum(axis=1) - np.where(n_g > 0, sum_g ** 2 / n_g, 0).sum(axis=1)
+        f_stat = (between / (k - 1)) / (within / (n - k))
+        anova_p = stats.f.sf(f_stat, k - 1, n - k)
+
+        # Least-squares trend of sentiment score over time
+        x, y = codes.day[index], codes.score[index]
+        valid = ~(np.isnan(x) | np.isnan(y))
+        m = valid.sum(axis=1)
+        x, y = np.where(valid, x, 0), np.where(valid, y, 0)
+        mean_x, mean_y = x.sum(axis=1) / m, y.sum(axis=1) / m
+        sxx = (x ** 2).sum(axis=1) - m * mean_x ** 2
+        syy = (y ** 2).sum(axis=1) - m * mean_y ** 2
+        sxy = (x * y).sum(axis=1) - m * mean_x * mean_y
+        slope = sxy / sxx
+        r2 = sxy ** 2 / (sxx * syy)
+        t = np.sqrt(r2 * (m - 2) / (1 - r2))
+        slope_p = 2 * stats.t.sf(t, m - 2)
+
+    return np.column_stack([topic_share, sentiment_share, chi2, chi2_p, f_stat, anova_p, slope, r2, slope_p])
+
+
+class Design(NamedTuple):
+    """How one replicate is drawn: each stratum's rows and how many to take from it."""
+    rows: List[np.ndarray]
+    take: List[int]
+    replace: bool
+
+
+def bootstrap_design(strata: np.ndarray) -> Design:
+    """Resample the dataset with replacement within strata, keeping each stratum's size."""
+    rows = [np.flatnonzero(strata == s) for s in np.unique(strata)]
+    return Design(rows, [len(r) for r in rows], True)
+
+
+def sampling_design(df: pd.DataFrame, sampler: StratifiedSampler) -> Design:
+    """Redraw the balanced sample from `df` (without replacement) with `sampler`'s targets."""
+    cell, cells = sampler.cells(df)
+    target, _ = sampler.allocate(cells)
+    rows = [np.flatnonzero(cell == c) for c in range(len(cells))]
+    return Design([r for r, t in zip(rows, target) if t], [int(t) for t in target if t], False)
+
+
+def draw(design: Design, rng: np.random.Generator, replicates: int) -> np.ndarray:
+    """(replicates, sample size) row indexes, drawn for all replicates at once per stratum."""
+    parts = []
+    for rows, take in zip(design.rows, design.take):
+        if design.replace:
+            parts.append(rows[rng.integers(0, len(rows), size=(replicates, take))])
+        elif take >= len(rows):
+            parts.append(np.broadcast_to(rows, (replicates, len(rows))))
+        else:
+            keys = rng.random((replicates, len(rows)))
+            parts.append(rows[np.argpartition(keys, take - 1, axis=1)[:, :take]])
+    return np.concatenate(parts, axis=1)
+
+
+_worker: Dict = {}
+
+
+def _init_worker(codes: Codes, design: Design):
+    _worker['codes'], _worker['design'] = codes, design
+
+
+def _run_batch(seed: np.random.SeedSequence, replicates: int) -> np.ndarray:
+    codes, design = _worker['codes'], _worker['design']
+    return statistics(codes, draw(design, np.random.default_rng(seed), replicates))
+
+
+class Interval(NamedTuple):
+    estimates: pd.DataFrame   # metric, estimate, se, ci_low, ci_high
+    replicates: np.ndarray    # (replicates, metrics)
+
+
+def run_bootstrap(codes: Codes, design: Design, estimate: np.ndarray, replicates: int = config.BOOTSTRAP_REPLICATES,
+                  seed: int = config.SAMPLE_SEED, workers: Optional[int] = None,
+                  confidence: float = config.BOOTSTRAP_CONFIDENCE) -> Interval:
+    """Percentile confidence intervals for every metric over `replicates` redraws of `design`.
+
+    Replicates are split into batches, each with its own child of SeedSequence(seed), and
+    the batches run on a process pool. The batches (and so the seeds) depend only on the
+    replicate count and sample size, so the result is the same for any number of workers.
+    """
+    # Drawing without replacement sorts random keys over the whole stratum, not just the sample
+    size = sum(take if design.replace else len(rows) for rows, take in zip(design.rows, design.take))
+    batch = max(1, min(replicates, MAX_CELLS_PER_BATCH // max(size, 1), 1000))
+    sizes = [batch] * (replicates // batch) + ([replicates % batch] if replicates % batch else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if workers == 1 or len(sizes) == 1:
+        _init_worker(codes, design)
+        results = [_run_batch(s, n) for s, n in zip(seeds, sizes)]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(codes, design)) as pool:
+            results = list(pool.map(_run_batch, seeds, sizes))
+    draws = np.concatenate(results)
+
+    alpha = (1 - confidence) / 2
+    with warnings.catch_warnings():
+        # Metrics undefined in every replicate (e.g. a topic-less dataset) stay NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+        low, high = np.nanquantile(draws, [alpha, 1 - alpha], axis=0)
+        se = np.nanstd(draws, axis=0, ddof=1)
+    estimates = pd.DataFrame({'metric': metric_names(codes), 'estimate': estimate,
+                              'se': se, 'ci_low': low, 'ci_high': high})
+    return Interval(estimates, draws)
@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import aiohttp
+import requests
+
+from . import config
+from .ratelimit import TokenBucket
+
+# Credentials never become part of a cache key, so rotating a key keeps the cache valid
+SECRET_PARAMS = {'apikey', 'api_key', 'api_token', 'token'}
+# Rate limiting and transient server errors are retried (honouring Retry-After) before failing
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    if retry_after:
+        try:
+            return min(float(retry_after), config.MAX_RETRY_AFTER)
+        except ValueError:
+            pass  # HTTP-date form; fall back to exponential backoff
+    return config.RETRY_BACKOFF * 2 ** attempt
+
+
+class CacheMiss(requests.exceptions.RequestException):
+    """Raised in replay mode when a request has no cached response."""
+
+
+class ResponseCache:
+    """On-disk cache of API responses shared by all collectors.
+
+    Entries are keyed by a hash of the URL and its normalized parameters (API keys
+    removed). Expired entries are refetched; the oldest entries are evicted once the
+    cache grows past `max_bytes`. With `replay=True` nothing touches the network and
+    every lookup is served from disk, ignoring the TTL.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None, replay: bool = False, enabled: bool = True):
+        self.cache_dir = Path(cache_dir or config.HTTP_CACHE_DIR)
+        self.ttl = config.HTTP_CACHE_TTL if ttl is None else ttl
+        self.max_bytes = config.HTTP_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.replay = replay
+        self.enabled = enabled or replay
+        self._size = None
+        self.hits = 0
+        self.misses = 0
+        self.retries = 0
+
+    def key(self, url: str, params: Optional[Dict] = None) -> str:
+        normalized = {
+            str(k): str(v) for k, v in (params or {}).items()
+            if v is not None and str(k).lower() not in SECRET_PARAMS
+        }
+        blob = json.dumps({'url': url, 'params': normalized}, sort_keys=True)
+        return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, url: str, params: Optional[Dict] = None) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        path = self._path(self.key(url, params))
+        try:
+            age = time.time() - path.stat().st_mtime
+            if not self.replay and self.ttl and age > self.ttl:
+                return None
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)['data']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, url: str, params: Optional[Dict], data: Any):
+        if not self.enabled or self.replay:
+            return
+        path = self._path(self.key(url, params))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'url': url, 'fetched_at': time.time(), 'data': data}, f)
+        old_size = path.stat().st_size if path.exists() else 0
+        os.replace(tmp, path)
+        if self._size is None:
+            self._size = self.disk_usage()
+        else:
+            self._size += path.stat().st_size - old_size
+        if self.max_bytes and self._size > self.max_bytes:
+            self.evict()
+
+    def disk_usage(self) -> int:
+        if not self.cache_dir.exists():
+            return 0
+        return sum(p.stat().st_size for p in self.cache_dir.glob('*/*.json'))
+
+    def evict(self):
+        """Drop expired entries, then the oldest ones until under 90% of max_bytes."""
+        entries = []
+        for p in self.cache_dir.glob('*/*.json'):
+            st = p.stat()
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        size = sum(e[1] for e in entries)
+        now = time.time()
+        target = self.max_bytes * 0.9 if self.max_bytes else float('inf')
+        removed = 0
+        for mtime, nbytes, p in entries:
+            expired = self.ttl and now - mtime > self.ttl
+            if not expired and size <= target:
+                break
+            p.unlink(missing_ok=True)
+            size -= nbytes
+            removed += 1
+        self._size = size
+        if removed:
+            print(f"  Cache: evicted {removed} entries ({size / 1e6:.1f} MB kept)")
+
+    def call(self, url: str, params: Optional[Dict], fetch: Callable[[], Any],
+             limiter: Optional[TokenBucket] = None, with_hit: bool = False) -> Any:
+        """Return the cached result for (url, params) or compute it with `fetch`.
+
+        With `with_hit`, return (result, whether it came from the cache).
+        """
+        data = self.get(url, params)
+        if data is not None:
+            self.hits += 1
+            return (data, True) if with_hit else data
+        if self.replay:
+            raise CacheMiss(f"no cached response for {url} (replay mode)")
+        self.misses += 1
+        if limiter:
+            limiter.acquire()
+        data = fetch()
+        self.put(url, params, data)
+        return (data, False) if with_hit else data
+
+    def fetch_json(self, url: str, params: Dict, limiter: Optional[TokenBucket] = None,
+                   session: Optional[requests.Session] = None, with_hit: bool = False) -> Any:
+        def fetch():
+            for attempt in range(config.HTTP_RETRIES + 1):
+                if attempt and limiter:
+                    limiter.acquire()  # a retry is another request against the quota
+                response = (session or requests).get(url, params=params, timeout=config.HTTP_TIMEOUT)
+                if response.status_code in RETRY_STATUSES and attempt < config.HTTP_RETRIES:
+                    self.retries += 1
+                    time.sleep(retry_delay(attempt, response.headers.get('Retry-After')))
+                    continue
+                response.raise_for_status()
+                return response.json()
+        return self.call(url, params, fetch, limiter, with_hit)
+
+    async def fetch_json_async(self, session: aiohttp.ClientSession, url: str, params: Dict,
+                               limiter: Optional[TokenBucket] = None) -> Any:
+        data = self.get(url, params)
+        if data is not None:
+            self.hits += 1
+            return data
+        if self.replay:
+            raise CacheMiss(f"no cached response for {url} (replay mode)")
+        self.misses += 1
+        for attempt in range(config.HTTP_RETRIES + 1):
+            if limiter:
+                await limiter.acquire_async()
+            async with session.get(url, params=params) as response:
+                if response.status in RETRY_STATUSES and attempt < config.HTTP_RETRIES:
+                    self.retries += 1
+                    delay = retry_delay(attempt, response.headers.get('Retry-After'))
+                else:
+                    response.raise_for_status()
+                    data = await response.json()
+                    break
+            await asyncio.sleep(delay)
+        self.put(url, params, data)
+        return data
+
+    def summary(self) -> str:
+        text = f"cache: {self.hits} hits, {self.misses} misses"
+        if self.retries:
+            text += f", {self.retries} retried requests"
+        return text
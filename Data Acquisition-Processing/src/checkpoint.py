@@ -0,0 +1,100 @@
+import csv
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from . import config
+
+
+class CollectionManifest:
+    """Per-window checkpoint for a collector run.
+
+    Each completed date window is appended to `output_file` immediately and recorded
+    in a JSON manifest with its article count and status. A restarted run skips
+    windows already marked 'done' and keeps appending to the same CSV.
+    """
+
+    def __init__(self, name: str, output_file, fieldnames: List[str], fresh: bool = False):
+        config.MANIFEST_DIR.mkdir(parents=True, exist_ok=True)
+        self.path = config.MANIFEST_DIR / f"{name}.json"
+        self.output_file = Path(output_file)
+        self.fieldnames = fieldnames
+        self.state = self._load()
+
+        # Start over if asked to, or if the manifest does not describe this output file
+        if fresh or self.state.get('output_file') != str(self.output_file) or not self.output_file.exists():
+            self.reset()
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def reset(self):
+        self.state = {'output_file': str(self.output_file), 'rows_written': 0, 'windows': {}}
+        with open(self.output_file, 'w', newline='', encoding='utf-8') as f:
+            csv.DictWriter(f, fieldnames=self.fieldnames).writeheader()
+        self.save()
+
+    @property
+    def rows_written(self) -> int:
+        return self.state['rows_written']
+
+    @property
+    def windows(self) -> Dict[str, Dict]:
+        return self.state['windows']
+
+    def is_done(self, key: str) -> bool:
+        return self.windows.get(key, {}).get('status') == 'done'
+
+    def pending(self, keys: List[str]) -> List[str]:
+        return [k for k in keys if not self.is_done(k)]
+
+    def record(self, key: str, articles: int, status: str = 'done', **extra):
+        self.windows[key] = {
+            'status': status,
+            'articles': articles,
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+            **extra
+        }
+        self.save()
+
+    def commit_window(self, key: str, rows: List[Dict], **extra):
+        """Flush a window's rows to the output CSV, then mark the window done."""
+        with open(self.output_file, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=self.fieldnames)
+            writer.writerows(rows)
+        self.state['rows_written'] += len(rows)
+        self.record(key, len(rows), **extra)
+
+    def fail_window(self, key: str, error: str):
+        # Request errors echo the full URL; keep API keys out of the manifest
+        error = re.sub(r'((?:apiKey|api_token|token)=)[^&\s\']+', r'\1***', error)
+        self.record(key, 0, status='failed', error=error)
+
+    def read_column(self, column: str) -> Iterator[str]:
+        """Stream one column of the rows already written (used to rebuild dedupe state)."""
+        with open(self.output_file, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                yield row.get(column, '')
+
+    def summary(self) -> str:
+        statuses = [w['status'] for w in self.windows.values()]
+        text = (f"{statuses.count('done')} windows done, {statuses.count('failed')} failed, "
+                f"{self.rows_written} rows in {self.output_file.name}")
+        available = sum(w.get('available') or 0 for w in self.windows.values())
+        if available:
+            retrieved = sum(w.get('retrieved') or 0 for w in self.windows.values())
+            text += f" ({retrieved:,} of {available:,} available results retrieved)"
+        return text
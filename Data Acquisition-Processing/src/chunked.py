@@ -0,0 +1,234 @@
+import os
+import shutil
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import config
+from .dedup import jaccard, lsh_keys, lsh_params, prepare, shingles
+from .merge_index import _hashes, title_hashes
+from .storage import DatasetWriter, apply_schema, iter_dataset
+from .urls import canonicalize_urls
+
+NAT_BUCKET = '~nat'  # sorts after every 'YYYY-MM', like NaT in sort_values
+
+
+class KeyRuns:
+    """Append-only map of uint64 keys to int64 ids, kept as a few sorted numpy runs.
+
+    Runs are merged binary-counter style (a run is merged into the previous one while
+    it is at least as large), so there are O(log n) runs and each key is re-sorted
+    O(log n) times. Lookups binary-search every run.
+    """
+
+    def __init__(self):
+        self.runs: List[Tuple[np.ndarray, np.ndarray]] = []
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys, _ in self.runs)
+
+    def lookup(self, keys: np.ndarray) -> np.ndarray:
+        found = np.full(len(keys), -1, dtype=np.int64)
+        for run_keys, run_ids in self.runs:
+            idx = np.minimum(np.searchsorted(run_keys, keys), len(run_keys) - 1)
+            hit = (run_keys[idx] == keys) & (found < 0)
+            found[hit] = run_ids[idx[hit]]
+        return found
+
+    def add(self, keys: np.ndarray, ids: np.ndarray):
+        """Add keys that are not in the map yet (and unique among themselves)."""
+        if not len(keys):
+            return
+        order = np.argsort(keys, kind='stable')
+        self.runs.append((keys[order], ids[order]))
+        while len(self.runs) > 1 and len(self.runs[-1][0]) >= len(self.runs[-2][0]):
+            (k2, v2), (k1, v1) = self.runs.pop(), self.runs.pop()
+            keys, ids = np.concatenate([k1, k2]), np.concatenate([v1, v2])
+            order = np.argsort(keys, kind='stable')
+            self.runs.append((keys[order], ids[order]))
+
+
+class TextStore:
+    """Normalized titles by row id in an append-only file, read back with pread."""
+
+    def __init__(self, path: Path):
+        self.file = open(path, 'w+b')
+        self.offsets = array('q', [0])
+
+    def extend(self, texts: Iterable[str]):
+        for text in texts:
+            data = text.encode('utf-8')
+            self.file.write(data)
+            self.offsets.append(self.offsets[-1] + len(data))
+        self.file.flush()
+
+    def get(self, i: int) -> str:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return os.pread(self.file.fileno(), end - start, start).decode('utf-8')
+
+    def close(self):
+        self.file.close()
+
+
+class StreamingUnionFind:
+    """UnionFind over a growing number of rows; the smallest id is always the root."""
+
+    def __init__(self):
+        self.parent = array('q')
+
+    def extend(self, n: int):
+        start = len(self.parent)
+        self.parent.extend(range(start, start + n))
+
+    def find(self, i: int) -> int:
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, i: int, j: int):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+class ChunkedMerger:
+    """Out-of-core version of DataProcessor.merge_datasets with the same output.
+
+    1. Raw files are read in chunks and spilled to one Parquet part per chunk and
+       calendar month, so each month can later be sorted on its own (external sort;
+       parts keep input order, so ties sort exactly like the in-memory stable sort).
+    2. Months are processed in order. Exact titles and canonical URLs are checked
+       against hash maps of every row kept so far. For near-duplicates, each LSH band
+       remembers the first row that had each key, which is the pair the in-memory
+       pass compares too; union-find gives the same clusters.
+    3. A final pass over the kept rows writes cluster representatives to the final
+       file and the rest to the near-duplicates file.
+
+    Memory is bounded by one month of articles plus a few hashes per kept row;
+    titles needed for Jaccard checks are read back from disk.
+    """
+
+    def __init__(self, chunksize: int = None, workdir: Optional[Path] = None):
+        self.chunksize = chunksize or config.CHUNK_SIZE
+        self.workdir = Path(tempfile.mkdtemp(prefix='merge-', dir=workdir or config.INTERMEDIATE_DIR))
+        bands, _ = lsh_params(config.DEDUP_JACCARD_THRESHOLD, config.DEDUP_NUM_PERM)
+        self.titles = KeyRuns()
+        self.urls = KeyRuns()
+        self.firsts = [KeyRuns() for _ in range(bands)]
+        self.texts = TextStore(self.workdir / 'texts.bin')
+        self.clusters = StreamingUnionFind()
+        self.rows = 0  # rows that reached the near-duplicate stage
+        self.loaded = 0
+        self.parts = 0
+
+    # --- 1. spill by month --------------------------------------------------------------
+
+    def spill(self, path) -> int:
+        rows = 0
+        for chunk in iter_dataset(path, self.chunksize):
+            buckets = chunk['date'].dt.strftime('%Y-%m').fillna(NAT_BUCKET)
+            for bucket, group in chunk.groupby(buckets, sort=False):
+                directory = self.workdir / 'spill' / bucket
+                directory.mkdir(parents=True, exist_ok=True)
+                group.to_parquet(directory / f"part-{self.parts:06d}.parquet", index=False)
+                self.parts += 1
+            rows += len(chunk)
+        self.loaded += rows
+        return rows
+
+    def months(self) -> Iterator[pd.DataFrame]:
+        spill = self.workdir / 'spill'
+        for directory in sorted(spill.iterdir()) if spill.exists() else []:
+            parts = sorted(directory.glob('part-*.parquet'))
+            month = pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True)
+            yield month.sort_values('date', kind='stable').reset_index(drop=True)
+            shutil.rmtree(directory)
+
+    # --- 2. deduplicate ---------------------------------------------------------------
+
+    def dedupe(self, month: pd.DataFrame) -> pd.DataFrame:
+        """Rows of a date-sorted month that survive the exact stages, with row ids."""
+        title_hash = title_hashes(month['title'])
+        keep = (self.titles.lookup(title_hash) < 0) & ~pd.Series(title_hash).duplicated().to_numpy()
+        self.titles.add(title_hash[keep], np.zeros(keep.sum(), dtype=np.int64))
+        month = month[keep].reset_index(drop=True)
+
+        month['canonical_url'] = canonicalize_urls(month['url'], verbose=False)
+        url_hash = _hashes(month['canonical_url'].tolist())
+        has_url = url_hash != 0
+        seen = (self.urls.lookup(url_hash) >= 0) | pd.Series(url_hash).duplicated().to_numpy()
+        first_time = has_url & ~seen
+        self.urls.add(url_hash[first_time], np.zeros(first_time.sum(), dtype=np.int64))
+        month = month[~(has_url & seen)].reset_index(drop=True)
+
+        self._cluster(month)
+        month['row_id'] = np.arange(self.rows - len(month), self.rows)
+        return month
+
+    def _cluster(self, month: pd.DataFrame):
+        base, n = self.rows, len(month)
+        texts, sets = prepare(month['title'], month.get('source'))
+        keys = lsh_keys(sets)
+        self.texts.extend(texts)
+        self.clusters.extend(n)
+        self.rows += n
+
+        ids = base + np.arange(n)
+        pairs = set()
+        for band, firsts in enumerate(self.firsts):
+            first = firsts.lookup(keys[:, band])
+            new = first < 0
+            unique, index = np.unique(keys[new, band], return_index=True)
+            new_first = ids[new][index]
+            firsts.add(unique, new_first)
+            first[new] = new_first[np.searchsorted(unique, keys[new, band])]
+            pairs.update(zip(first[first != ids].tolist(), ids[first != ids].tolist()))
+
+        cached: Dict[int, set] = {}
+        for i, j in pairs:
+            if i >= base:
+                first_set = sets[i - base]
+            else:
+                if i not in cached:
+                    cached[i] = shingles(self.texts.get(i), config.DEDUP_SHINGLE_SIZE)
+                first_set = cached[i]
+            if first_set and jaccard(first_set, sets[j - base]) >= config.DEDUP_JACCARD_THRESHOLD:
+                self.clusters.union(i, j)
+
+    # --- 3. write -----------------------------------------------------------------------
+
+    def run(self, raw_files: Iterable[Tuple[str, Path]], output: Path, near_duplicates: Path):
+        kept_dir = self.workdir / 'kept'
+        kept_dir.mkdir()
+        try:
+            for label, path in raw_files:
+                print(f"Loaded {self.spill(path)} articles from {label}")
+            for k, month in enumerate(self.months()):
+                month = self.dedupe(month)
+                apply_schema(month).to_parquet(kept_dir / f"{k:06d}.parquet", index=False)
+
+            with DatasetWriter(output) as final, DatasetWriter(near_duplicates) as dropped:
+                for part in sorted(kept_dir.glob('*.parquet')):
+                    rows = pd.read_parquet(part)
+                    row_ids = rows.pop('row_id').to_numpy()
+                    roots = np.fromiter((self.clusters.find(int(i)) for i in row_ids), dtype=np.int64, count=len(rows))
+                    rows['cluster_id'] = roots
+                    representative = roots == row_ids
+                    if representative.any():
+                        final.write(rows[representative])
+                    if (~representative).any():
+                        dropped.write(rows[~representative])
+            print(f"Near-duplicate titles: {dropped.rows} rows merged into earlier articles "
+                  f"(Jaccard >= {config.DEDUP_JACCARD_THRESHOLD})")
+            print(f"Removed {self.loaded - final.rows} duplicates")
+            return final.close(), final.rows
+        finally:
+            self.texts.close()
+            shutil.rmtree(self.workdir, ignore_errors=True)
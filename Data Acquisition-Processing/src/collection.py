@@ -1,15 +1,192 @@
+import asyncio
+import math
 import requests
-import time
 import csv
+import aiohttp
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Tuple
+import gnews.gnews
 from gnews import GNews
 from . import config
+from .cache import ResponseCache
+from .checkpoint import CollectionManifest
+from .dates import normalize_rows
+from .planning import WindowPlanner, YieldPlanner
+from .ratelimit import TokenBucket
+from .scheduling import ProviderQuota, QuotaExhausted, Task
+from .seen_index import SeenIndex
+from .sources import REGISTRY
+from .urls import canonical_url
 
-class NewsAPICollector:
-    def __init__(self):
+Page = Tuple[List[Dict], int]  # (articles on the page, total results available)
+PAGE_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, requests.exceptions.RequestException)
+
+if config.GNEWS_BASE_URL:
+    # The GNews library builds its feed URLs from this module constant
+    gnews.gnews.BASE_URL = config.GNEWS_BASE_URL
+
+
+def page_count(first_page: Page, max_pages: int) -> int:
+    articles, total = first_page
+    # A full first page tells us the provider's real page size
+    if not articles or total <= len(articles):
+        return 1
+    return min(max_pages, math.ceil(total / len(articles)))
+
+
+def fetch_pages(fetch_page: Callable[[int], Page], max_pages: int) -> Page:
+    """Fetch page 1, then the remaining pages (up to `max_pages`) concurrently.
+
+    Returns all articles in page order plus the total the provider reported. A failure
+    after the first page keeps the pages retrieved so far, unless the daily quota ran out.
+    """
+    articles, total = fetch_page(1)
+    n_pages = page_count((articles, total), max_pages)
+    if n_pages > 1:
+        with ThreadPoolExecutor(max_workers=min(config.PAGE_FETCH_WORKERS, n_pages - 1)) as pool:
+            futures = [pool.submit(fetch_page, page) for page in range(2, n_pages + 1)]
+            for page, future in enumerate(futures, 2):
+                try:
+                    articles.extend(future.result()[0])
+                except QuotaExhausted:
+                    raise  # a partial window would be checkpointed as done; retry it with fresh quota
+                except PAGE_ERRORS as e:
+                    print(f"  ⚠ Page {page} failed ({e}); keeping {len(articles)} of {total}")
+                    break
+    return articles, total
+
+
+async def fetch_pages_async(fetch_page, max_pages: int) -> Page:
+    """asyncio counterpart of fetch_pages; `fetch_page` is a coroutine function."""
+    articles, total = await fetch_page(1)
+    n_pages = page_count((articles, total), max_pages)
+    if n_pages > 1:
+        results = await asyncio.gather(
+            *(fetch_page(page) for page in range(2, n_pages + 1)), return_exceptions=True
+        )
+        for page, result in enumerate(results, 2):
+            if isinstance(result, QuotaExhausted):
+                raise result
+            if isinstance(result, BaseException):
+                print(f"  ⚠ Page {page} failed ({result}); keeping {len(articles)} of {total}")
+                break
+            articles.extend(result[0])
+    return articles, total
+
+
+class Collector:
+    """Common shape of every provider's collector.
+
+    A collector turns its pending work into Tasks, one per date window or source.
+    `fetch` does the network part and `write` filters the articles and appends the rows
+    to the collector's checkpointed CSV. `collect()`
+    runs the tasks in order; scheduling.QuotaScheduler runs the tasks of every
+    collector at once. Collectors on the same `provider` share one quota.
+    """
+    name = ''
+    provider = ''
+    FIELDNAMES: List[str] = []
+    ERRORS: Tuple = (requests.exceptions.RequestException,)
+
+    def __init__(self, output_file, cache: Optional[ResponseCache] = None, seen: Optional[SeenIndex] = None):
+        self.output_file = output_file
+        self.cache = cache if cache is not None else ResponseCache()
+        self.limiter = ProviderQuota.for_provider(self.provider)
+        # Optional shared seen-index of the merged dataset: skip articles it already has.
+        # Collected rows are not added to it, so a --fresh re-run finds the same articles again.
+        self.seen = seen
+        self.manifest: Optional[CollectionManifest] = None
+
+    def ready(self) -> bool:
+        return True
+
+    def open(self, fresh: bool = False) -> CollectionManifest:
+        self.manifest = CollectionManifest(self.name, self.output_file, self.FIELDNAMES, fresh)
+        return self.manifest
+
+    def tasks(self, fresh: bool = False) -> List[Task]:
+        raise NotImplementedError
+
+    def is_seen(self, url: Optional[str], title: Optional[str]) -> bool:
+        return self.seen is not None and self.seen.seen(url, title)
+
+    def normalize(self, rows: List[Dict]) -> List[Dict]:
+        """Parse the rows' publish dates to YYYY-MM-DD in one pass, in the provider's format."""
+        unparsed = normalize_rows(rows, self.provider, self.name)
+        if unparsed:
+            print(f"  ⚠ {unparsed} dates could not be parsed (logged to {config.UNPARSED_DATES_FILE.name})")
+        return rows
+
+    def commit(self, key: str, rows: List[Dict], **extra):
+        self.manifest.commit_window(key, self.normalize(rows), **extra)
+
+    def window_task(self, key: str, coverage: Dict[str, str], fetch: Callable[[], Page],
+                    select: Callable[[List[Dict]], List[Dict]], label: str = None) -> Task:
+        """Task for one paged window: `select` turns the fetched articles into output rows."""
+        label = label or key
+
+        def write(page: Optional[Page], error: Optional[Exception] = None) -> int:
+            if error is not None:
+                print(f"  {label}: request failed: {error}")
+                self.manifest.fail_window(key, str(error))
+                return 0
+            articles, total = page
+            rows = select(articles)
+            self.commit(key, rows, available=total, retrieved=len(articles), **self.window_extra(key, rows))
+            print(f"  {label}: {len(rows)} rows kept ({len(articles)} of {total} available)")
+            return len(rows)
+
+        return Task(key, coverage, fetch, write)
+
+    def window_done(self, window: Tuple[str, str]) -> bool:
+        """Whether a (from, to) date window is checkpointed as done in the open manifest."""
+        return self.manifest is not None and self.manifest.is_done(f"{window[0]}_{window[1]}")
+
+    def window_extra(self, key: str, rows: List[Dict]) -> Dict:
+        """Extra manifest fields recorded with a finished window."""
+        return {}
+
+    def run_task(self, task: Task) -> int:
+        try:
+            result = task.fetch()
+        except self.ERRORS as e:
+            return task.write(None, e)
+        return task.write(result, None)
+
+    def collect(self, fresh: bool = False):
+        if not self.ready():
+            return
+        print(f"Collecting from {self.name}...")
+        tasks = self.tasks(fresh)
+        for idx, task in enumerate(tasks, 1):
+            if self.limiter.remaining() == 0:
+                print(f"⚠ {self.provider} daily quota used; {len(tasks) - idx + 1} windows left for the next run")
+                break
+            print(f"[{idx}/{len(tasks)}] {task.key}")
+            self.run_task(task)
+        self.finish()
+
+    def finish(self):
+        self.limiter.flush()
+        print(f"  {self.cache.summary()}")
+        print(f"✓ {self.manifest.summary()}")
+
+
+class NewsAPICollector(Collector):
+    FIELDNAMES = ['article_id', 'source', 'source_leaning', 'date', 'title',
+                  'description', 'url', 'author', 'content']
+
+    name = 'newsapi'
+    provider = 'newsapi'
+
+    def __init__(self, cache: Optional[ResponseCache] = None, seen: Optional[SeenIndex] = None,
+                 adaptive: bool = False):
+        super().__init__(config.RAW_ARTICLES_FILE, cache, seen)
         self.api_key = config.NEWS_API_KEY
         self.base_url = config.NEWS_API_BASE_URL
+        self.adaptive = adaptive
+        self.seen_titles = set()
 
     def get_date_ranges(self, start_date: str, end_date: str, interval_days: int = 30) -> List[tuple]:
         ranges = []
@@ -27,7 +204,8 @@ class NewsAPICollector:
             current = next_date
         return ranges
 
-    def fetch_articles(self, query: str, from_date: str, to_date: str, sources: Optional[str] = None) -> List[Dict]:
+    def build_params(self, query: str, from_date: str, to_date: str, sources: Optional[str] = None,
+                     page: int = 1) -> Dict:
         params = {
             'q': query,
             'from': from_date,
@@ -39,81 +217,189 @@ class NewsAPICollector:
         }
         if sources:
             params['sources'] = sources
-        
+        if page > 1:
+            params['page'] = page
+        return params
+
+    def parse_response(self, data: Dict) -> Page:
+        if data.get('status') == 'ok':
+            articles = data.get('articles', [])
+            return articles, data.get('totalResults', len(articles))
+        raise requests.exceptions.RequestException(f"API Error: {data.get('message', 'Unknown error')}")
+
+    def fetch_window(self, query: str, from_date: str, to_date: str, sources: Optional[str] = None) -> Page:
+        """Fetch every page of one date window, raising on request or API errors."""
+        def fetch_page(page):
+            params = self.build_params(query, from_date, to_date, sources, page)
+            return self.parse_response(self.cache.fetch_json(self.base_url, params, self.limiter))
+        return fetch_pages(fetch_page, config.NEWS_API_MAX_PAGES)
+
+    def probe(self, query: str, from_date: str, to_date: str, sources: Optional[str] = None) -> int:
+        """Total results for a window, from its first page (which the cache reuses for the real fetch)."""
+        params = self.build_params(query, from_date, to_date, sources)
+        return self.parse_response(self.cache.fetch_json(self.base_url, params, self.limiter))[1]
+
+    def plan_windows(self, adaptive: bool = False) -> List[tuple]:
+        date_ranges = self.get_date_ranges(config.START_DATE, config.END_DATE)
+        if not adaptive:
+            return date_ranges
+        source_string = self.get_source_string()
+        planner = WindowPlanner(
+            'newsapi', 100 * config.NEWS_API_MAX_PAGES,
+            lambda from_date, to_date: self.probe(config.SEARCH_QUERY, from_date, to_date, source_string),
+            quota=self.limiter, is_done=self.window_done
+        )
+        return planner.plan(date_ranges)
+
+    def fetch_articles(self, query: str, from_date: str, to_date: str, sources: Optional[str] = None) -> List[Dict]:
         try:
-            response = requests.get(self.base_url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            if data.get('status') == 'ok':
-                return data.get('articles', [])
-            else:
-                print(f"API Error: {data.get('message', 'Unknown error')}")
-                return []
+            return self.fetch_window(query, from_date, to_date, sources)[0]
         except requests.exceptions.RequestException as e:
             print(f"Request failed: {e}")
             return []
 
-    def collect(self):
-        if not self.api_key:
-            print("⚠ WARNING: NEWS_API_KEY not set.")
-            return
+    async def fetch_window_async(self, session: aiohttp.ClientSession, limiter: TokenBucket, query: str,
+                                 from_date: str, to_date: str, sources: Optional[str] = None) -> Page:
+        async def fetch_page(page):
+            params = self.build_params(query, from_date, to_date, sources, page)
+            data = await self.cache.fetch_json_async(session, self.base_url, params, limiter)
+            return self.parse_response(data)
+        return await fetch_pages_async(fetch_page, config.NEWS_API_MAX_PAGES)
 
-        print("Collecting from NewsAPI...")
-        all_articles = []
-        date_ranges = self.get_date_ranges(config.START_DATE, config.END_DATE)
-        
+    async def fetch_articles_async(self, session: aiohttp.ClientSession, limiter: TokenBucket, query: str,
+                                   from_date: str, to_date: str, sources: Optional[str] = None) -> List[Dict]:
+        try:
+            articles, _ = await self.fetch_window_async(session, limiter, query, from_date, to_date, sources)
+            return articles
+        except PAGE_ERRORS as e:
+            print(f"Request failed: {e}")
+            return []
+
+    def get_source_string(self) -> str:
         all_source_ids = []
-        for sources in config.SOURCES.values():
+        for sources in REGISTRY.newsapi_sources().values():
             all_source_ids.extend(sources)
-        source_string = ','.join(all_source_ids)
-
-        for idx, (from_date, to_date) in enumerate(date_ranges, 1):
-            print(f"[{idx}/{len(date_ranges)}] Fetching: {from_date} to {to_date}")
-            articles = self.fetch_articles(config.SEARCH_QUERY, from_date, to_date, source_string)
-            print(f"  → Retrieved {len(articles)} articles")
-            all_articles.extend(articles)
-            time.sleep(1)
-
-        # Filter and Deduplicate
-        relevant = [a for a in all_articles if 'Trump' in a.get('title', '') or 'Trump' in a.get('description', '')]
-        unique = {a.get('title'): a for a in relevant}.values()
-        
-        self.save_to_csv(list(unique), config.RAW_ARTICLES_FILE)
+        return ','.join(all_source_ids)
+
+    def ready(self) -> bool:
+        if not self.api_key and not self.cache.replay:
+            print("⚠ WARNING: NEWS_API_KEY not set.")
+            return False
+        return True
+
+    def tasks(self, fresh: bool = False) -> List[Task]:
+        manifest = self.open(fresh)
+        # Titles kept by earlier runs, so dedupe holds across restarts
+        self.seen_titles = set(manifest.read_column('title'))
+        source_string = self.get_source_string()
+        return [
+            self.window_task(
+                f"{from_date}_{to_date}", {'year': from_date[:4]},
+                lambda f=from_date, t=to_date: self.fetch_window(config.SEARCH_QUERY, f, t, source_string),
+                self.select
+            )
+            for from_date, to_date in self.plan_windows(self.adaptive)
+            if not manifest.is_done(f"{from_date}_{to_date}")
+        ]
+
+    def collect(self, use_async: bool = False, fresh: bool = False, adaptive: bool = False):
+        self.adaptive = adaptive or self.adaptive
+        if not use_async:
+            return super().collect(fresh)
+        if not self.ready():
+            return
+        tasks = self.tasks(fresh)
+        asyncio.run(self.collect_async([tuple(task.key.split('_')) for task in tasks]))
+        self.finish()
+
+    async def collect_async(self, date_ranges: List[tuple]):
+        """Fetch every pending date window concurrently over one pooled session.
+
+        Throughput is bounded by the token bucket (NEWS_API_REQUESTS_PER_SECOND)
+        rather than by per-request latency. Windows are checkpointed as they finish.
+        """
+        print("Collecting from NewsAPI (async)...")
+        source_string = self.get_source_string()
+        # Same provider budget as the sync path, with room for a burst of concurrent requests
+        limiter = ProviderQuota(self.provider, capacity=config.NEWS_API_BURST)
+        semaphore = asyncio.Semaphore(config.NEWS_API_MAX_CONCURRENCY)
+        connector = aiohttp.TCPConnector(limit=config.NEWS_API_MAX_CONCURRENCY)
+        timeout = aiohttp.ClientTimeout(total=config.HTTP_TIMEOUT)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            async def fetch_window(idx, from_date, to_date):
+                task = self.window_task(f"{from_date}_{to_date}", {'year': from_date[:4]}, None, self.select,
+                                        label=f"[{idx}/{len(date_ranges)}] {from_date} to {to_date}")
+                async with semaphore:
+                    try:
+                        page = await self.fetch_window_async(
+                            session, limiter, config.SEARCH_QUERY, from_date, to_date, source_string
+                        )
+                    except PAGE_ERRORS as e:
+                        task.write(None, e)
+                        return
+                task.write(page, None)
+
+            await asyncio.gather(*(
+                fetch_window(idx, from_date, to_date)
+                for idx, (from_date, to_date) in enumerate(date_ranges, 1)
+            ))
+
+    def select(self, articles: List[Dict]) -> List[Dict]:
+        # Filter and Deduplicate (across windows, including those from earlier runs)
+        rows = []
+        for a in articles:
+            title = a.get('title') or ''
+            if 'Trump' not in title and 'Trump' not in (a.get('description') or ''):
+                continue
+            if title in self.seen_titles:
+                continue
+            if self.is_seen(a.get('url'), title):
+                continue
+            self.seen_titles.add(title)
+            rows.append(self.to_row(a, self.manifest.rows_written + len(rows) + 1))
+        return rows
+
+    def to_row(self, article: Dict, idx) -> Dict:
+        source_name = article.get('source', {}).get('id', '')
+        leaning = 'unknown'
+        for category, sources in REGISTRY.newsapi_sources().items():
+            if source_name in sources:
+                leaning = category
+                break
+
+        return {
+            'article_id': idx,
+            'source': article.get('source', {}).get('name', ''),
+            'source_leaning': leaning,
+            'date': article.get('publishedAt', ''),
+            'title': article.get('title', ''),
+            'description': article.get('description', ''),
+            'url': article.get('url', ''),
+            'author': article.get('author', ''),
+            'content': article.get('content', '')
+        }
 
     def save_to_csv(self, articles: List[Dict], filename):
-        fieldnames = ['article_id', 'source', 'source_leaning', 'date', 'title', 
-                      'description', 'url', 'author', 'content']
-        
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.DictWriter(csvfile, fieldnames=self.FIELDNAMES)
             writer.writeheader()
-            
-            for idx, article in enumerate(articles, 1):
-                source_name = article.get('source', {}).get('id', '')
-                leaning = 'unknown'
-                for category, sources in config.SOURCES.items():
-                    if source_name in sources:
-                        leaning = category
-                        break
-                
-                writer.writerow({
-                    'article_id': idx,
-                    'source': article.get('source', {}).get('name', ''),
-                    'source_leaning': leaning,
-                    'date': article.get('publishedAt', '')[:10],
-                    'title': article.get('title', ''),
-                    'description': article.get('description', ''),
-                    'url': article.get('url', ''),
-                    'author': article.get('author', ''),
-                    'content': article.get('content', '')
-                })
+            writer.writerows(self.normalize([self.to_row(article, idx) for idx, article in enumerate(articles, 1)]))
         print(f"✓ Saved {len(articles)} articles to {filename}")
 
 
-class TheNewsAPICollector:
-    def __init__(self):
+class TheNewsAPICollector(Collector):
+    FIELDNAMES = ['article_id', 'source', 'date', 'title', 'description', 'url', 'snippet']
+
+    name = 'thenewsapi'
+    provider = 'thenewsapi'
+
+    def __init__(self, cache: Optional[ResponseCache] = None, seen: Optional[SeenIndex] = None,
+                 adaptive: bool = False):
+        super().__init__(config.RAW_ARTICLES_THENEWSAPI_FILE, cache, seen)
         self.api_key = config.THENEWSAPI_KEY
         self.base_url = config.THENEWSAPI_BASE_URL
+        self.adaptive = adaptive
 
     def get_month_ranges(self, start_date: str, end_date: str) -> List[tuple]:
         ranges = []
@@ -128,7 +414,15 @@ class TheNewsAPICollector:
             current = next_month
         return ranges
 
-    def fetch_articles(self, query: str, from_date: str, to_date: str) -> List[Dict]:
+    def fetch_window(self, query: str, from_date: str, to_date: str) -> Page:
+        """Fetch every page of one month, raising on request errors."""
+        def fetch_page(page):
+            data = self.cache.fetch_json(self.base_url, self.build_params(query, from_date, to_date, page), self.limiter)
+            articles = data.get('data', [])
+            return articles, data.get('meta', {}).get('found', len(articles))
+        return fetch_pages(fetch_page, config.THENEWSAPI_MAX_PAGES)
+
+    def build_params(self, query: str, from_date: str, to_date: str, page: int = 1) -> Dict:
         params = {
             'api_token': self.api_key,
             'search': query,
@@ -138,95 +432,343 @@ class TheNewsAPICollector:
             'published_before': to_date,
             'limit': 100
         }
+        if page > 1:
+            params['page'] = page
+        return params
+
+    def probe(self, query: str, from_date: str, to_date: str) -> int:
+        """Total results for a window, from its first page (which the cache reuses for the real fetch)."""
+        data = self.cache.fetch_json(self.base_url, self.build_params(query, from_date, to_date), self.limiter)
+        return data.get('meta', {}).get('found', len(data.get('data', [])))
+
+    def plan_windows(self, adaptive: bool = False) -> List[tuple]:
+        month_ranges = self.get_month_ranges(config.START_DATE, config.END_DATE)
+        if not adaptive:
+            return month_ranges
+        planner = WindowPlanner(
+            'thenewsapi', 100 * config.THENEWSAPI_MAX_PAGES,
+            lambda from_date, to_date: self.probe(config.SEARCH_QUERY, from_date, to_date),
+            quota=self.limiter, is_done=self.window_done
+        )
+        return planner.plan(month_ranges)
+
+    def fetch_articles(self, query: str, from_date: str, to_date: str) -> List[Dict]:
         try:
-            response = requests.get(self.base_url, params=params)
-            response.raise_for_status()
-            return response.json().get('data', [])
+            return self.fetch_window(query, from_date, to_date)[0]
         except requests.exceptions.RequestException as e:
             print(f"Request failed: {e}")
             return []
 
-    def collect(self):
-        if not self.api_key:
+    def ready(self) -> bool:
+        if not self.api_key and not self.cache.replay:
             print("⚠ WARNING: THENEWSAPI_KEY not set.")
-            return
+            return False
+        return True
 
-        print("Collecting from TheNewsAPI...")
-        all_articles = []
-        month_ranges = self.get_month_ranges(config.START_DATE, config.END_DATE)
+    def tasks(self, fresh: bool = False) -> List[Task]:
+        manifest = self.open(fresh)
+        return [
+            self.window_task(
+                f"{from_date}_{to_date}", {'year': from_date[:4]},
+                lambda f=from_date, t=to_date: self.fetch_window(config.SEARCH_QUERY, f, t),
+                self.select, label=from_date[:7]
+            )
+            for from_date, to_date in self.plan_windows(self.adaptive)
+            if not manifest.is_done(f"{from_date}_{to_date}")
+        ]
+
+    def collect(self, fresh: bool = False, adaptive: bool = False):
+        self.adaptive = adaptive or self.adaptive
+        super().collect(fresh)
 
-        for idx, (from_date, to_date) in enumerate(month_ranges, 1):
-            print(f"[{idx}/{len(month_ranges)}] {from_date[:7]} ...", end=' ')
-            articles = self.fetch_articles(config.SEARCH_QUERY, from_date, to_date)
-            print(f"{len(articles)} articles")
-            all_articles.extend(articles)
-            time.sleep(0.5)
+    def select(self, articles: List[Dict]) -> List[Dict]:
+        articles = [a for a in articles if not self.is_seen(a.get('url'), a.get('title'))]
+        start = self.manifest.rows_written + 1
+        return [self.to_row(a, i) for i, a in enumerate(articles, start)]
 
-        self.save_to_csv(all_articles, config.RAW_ARTICLES_THENEWSAPI_FILE)
+    def to_row(self, article: Dict, idx) -> Dict:
+        return {
+            'article_id': idx,
+            'source': article.get('source', ''),
+            'date': article.get('published_at', ''),
+            'title': article.get('title', ''),
+            'description': article.get('description', ''),
+            'url': article.get('url', ''),
+            'snippet': article.get('snippet', '')
+        }
 
     def save_to_csv(self, articles: List[Dict], filename):
         with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=['article_id', 'source', 'date', 'title', 'description', 'url', 'snippet'])
+            writer = csv.DictWriter(f, fieldnames=self.FIELDNAMES)
             writer.writeheader()
-            for idx, article in enumerate(articles, 1):
-                writer.writerow({
-                    'article_id': idx,
-                    'source': article.get('source', ''),
-                    'date': article.get('published_at', '')[:10],
-                    'title': article.get('title', ''),
-                    'description': article.get('description', ''),
-                    'url': article.get('url', ''),
-                    'snippet': article.get('snippet', '')
-                })
+            writer.writerows(self.normalize([self.to_row(article, idx) for idx, article in enumerate(articles, 1)]))
         print(f"✓ Saved {len(articles)} articles to {filename}")
 
 
-class GNewsCollector:
-    def collect(self):
-        print("Collecting from GNews...")
-        all_articles = []
+class GNewsCollector(Collector):
+    FIELDNAMES = ['article_id', 'source', 'date', 'title', 'description', 'url', 'snippet']
+
+    name = 'gnews'
+    provider = 'gnews'
+    # The GNews library surfaces feed and network problems as assorted exception types
+    ERRORS = (Exception,)
+
+    def __init__(self, cache: Optional[ResponseCache] = None, seen: Optional[SeenIndex] = None):
+        super().__init__(config.RAW_ARTICLES_GNEWS_FILE, cache, seen)
+        self.year_urls: Dict[int, set] = {}
+
+    def search(self, google_news: GNews, query: str) -> List[Dict]:
+        """Run a GNews query through the response cache (keyed on query and date range)."""
+        params = {
+            'q': query,
+            'language': google_news.language,
+            'country': google_news.country,
+            'max_results': google_news.max_results,
+            'start_date': google_news.start_date,
+            'end_date': google_news.end_date,
+        }
+        return self.cache.call(config.GNEWS_CACHE_URL, params, lambda: google_news.get_news(query), self.limiter)
+
+    def search_month(self, year: int, month: int) -> List[Dict]:
+        # One GNews client per query: its date range is instance state, so clients can't be shared across threads
         google_news = GNews(language='en', country='US', max_results=100)
+        google_news.start_date = (year, month, 1)
+        google_news.end_date = (year, month, 28)
+        return self.search(google_news, config.SEARCH_QUERY)
 
-        for year in config.GNEWS_YEARS:
-            print(f"Processing {year}...")
-            year_articles = []
-            for month in range(1, 13):
-                google_news.start_date = (year, month, 1)
-                google_news.end_date = (year, month, 28)
-                try:
-                    articles = google_news.get_news(config.SEARCH_QUERY)
-                    count = 0
-                    for art in articles:
-                        if count >= 5: break
-                        if not any(a['url'] == art['url'] for a in year_articles):
-                            year_articles.append(art)
-                            count += 1
-                    time.sleep(1)
-                except Exception as e:
-                    print(f"Error {year}-{month:02d}: {e}")
-            all_articles.extend(year_articles)
-
-        self.save_to_csv(all_articles, config.RAW_ARTICLES_GNEWS_FILE)
+    def tasks(self, fresh: bool = False) -> List[Task]:
+        manifest = self.open(fresh)
+        months = [(year, month) for year in config.GNEWS_YEARS for month in range(1, 13)]
+
+        # Canonical URLs already kept per year, including months finished in earlier runs
+        self.year_urls = {year: set() for year in config.GNEWS_YEARS}
+        for year, month in months:
+            self.year_urls[year].update(manifest.windows.get(f"{year}-{month:02d}", {}).get('urls', []))
+
+        return [
+            self.window_task(
+                f"{year}-{month:02d}", {'year': str(year)},
+                lambda y=year, m=month: self.search_page(y, m),
+                lambda articles, y=year: self.select(articles, y)
+            )
+            for year, month in months
+            if not manifest.is_done(f"{year}-{month:02d}")
+        ]
+
+    def search_page(self, year: int, month: int) -> Page:
+        articles = self.search_month(year, month)
+        return articles, len(articles)
+
+    def collect(self, fresh: bool = False):
+        if not self.ready():
+            return
+        print("Collecting from GNews...")
+        tasks = self.tasks(fresh)
+        remaining = self.limiter.remaining()
+        if remaining is not None and remaining < len(tasks):
+            # One request per monthly query; the pool cannot stop mid-run like the serial loop
+            print(f"⚠ {self.provider} daily quota: {remaining} of {len(tasks)} windows this run, the rest next run")
+            tasks = tasks[:remaining]
+
+        def fetch(task):
+            try:
+                return task.fetch(), None
+            except self.ERRORS as e:
+                return None, e
+
+        # Queries run on a bounded pool (still paced by the shared rate limiter); results are
+        # written in calendar order so per-year dedupe is deterministic.
+        with ThreadPoolExecutor(max_workers=config.GNEWS_MAX_WORKERS) as pool:
+            for task, (page, error) in zip(tasks, pool.map(fetch, tasks)):
+                task.write(page, error)
+
+        self.finish()
+
+    def select(self, articles: List[Dict], year: int) -> List[Dict]:
+        per_month = config.GNEWS_ARTICLES_PER_YEAR // 12
+        month_articles = []
+        for art in articles:
+            if len(month_articles) >= per_month: break
+            url = canonical_url(art.get('url'))
+            if self.is_seen(url, art.get('title')):
+                continue
+            if url and url not in self.year_urls[year]:
+                self.year_urls[year].add(url)
+                month_articles.append(art)
+        start = self.manifest.rows_written + 1
+        return [self.to_row(a, i) for i, a in enumerate(month_articles, start)]
+
+    def window_extra(self, key: str, rows: List[Dict]) -> Dict:
+        return {'urls': [canonical_url(r['url']) for r in rows]}
+
+    def to_row(self, article: Dict, idx) -> Dict:
+        return {
+            'article_id': f"G{idx}",
+            'source': article.get('publisher', {}).get('title', ''),
+            'date': article.get('published date', ''),
+            'title': article.get('title', ''),
+            'description': article.get('description', ''),
+            'url': article.get('url', ''),
+            'snippet': ''
+        }
 
     def save_to_csv(self, articles: List[Dict], filename):
         with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=['article_id', 'source', 'date', 'title', 'description', 'url', 'snippet'])
+            writer = csv.DictWriter(f, fieldnames=self.FIELDNAMES)
             writer.writeheader()
-            for idx, article in enumerate(articles, 1):
-                pub_date = article.get('published date', '')
-                try:
-                    dt = datetime.strptime(pub_date, '%a, %d %b %Y %H:%M:%S %Z')
-                    date_str = dt.strftime('%Y-%m-%d')
-                except:
-                    date_str = pub_date
-                
-                writer.writerow({
-                    'article_id': f"G{idx}",
-                    'source': article.get('publisher', {}).get('title', ''),
-                    'date': date_str,
-                    'title': article.get('title', ''),
-                    'description': article.get('description', ''),
-                    'url': article.get('url', ''),
-                    'snippet': ''
-                })
+            writer.writerows(self.normalize([self.to_row(article, idx) for idx, article in enumerate(articles, 1)]))
         print(f"✓ Saved {len(articles)} articles to {filename}")
+
+
+class TargetedCollector(Collector):
+    """Collect more Center and Right North American sources (one task per domain)"""
+    name = 'supplemental'
+    provider = 'thenewsapi'
+    FIELDNAMES = ['article_id', 'source', 'source_leaning', 'date', 'title', 'description', 'url', 'snippet']
+
+    def __init__(self, cache: Optional[ResponseCache] = None, seen: Optional[SeenIndex] = None,
+                 per_source: int = None):
+        super().__init__(config.SUPPLEMENTAL_ARTICLES_FILE, cache, seen)
+        self.api_key = config.THENEWSAPI_KEY
+        self.base_url = config.THENEWSAPI_BASE_URL
+        self.per_source = config.TARGETED_PER_SOURCE if per_source is None else per_source
+        self.target_sources = REGISTRY.collection('targeted')
+        self.planner = YieldPlanner(self.name)
+
+    def ready(self) -> bool:
+        if not self.api_key and not self.cache.replay:
+            print("⚠ WARNING: THENEWSAPI_KEY not set.")
+            return False
+        return True
+
+    def tasks(self, fresh: bool = False) -> List[Task]:
+        manifest = self.open(fresh)
+        return [
+            self.window_task(
+                source, {'source': source},
+                lambda s=source: self.fetch_source(s),
+                lambda articles, s=source, l=leaning: self.select(articles, s, l)
+            )
+            for leaning, sources in self.target_sources.items()
+            for source in sources
+            if not manifest.is_done(source)
+        ]
+
+    def fetch_source(self, source: str) -> Page:
+        """Walk the periods, best expected yield first, until enough unseen articles are found."""
+        articles, found, urls = [], 0, set()
+        # A replay re-reads the last page each period got from the network, exhausted or not
+        replay = self.cache.replay
+        for start, end in self.planner.order(source, config.TARGETED_PERIODS, prune=not replay):
+            if len(articles) >= self.per_source:
+                break
+            params = {
+                'api_token': self.api_key,
+                'search': 'Donald Trump',
+                'language': 'en',
+                'domains': source,
+                'published_after': start,
+                'published_before': end,
+                'limit': 100
+            }
+            if replay:
+                page = max(1, self.planner.last_page(source, (start, end)))
+            else:
+                page = self.planner.next_page(source, (start, end))
+            if page > 1:
+                params['page'] = page
+            data, cached = self.cache.fetch_json(self.base_url, params, self.limiter, with_hit=True)
+            period_found = data.get('meta', {}).get('found', len(data.get('data', [])))
+            found += period_found
+            before = len(articles)
+            for a in data.get('data', []):
+                if a.get('url') in urls or self.is_seen(a.get('url'), a.get('title')):
+                    continue
+                urls.add(a.get('url'))
+                articles.append(a)
+            if not cached:
+                # Cached responses were recorded (and the cursor moved on) by the run that fetched them.
+                # Only the articles that fit under per_source are kept, so only they count as yield.
+                kept = min(len(articles), self.per_source) - before
+                self.planner.record(source, (start, end), page, len(data.get('data', [])), kept,
+                                    period_found, params['limit'])
+        return articles, found
+
+    def estimate(self) -> List[Dict]:
+        """Dry-run plan: per source, the calls expected to reach per_source new articles."""
+        plan = []
+        for leaning, sources in self.target_sources.items():
+            for source in sources:
+                order = self.planner.order(source, config.TARGETED_PERIODS)
+                calls, expected = self.planner.estimate(source, config.TARGETED_PERIODS, self.per_source)
+                plan.append({
+                    'source': source,
+                    'leaning': leaning,
+                    'calls': calls,
+                    'expected_new': expected,
+                    'periods': order[:calls],
+                    'pruned': len(config.TARGETED_PERIODS) - len(order),
+                })
+        return plan
+
+    def select(self, articles: List[Dict], source: str, leaning: str) -> List[Dict]:
+        start = self.manifest.rows_written + 1
+        return [{
+            'article_id': f"SUPP_{i}",
+            'source': source,
+            'source_leaning': leaning.capitalize(),
+            'date': a.get('published_at') or '',
+            'title': a.get('title', ''),
+            'description': a.get('description', ''),
+            'url': a.get('url', ''),
+            'snippet': a.get('snippet', '')
+        } for i, a in enumerate(articles[:self.per_source], start)]
+
+
+class LeftSourcesCollector(Collector):
+    """Trump coverage from Left-leaning domains via GNews, one task per (domain, year)."""
+    name = 'left_sources'
+    provider = 'gnews'
+    FIELDNAMES = ['title', 'description', 'source', 'date', 'url']
+    ERRORS = (Exception,)
+
+    def __init__(self, cache: Optional[ResponseCache] = None, seen: Optional[SeenIndex] = None):
+        super().__init__(config.LEFT_ARTICLES_RAW_FILE, cache, seen)
+        self.gnews = GNewsCollector(self.cache)
+
+    def tasks(self, fresh: bool = False) -> List[Task]:
+        manifest = self.open(fresh)
+        return [
+            self.window_task(
+                f"{domain}:{year}", {'year': str(year), 'source': domain},
+                lambda d=domain, y=year: self.search(d, y),
+                lambda articles, d=domain: self.select(articles, d),
+                label=f"{domain} {year}"
+            )
+            for year in config.GNEWS_YEARS
+            for domain in REGISTRY.collection('gnews_left')['left']
+            if not manifest.is_done(f"{domain}:{year}")
+        ]
+
+    def search(self, domain: str, year: int) -> Page:
+        # Search for Trump in specific site; one client per query since the date range is instance state
+        google_news = GNews(language='en', country='US', max_results=100) # Max 100 per query
+        google_news.start_date = (year, 1, 1)
+        google_news.end_date = (year, 12, 31)
+        articles = self.gnews.search(google_news, f'Trump site:{domain}')
+        return articles, len(articles)
+
+    def select(self, articles: List[Dict], domain: str) -> List[Dict]:
+        return [
+            self.to_row(art, domain) for art in articles
+            if art.get('title') and not self.is_seen(art.get('url'), art.get('title'))
+        ]
+
+    def to_row(self, art: Dict, domain: str) -> Dict:
+        return {
+            'title': art.get('title'),
+            'description': art.get('description'),
+            'source': domain, # Explicitly set source
+            'date': art.get('published date') or '',
+            'url': art.get('url')
+        }
@@ -17,26 +17,87 @@ NEWS_API_KEY = os.getenv('NEWS_API_KEY')
 THENEWSAPI_KEY = os.getenv('THENEWSAPI_KEY')
 
 # NewsAPI Configuration
-NEWS_API_BASE_URL = 'https://newsapi.org/v2/everything'
+# Base URLs can point at a stand-in server (scripts/mock_news_server.py) for load tests
+NEWS_API_BASE_URL = os.getenv('NEWS_API_BASE_URL', 'https://newsapi.org/v2/everything')
 SEARCH_QUERY = 'Donald Trump'
 START_DATE = '2015-01-01'
 END_DATE = '2025-12-31'
 
+# HTTP / rate limiting
+HTTP_TIMEOUT = 30  # seconds per request
+HTTP_RETRIES = 3  # retries on 429/5xx responses
+MAX_RETRY_AFTER = 60  # cap on a server's Retry-After, in seconds
+NEWS_API_REQUESTS_PER_SECOND = float(os.getenv('NEWS_API_REQUESTS_PER_SECOND', 1))
+NEWS_API_BURST = 5  # token-bucket capacity
+NEWS_API_MAX_CONCURRENCY = 8  # pooled connections for async collection
+THENEWSAPI_REQUESTS_PER_SECOND = 2
+
+# Pagination: pages beyond the first are fetched concurrently, up to these caps
+NEWS_API_MAX_PAGES = 5
+THENEWSAPI_MAX_PAGES = 5
+PAGE_FETCH_WORKERS = 4
+
+# Adaptive window planning: merge adjacent windows while their total fits this share of the cap
+WINDOW_MERGE_FILL = 0.8
+GNEWS_REQUESTS_PER_SECOND = 1
+
 # TheNewsAPI Configuration
-THENEWSAPI_BASE_URL = 'https://api.thenewsapi.com/v1/news/all'
+THENEWSAPI_BASE_URL = os.getenv('THENEWSAPI_BASE_URL', 'https://api.thenewsapi.com/v1/news/all')
 THENEWSAPI_COUNTRIES = 'us,ca'
 
 # GNews Configuration
-GNEWS_YEARS = range(2015, 2021)
-GNEWS_ARTICLES_PER_YEAR = 60
-
-# Sources by political leaning (for NewsAPI)
-SOURCES = {
-    'left': ['the-new-york-times', 'cnn', 'the-washington-post', 'msnbc'],
-    'right': ['fox-news', 'breitbart-news'],
-    'center': ['reuters', 'associated-press', 'usa-today'],
-    'canadian': ['cbc-news']
+GNEWS_YEARS = range(2015, 2026)
+GNEWS_ARTICLES_PER_YEAR = 60  # spread evenly over the 12 monthly queries
+GNEWS_MAX_WORKERS = 6
+GNEWS_CACHE_URL = 'gnews://search'  # cache namespace for GNews library queries
+GNEWS_BASE_URL = os.getenv('GNEWS_BASE_URL')  # overrides the library's https://news.google.com/rss
+
+# Daily request budgets per provider (0 = no daily cap). Collectors on the same API share one
+# budget; cache hits are free. Usage is persisted in QUOTA_USAGE_FILE and resets at UTC midnight.
+NEWS_API_DAILY_QUOTA = int(os.getenv('NEWS_API_DAILY_QUOTA', 100))
+THENEWSAPI_DAILY_QUOTA = int(os.getenv('THENEWSAPI_DAILY_QUOTA', 100))
+GNEWS_DAILY_QUOTA = 0
+PROVIDER_QUOTAS = {
+    'newsapi': (NEWS_API_REQUESTS_PER_SECOND, NEWS_API_DAILY_QUOTA),
+    'thenewsapi': (THENEWSAPI_REQUESTS_PER_SECOND, THENEWSAPI_DAILY_QUOTA),
+    'gnews': (GNEWS_REQUESTS_PER_SECOND, GNEWS_DAILY_QUOTA),
 }
+QUOTA_USAGE_FILE = DATA_DIR / 'quota_usage.json'
+QUOTA_FLUSH_REQUESTS = 10  # write the usage file every N requests...
+QUOTA_FLUSH_SECONDS = 5    # ...or every N seconds, whichever comes first (and at exit)
+
+# Fan-out query scheduling (per-query timeout in seconds, retries with exponential backoff)
+QUERY_MAX_WORKERS = 6
+QUERY_TIMEOUT = 60
+QUERY_RETRIES = 3
+RETRY_BACKOFF = 2.0
+
+# Every news source (domains, display-name aliases, country, leaning) and the source lists each
+# collector queries live in one versioned registry file, loaded by src/sources.py
+SOURCE_REGISTRY_FILE = PROJECT_ROOT / 'src' / 'data' / 'sources.json'
+# The balanced sample classifies sources as of this registry version, so it reproduces exactly
+SAMPLE_SOURCE_VERSION = 1
+# Balanced sample (src/sampling.py): target per leaning. None takes every available article,
+# 'rest' whatever SAMPLE_SIZE leaves after the others. Strata without a target (e.g. year with
+# --strata leaning year) are spread in proportion to what is available.
+SAMPLE_SIZE = 500
+SAMPLE_SEED = 42
+SAMPLE_STRATA = ['leaning']
+SAMPLE_MARGINALS = {'leaning': {'Left': 199, 'Right': 199, 'Center': None, 'Other': 'rest'}}
+
+# Targeted Center/Right supplement (TheNewsAPI, domains in the registry's 'targeted' list).
+# Try multiple time periods to get enough articles. Force the API to look back to ensure we
+# cover the full 2015-2025 timeline, avoiding the default recency bias.
+TARGETED_PERIODS = [
+    ('2023-01-01', '2023-12-31'),
+    ('2024-01-01', '2024-12-31'),
+    ('2022-01-01', '2022-12-31'),
+    ('2021-06-01', '2021-12-31')
+]
+TARGETED_PER_SOURCE = 30
+# Yield-aware ordering of those periods (src/planning.YieldPlanner): new articles per call assumed
+# for a period nobody has tried yet
+YIELD_PRIOR_NEW = 3
 
 # Output Files
 RAW_DIR = DATA_DIR / 'raw'
@@ -48,7 +109,46 @@ RAW_DIR.mkdir(exist_ok=True)
 INTERMEDIATE_DIR.mkdir(exist_ok=True)
 FINAL_DIR.mkdir(exist_ok=True)
 
+# Per-window collection checkpoints
+MANIFEST_DIR = RAW_DIR / 'manifests'
+PLAN_DIR = DATA_DIR / 'plans'  # persisted adaptive window plans
+
+# HTTP response cache (shared by all collectors)
+HTTP_CACHE_DIR = DATA_DIR / 'cache' / 'http'
+HTTP_CACHE_TTL = 7 * 24 * 3600  # seconds; ignored in --replay mode
+HTTP_CACHE_MAX_BYTES = 500 * 1024 * 1024
+
+# Google News article id -> publisher URL resolution (ids that cannot be decoded offline)
+URL_CACHE_DIR = DATA_DIR / 'cache' / 'gnews_urls'  # never expires
+SEEN_INDEX_DIR = DATA_DIR / 'seen_index'  # hashes of every URL/title collected so far
+GNEWS_RESOLVE_LIMIT = 500  # new network lookups per run
+GNEWS_RESOLVE_WORKERS = 4
+GNEWS_RESOLVE_REQUESTS_PER_SECOND = 2
+
+# Near-duplicate titles (src/dedup.py): character shingles of the title without its
+# ' - Publisher' suffix, MinHash signatures with LSH banding, then an exact Jaccard check
+DEDUP_JACCARD_THRESHOLD = 0.7
+DEDUP_NUM_PERM = 128
+DEDUP_SHINGLE_SIZE = 5
+NEAR_DUPLICATES_FILE = INTERMEDIATE_DIR / 'near_duplicates.csv'  # rows dropped, with their cluster_id
+# Incremental merge: merged rows as year partitions plus the content-hash index of them
+MERGED_DIR = DATA_DIR / 'merged'
+# Rows per chunk for the out-of-core merge and sampling paths (--chunksize)
+CHUNK_SIZE = 100_000
+# Collected rows whose publish date matched no known format (src/dates.py), with the raw value
+UNPARSED_DATES_FILE = INTERMEDIATE_DIR / 'unparsed_dates.csv'
+# Pipeline runner (scripts/run_pipeline.py): content fingerprints of every stage's last run, and logs
+PIPELINE_DIR = DATA_DIR / 'pipeline'
+PIPELINE_MAX_WORKERS = 2  # stages run at the same time when they do not depend on each other
+# Bootstrap intervals (scripts/bootstrap_analysis.py): replicates per run, interval width, output
+BOOTSTRAP_REPLICATES = 2000
+BOOTSTRAP_CONFIDENCE = 0.95
+BOOTSTRAP_FILE = DATA_DIR / 'bootstrap_intervals.csv'
+
 # File Paths
+# Datasets are stored as typed Parquet next to each name below; EXPORT_CSV also writes the
+# .csv for people and spreadsheets (src/storage.py reads whichever copy is newer)
+EXPORT_CSV = True
 INITIAL_DATASET = RAW_DIR / 'initial_dataset_1928.csv'
 CLEANED_DATASET = INTERMEDIATE_DIR / 'cleaned_dataset_528.csv'
 FINAL_DATASET = FINAL_DIR / 'final_500_dataset.csv'
@@ -57,6 +157,8 @@ FINAL_DATASET = FINAL_DIR / 'final_500_dataset.csv'
 RAW_ARTICLES_FILE = RAW_DIR / 'raw_articles.csv'
 RAW_ARTICLES_THENEWSAPI_FILE = RAW_DIR / 'raw_articles_thenewsapi.csv'
 RAW_ARTICLES_GNEWS_FILE = RAW_DIR / 'raw_articles_gnews.csv'
+SUPPLEMENTAL_ARTICLES_FILE = DATA_DIR / 'supplemental_articles.csv'
+LEFT_ARTICLES_RAW_FILE = DATA_DIR / 'left_articles_raw.csv'
 FINAL_ARTICLES_FILE = INITIAL_DATASET # The "final" output of collection is the input for analysis
 SOURCE_ANALYSIS_FILE = DATA_DIR / 'source_analysis.csv'
 ANALYSIS_RESULTS_DIR = DATA_DIR / 'analysis_results'
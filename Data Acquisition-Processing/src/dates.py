@@ -0,0 +1,96 @@
+import csv
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from . import config
+
+# Publish-date formats the providers and our own files use, as to_datetime formats, with a
+# pattern that recognizes each one. Every row is parsed with the first format it matches.
+FORMATS: Dict[str, Tuple[str, str]] = {
+    # 2024-01-31, 2024-01-31T12:00:00Z, 2024-01-31T12:00:00.000000Z (NewsAPI, TheNewsAPI, our CSVs)
+    'iso': (r'\d{4}-\d{2}-\d{2}', 'ISO8601'),
+    # Wed, 31 Jan 2024 12:00:00 GMT (Google News RSS)
+    'rfc822': (r'[A-Za-z]{3}, \d{1,2} [A-Za-z]{3} \d{4} \d{2}:\d{2}:\d{2} [A-Z]{1,4}$', '%a, %d %b %Y %H:%M:%S %Z'),
+    # Wed, 31 Jan 2024 12:00:00 +0000 (RSS feeds with a numeric offset)
+    'rfc822_offset': (r'[A-Za-z]{3}, \d{1,2} [A-Za-z]{3} \d{4} \d{2}:\d{2}:\d{2} [+-]\d{4}$', '%a, %d %b %Y %H:%M:%S %z'),
+    # 1/31/2024 (CSV files re-saved from a spreadsheet)
+    'us': (r'\d{1,2}/\d{1,2}/\d{4}$', '%m/%d/%Y'),
+}
+# Format each provider sends, tried first for its rows
+SOURCE_FORMATS = {
+    'newsapi': 'iso',
+    'thenewsapi': 'iso',
+    'gnews': 'rfc822',
+}
+DATE_FMT = '%Y-%m-%d'  # how dates are stored in the raw CSVs
+
+
+def detect_formats(values, source: Optional[str] = None) -> pd.Series:
+    """Name of the format each value matches ('' for none), checking `source`'s format first."""
+    text = pd.Series(values, dtype='string').str.strip()
+    first = SOURCE_FORMATS.get(source)
+    names = ([first] if first else []) + [n for n in FORMATS if n != first]
+    detected = pd.Series('', index=text.index, dtype=object)
+    for name in reversed(names):
+        detected[text.str.match(FORMATS[name][0]).fillna(False).to_numpy(dtype=bool)] = name
+    return detected
+
+
+def parse_dates(values, source: Optional[str] = None) -> Tuple[pd.Series, pd.Series]:
+    """Parse mixed-format date strings; returns (dates, unparsed).
+
+    Rows are grouped by the format they match and each group is parsed in one
+    vectorized to_datetime call. Dates with a timezone are converted to UTC, and all
+    come back naive. `unparsed` marks non-empty values that matched no format or
+    did not parse; empty values are just missing.
+    """
+    text = pd.Series(values, dtype='string').str.strip()
+    dates = pd.Series(pd.NaT, index=text.index, dtype='datetime64[us]')
+    formats = detect_formats(text, source)
+    for name in formats[formats != ''].unique():
+        rows = (formats == name).to_numpy()
+        parsed = pd.to_datetime(text[rows], format=FORMATS[name][1], errors='coerce', utc=True)
+        dates[rows] = parsed.dt.tz_localize(None)
+    unparsed = (text.fillna('') != '') & dates.isna()
+    return dates, unparsed
+
+
+def as_datetime(values: pd.Series, label: str = 'date') -> pd.Series:
+    """Loader counterpart of parse_dates: columns read back from Parquet are already datetimes."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    dates, unparsed = parse_dates(values)
+    if unparsed.any():
+        examples = ', '.join(repr(v) for v in values[unparsed.to_numpy()].unique()[:3])
+        print(f"⚠ {int(unparsed.sum())} {label} values could not be parsed (e.g. {examples})")
+    return dates
+
+
+def normalize_rows(rows: List[Dict], source: Optional[str] = None, origin: str = '') -> int:
+    """Rewrite the 'date' of freshly collected rows as YYYY-MM-DD, in place.
+
+    The whole batch is parsed at once. Rows whose date cannot be parsed get an empty
+    date and are logged to UNPARSED_DATES_FILE with the raw value; returns their number.
+    """
+    if not rows:
+        return 0
+    raw = [row.get('date') or '' for row in rows]
+    dates, unparsed = parse_dates(raw, source)
+    for row, day in zip(rows, dates.dt.strftime(DATE_FMT).tolist()):
+        row['date'] = day if isinstance(day, str) else ''
+    bad = unparsed.to_numpy().nonzero()[0]
+    if len(bad):
+        record_unparsed([(origin, rows[i].get('url') or '', rows[i].get('title') or '', raw[i]) for i in bad])
+    return len(bad)
+
+
+def record_unparsed(entries: List[Tuple[str, str, str, str]]):
+    """Append (origin, url, title, raw date) rows to the unparsed-dates log."""
+    path = config.UNPARSED_DATES_FILE
+    new = not path.exists()
+    with open(path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        if new:
+            writer.writerow(['origin', 'url', 'title', 'raw_date'])
+        writer.writerows(entries)
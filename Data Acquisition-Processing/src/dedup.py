@@ -0,0 +1,189 @@
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import config
+
+# Mersenne prime for the universal hash family h(x) = (a*x + b) mod p; 32-bit shingle
+# hashes times a < p stay below 2**63, so the products fit in uint64
+MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+PUBLISHER_SEPARATORS = re.compile(r'\s+(?:-|–|—|\|)\s+')
+MAX_PUBLISHER_WORDS = 6
+
+
+def strip_publisher(title, source=None) -> str:
+    """Drop the trailing ' - Publisher' (or ' | Publisher') that aggregators append to titles."""
+    if not isinstance(title, str):
+        return ''
+    title = title.strip()
+    if isinstance(source, str) and source.strip():
+        suffix = re.search(PUBLISHER_SEPARATORS.pattern + re.escape(source.strip()) + r'$', title)
+        if suffix:
+            return title[:suffix.start()]
+    separators = list(PUBLISHER_SEPARATORS.finditer(title))
+    if separators and len(title[separators[-1].end():].split()) <= MAX_PUBLISHER_WORDS:
+        return title[:separators[-1].start()]
+    return title
+
+
+def normalize_text(text: str) -> str:
+    text = re.sub(r"[‘’']", '', text.lower())
+    return ' '.join(re.sub(r'[^\w\s]', ' ', text).split())
+
+
+def shingles(text: str, size: int) -> set:
+    """Character shingles of a normalized title (the whole title if it is shorter than `size`)."""
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Bands and rows per band whose S-curve threshold (1/b)^(1/r) is closest to `threshold`."""
+    options = [(num_perm // r, r) for r in range(1, num_perm + 1) if num_perm % r == 0]
+    return min(options, key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - threshold))
+
+
+class MinHasher:
+    """MinHash signatures for many shingle sets at once.
+
+    All shingles of all documents are hashed into one flat array and each permutation
+    is applied to it with numpy; the per-document minimum is a `reduceat` over the
+    document boundaries. Work is processed in chunks of documents to bound memory.
+    """
+
+    def __init__(self, num_perm: int = None, seed: int = 1, chunk_shingles: int = 1_000_000):
+        self.num_perm = num_perm or config.DEDUP_NUM_PERM
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, int(MERSENNE_PRIME), self.num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, int(MERSENNE_PRIME), self.num_perm, dtype=np.uint64)
+        self.chunk_shingles = chunk_shingles
+
+    def signatures(self, shingle_sets: List[set]) -> np.ndarray:
+        sigs = np.full((len(shingle_sets), self.num_perm), MERSENNE_PRIME, dtype=np.uint64)
+        start = 0
+        while start < len(shingle_sets):
+            end, total = start, 0
+            while end < len(shingle_sets) and (total == 0 or total + len(shingle_sets[end]) <= self.chunk_shingles):
+                total += len(shingle_sets[end])
+                end += 1
+            self._fill(shingle_sets[start:end], sigs[start:end])
+            start = end
+        return sigs
+
+    def _fill(self, sets: List[set], out: np.ndarray):
+        sizes = np.fromiter((len(s) for s in sets), dtype=np.int64, count=len(sets))
+        present = sizes > 0
+        if not present.any():
+            return
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for shingle_set in sets for s in shingle_set),
+                             dtype=np.uint64, count=int(sizes.sum()))
+        offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))[present]
+        for i in range(self.num_perm):
+            permuted = (self.a[i] * hashes + self.b[i]) % MERSENNE_PRIME
+            out[present, i] = np.minimum.reduceat(permuted, offsets)
+
+
+class UnionFind:
+    def __init__(self, n: int):
+        self.parent = np.arange(n)
+
+    def find(self, i: int) -> int:
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, i: int, j: int):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            # The earlier row becomes the root, so it is the cluster's representative
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+def jaccard(x: set, y: set) -> float:
+    if not x and not y:
+        return 1.0
+    return len(x & y) / len(x | y)
+
+
+def band_keys(signatures: np.ndarray, bands: int, rows: int) -> np.ndarray:
+    """One 64-bit key per (row, band): a multiply-add hash of the band's signature values.
+
+    Equal bands always give equal keys; the rare colliding key only adds a candidate
+    that the exact Jaccard check then rejects.
+    """
+    keys = np.zeros((len(signatures), bands), dtype=np.uint64)
+    multipliers = np.random.default_rng(0).integers(1, 2 ** 63, rows, dtype=np.uint64) | np.uint64(1)
+    with np.errstate(over='ignore'):
+        for band in range(bands):
+            block = signatures[:, band * rows:(band + 1) * rows]
+            keys[:, band] = (block * multipliers).sum(axis=1, dtype=np.uint64)
+    return keys
+
+
+def prepare(titles: pd.Series, sources: Optional[pd.Series] = None, shingle_size: int = None) -> Tuple[List[str], List[set]]:
+    """Publisher-stripped, normalized titles and their shingle sets."""
+    shingle_size = shingle_size or config.DEDUP_SHINGLE_SIZE
+    source_values = sources.tolist() if sources is not None else [None] * len(titles)
+    texts = [normalize_text(strip_publisher(t, s)) for t, s in zip(titles.tolist(), source_values)]
+    return texts, [shingles(t, shingle_size) for t in texts]
+
+
+def lsh_keys(sets: List[set], threshold: float = None, num_perm: int = None) -> np.ndarray:
+    """LSH band keys of each shingle set, banded for `threshold` (default from config)."""
+    threshold = config.DEDUP_JACCARD_THRESHOLD if threshold is None else threshold
+    hasher = MinHasher(num_perm)
+    bands, rows = lsh_params(threshold, hasher.num_perm)
+    return band_keys(hasher.signatures(sets), bands, rows)
+
+
+def candidate_pairs(keys: np.ndarray) -> set:
+    """Pairs of rows that share the key of at least one band."""
+    pairs = set()
+    for band in range(keys.shape[1]):
+        order = np.argsort(keys[:, band], kind='stable')
+        sorted_keys = keys[order, band]
+        boundaries = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+        for bucket in np.split(order, boundaries):
+            if len(bucket) > 1:
+                # Link each member to the bucket's first row; union-find closes the rest
+                first = int(bucket.min())
+                pairs.update((first, int(j)) for j in bucket if j != first)
+    return pairs
+
+
+def near_duplicate_clusters(titles: pd.Series, sources: Optional[pd.Series] = None,
+                            threshold: float = None, num_perm: int = None,
+                            shingle_size: int = None) -> np.ndarray:
+    """Cluster id for every title; near-duplicates (Jaccard >= threshold) share one.
+
+    Titles are stripped of their publisher suffix and normalized, shingled, and
+    MinHashed; LSH banding proposes candidate pairs in roughly linear time, and each
+    candidate is confirmed on the exact shingle Jaccard before it is merged. The
+    cluster id is the position of the cluster's first row, so keeping rows where
+    `cluster_id == position` keeps the first occurrence of every cluster.
+    """
+    threshold = config.DEDUP_JACCARD_THRESHOLD if threshold is None else threshold
+    _, sets = prepare(titles, sources, shingle_size)
+
+    uf = UnionFind(len(sets))
+    for i, j in candidate_pairs(lsh_keys(sets, threshold, num_perm)):
+        if sets[i] and jaccard(sets[i], sets[j]) >= threshold:
+            uf.union(i, j)
+    return np.fromiter((uf.find(i) for i in range(len(sets))), dtype=np.int64, count=len(sets))
+
+
+def cluster_summary(df: pd.DataFrame, cluster_ids: np.ndarray) -> Dict[str, int]:
+    sizes = pd.Series(cluster_ids).value_counts()
+    return {
+        'rows': len(df),
+        'clusters': len(sizes),
+        'multi_row_clusters': int((sizes > 1).sum()),
+        'largest_cluster': int(sizes.max()) if len(sizes) else 0,
+    }
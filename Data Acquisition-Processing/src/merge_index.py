@@ -0,0 +1,234 @@
+import json
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import config
+from .dates import as_datetime
+from .dedup import UnionFind, candidate_pairs, jaccard, lsh_keys, lsh_params, prepare, shingles
+from .seen_index import key_hash
+from .storage import DatasetWriter, apply_schema, csv_path, partition_key, partition_path, update_partition
+from .urls import canonicalize_urls
+
+
+def _hashes(values) -> np.ndarray:
+    return np.fromiter((key_hash(v) if v else 0 for v in values), dtype=np.uint64, count=len(values))
+
+
+def title_hashes(titles: pd.Series) -> np.ndarray:
+    # Exact title, as drop_duplicates(subset=['title']) compares it; missing titles share one key
+    return np.fromiter((key_hash(t if isinstance(t, str) else '\0') for t in titles.tolist()),
+                       dtype=np.uint64, count=len(titles))
+
+
+class MergeIndex:
+    """Content-hash index of the merged dataset, kept next to its year partitions.
+
+    Every merged row is represented by hashes of its title and canonical URL, its
+    publisher-stripped title text and its LSH band keys, so a new raw batch is
+    deduplicated against everything merged so far without loading the articles. New
+    rows go into the year partitions they belong to and into a new index part; raw
+    files are tracked by how many of their rows have been merged already.
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = Path(directory or config.MERGED_DIR)
+        self.index_dir = self.directory / 'index'
+        self.state_path = self.directory / 'state.json'
+        self.state = self._load_state()
+        self.index = self._load_index()
+
+    # --- persistence ------------------------------------------------------------------
+
+    def _lsh_settings(self) -> Dict:
+        bands, rows = lsh_params(config.DEDUP_JACCARD_THRESHOLD, config.DEDUP_NUM_PERM)
+        return {'threshold': config.DEDUP_JACCARD_THRESHOLD, 'num_perm': config.DEDUP_NUM_PERM,
+                'shingle_size': config.DEDUP_SHINGLE_SIZE, 'bands': bands, 'rows': rows}
+
+    def _load_state(self) -> Dict:
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'sources': {}, 'next_id': 0, 'parts': 0, 'lsh': self._lsh_settings()}
+
+    def _load_index(self) -> pd.DataFrame:
+        parts = sorted(self.index_dir.glob('part-*.parquet'))
+        if not parts:
+            return pd.DataFrame({'title_hash': np.empty(0, np.uint64), 'url_hash': np.empty(0, np.uint64),
+                                 'cluster_id': np.empty(0, np.int64), 'text': pd.Series([], dtype='string')})
+        index = pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True)
+        if self.state.get('lsh') != self._lsh_settings():
+            # Dedup settings changed since the keys were computed; the stored text is enough to redo them
+            print("Merge index: LSH settings changed, recomputing band keys...")
+            keys = lsh_keys([shingles(t, config.DEDUP_SHINGLE_SIZE) for t in index['text']])
+            index = index[['title_hash', 'url_hash', 'cluster_id', 'text']].join(self._band_frame(keys))
+            self.state['lsh'] = self._lsh_settings()
+        return index
+
+    @staticmethod
+    def _band_frame(keys: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame({f'band_{b}': keys[:, b] for b in range(keys.shape[1])})
+
+    @property
+    def keys(self) -> np.ndarray:
+        columns = [c for c in self.index.columns if c.startswith('band_')]
+        return self.index[columns].to_numpy(dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def exists(self) -> bool:
+        return self.state_path.exists()
+
+    def save(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+
+    def reset(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.state = {'sources': {}, 'next_id': 0, 'parts': 0, 'lsh': self._lsh_settings()}
+        self.index = self._load_index()
+
+    # --- raw batches ------------------------------------------------------------------
+
+    def new_rows(self, path) -> pd.DataFrame:
+        """Rows of a raw collector CSV that have not been merged yet.
+
+        Collectors only append, so the unmerged rows are the tail of the file. A file
+        that got smaller was rewritten (e.g. a --fresh collection) and is read in full;
+        rows already merged are then dropped by the index.
+        """
+        path = csv_path(path)
+        if not path.exists():
+            return pd.DataFrame()
+        seen = self.state['sources'].get(str(path), {'rows': 0, 'bytes': 0})
+        size = path.stat().st_size
+        skip = seen['rows'] if size >= seen['bytes'] else 0
+        df = pd.read_csv(path, skiprows=range(1, skip + 1), low_memory=False)
+        self.state['sources'][str(path)] = {'rows': skip + len(df), 'bytes': size}
+        return df
+
+    def mark_merged(self, path):
+        """Record a raw file as fully merged (after a full rebuild)."""
+        path = csv_path(path)
+        if path.exists():
+            rows = sum(len(chunk) for chunk in pd.read_csv(path, usecols=[0], chunksize=100_000))
+            self.state['sources'][str(path)] = {'rows': rows, 'bytes': path.stat().st_size}
+
+    # --- merging ----------------------------------------------------------------------
+
+    def merge(self, batch: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Deduplicate a batch against itself and the index; returns (kept, near_duplicates).
+
+        The same three stages as the full merge run in the same order: exact title,
+        canonical URL, then near-duplicate titles. Rows already merged always win, so
+        a late batch never replaces a row that is in the dataset.
+        """
+        if batch.empty:
+            return batch, batch
+        batch = batch.copy()
+        batch['date'] = as_datetime(batch['date'])
+        batch = batch.sort_values('date', kind='stable').reset_index(drop=True)
+
+        title_hash = title_hashes(batch['title'])
+        keep = ~np.isin(title_hash, self.index['title_hash'].to_numpy()) & ~pd.Series(title_hash).duplicated().to_numpy()
+        batch, title_hash = batch[keep].reset_index(drop=True), title_hash[keep]
+
+        batch['canonical_url'] = canonicalize_urls(batch['url'])
+        url_hash = _hashes(batch['canonical_url'].tolist())
+        has_url = url_hash != 0
+        keep = ~(has_url & (np.isin(url_hash, self.index['url_hash'].to_numpy()) | pd.Series(url_hash).duplicated().to_numpy()))
+        batch, title_hash, url_hash = batch[keep].reset_index(drop=True), title_hash[keep], url_hash[keep]
+
+        texts, sets = prepare(batch['title'], batch.get('source'))
+        keys = lsh_keys(sets)
+        cluster = self._match_index(sets, keys)
+
+        # Near-duplicates inside the batch: the earliest row of each cluster represents it
+        uf = UnionFind(len(sets))
+        for i, j in candidate_pairs(keys):
+            if sets[i] and jaccard(sets[i], sets[j]) >= config.DEDUP_JACCARD_THRESHOLD:
+                uf.union(i, j)
+        roots = np.fromiter((uf.find(i) for i in range(len(sets))), dtype=np.int64, count=len(sets))
+        # A batch cluster that touches a merged row joins that row's cluster, all of it dropped
+        existing = pd.Series(cluster).groupby(roots).transform('max').to_numpy()
+        kept = (existing < 0) & (roots == np.arange(len(sets)))
+
+        new_ids = np.full(len(sets), -1, dtype=np.int64)
+        new_ids[kept] = self.state['next_id'] + np.arange(kept.sum())
+        self.state['next_id'] += int(kept.sum())
+        batch['cluster_id'] = np.where(existing >= 0, existing, pd.Series(new_ids).groupby(roots).transform('max').to_numpy())
+
+        self._append_index(title_hash[kept], url_hash[kept], new_ids[kept],
+                           [t for t, k in zip(texts, kept) if k], keys[kept])
+        return batch[kept].reset_index(drop=True), batch[~kept].reset_index(drop=True)
+
+    def _match_index(self, sets, keys: np.ndarray) -> np.ndarray:
+        """Cluster id of a merged row each new row near-duplicates, or -1."""
+        cluster = np.full(len(sets), -1, dtype=np.int64)
+        if not len(self.index) or not len(sets):
+            return cluster
+        stored = self.keys
+        texts = self.index['text'].tolist()
+        cluster_ids = self.index['cluster_id'].to_numpy()
+        for band in range(keys.shape[1]):
+            order = np.argsort(stored[:, band], kind='stable')
+            sorted_keys = stored[order, band]
+            lo = np.searchsorted(sorted_keys, keys[:, band], side='left')
+            hi = np.searchsorted(sorted_keys, keys[:, band], side='right')
+            for i in np.flatnonzero((hi > lo) & (cluster < 0)):
+                for j in order[lo[i]:hi[i]]:
+                    if sets[i] and jaccard(sets[i], shingles(texts[j], config.DEDUP_SHINGLE_SIZE)) >= config.DEDUP_JACCARD_THRESHOLD:
+                        cluster[i] = cluster_ids[j]
+                        break
+        return cluster
+
+    def _append_index(self, title_hash, url_hash, cluster_ids, texts, keys):
+        if not len(title_hash):
+            return
+        part = pd.DataFrame({'title_hash': title_hash, 'url_hash': url_hash, 'cluster_id': cluster_ids,
+                             'text': pd.Series(texts, dtype='string')}).join(self._band_frame(keys))
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        part.to_parquet(self.index_dir / f"part-{self.state['parts']:05d}.parquet", index=False)
+        self.state['parts'] += 1
+        self.index = pd.concat([self.index, part], ignore_index=True) if len(self.index) else part
+
+    def add_partitions(self, rows: pd.DataFrame) -> Dict[str, int]:
+        """Write merged rows into their year partitions; returns rows added per partition."""
+        rows = apply_schema(rows.copy())
+        added = {}
+        for key, group in rows.groupby(partition_key(rows['date']), sort=True):
+            update_partition(self.directory, key, group)
+            added[key] = len(group)
+        return added
+
+    def rebuild(self, chunks: Iterable[pd.DataFrame]):
+        """Replace the index and partitions with a fully merged dataset (cluster_id set).
+
+        `chunks` are date-sorted pieces of it (or the whole frame in a list); each
+        year partition is streamed through its own writer.
+        """
+        self.reset()
+        self.directory.mkdir(parents=True)
+        writers: Dict[str, DatasetWriter] = {}
+        try:
+            for merged in chunks:
+                merged = apply_schema(merged.reset_index(drop=True))
+                texts, sets = prepare(merged['title'], merged.get('source'))
+                self._append_index(title_hashes(merged['title']), _hashes(merged['canonical_url'].tolist()),
+                                   merged['cluster_id'].to_numpy(dtype=np.int64), texts, lsh_keys(sets))
+                if len(merged):
+                    self.state['next_id'] = max(self.state['next_id'], int(merged['cluster_id'].max()) + 1)
+                for key, group in merged.groupby(partition_key(merged['date']), sort=True):
+                    if key not in writers:
+                        writers[key] = DatasetWriter(partition_path(self.directory, key), export_csv=False)
+                    writers[key].write(group)
+        finally:
+            for writer in writers.values():
+                writer.close()
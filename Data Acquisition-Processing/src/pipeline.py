@@ -0,0 +1,290 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from . import config
+from .storage import parquet_path
+
+SCRIPTS_DIR = config.PROJECT_ROOT / 'scripts'
+SRC_DIR = config.PROJECT_ROOT / 'src'
+
+
+class Stage(NamedTuple):
+    """One pipeline step: a script from scripts/ run with fixed arguments.
+
+    `inputs` and `outputs` are the files (or directories) it reads and writes, and a
+    stage depends on every stage that writes one of its inputs. `code` lists the src/
+    modules and data files whose edits should rerun it; the script and config.py always
+    count. `manual` stages (collection and annotation, which spend API quota) only run
+    when named.
+    """
+    name: str
+    command: List[str]
+    inputs: List[Path]
+    outputs: List[Path]
+    code: List[str] = []
+    manual: bool = False
+
+
+def default_stages() -> List[Stage]:
+    """collect -> merge -> annotate -> analyze, with the balanced sample beside annotation."""
+    coded = config.DATA_DIR / 'coded_articles.csv'
+    return [
+        Stage('collect', ['collect_data.py'], [],
+              [config.RAW_ARTICLES_FILE, config.RAW_ARTICLES_THENEWSAPI_FILE, config.RAW_ARTICLES_GNEWS_FILE],
+              ['collection.py', 'dates.py', 'planning.py', 'scheduling.py'], manual=True),
+        Stage('merge', ['process_data.py'],
+              [config.RAW_ARTICLES_THENEWSAPI_FILE, config.RAW_ARTICLES_GNEWS_FILE],
+              [config.FINAL_ARTICLES_FILE, config.NEAR_DUPLICATES_FILE],
+              ['processing.py', 'dedup.py', 'urls.py', 'merge_index.py', 'chunked.py', 'storage.py', 'dates.py']),
+        Stage('annotate', ['annotate_data.py'], [config.FINAL_ARTICLES_FILE], [coded],
+              ['annotation.py', 'storage.py', 'dates.py'], manual=True),
+        Stage('sample', ['generate_balanced_sample.py'], [config.INITIAL_DATASET], [config.FINAL_DATASET],
+              ['sampling.py', 'sources.py', 'data/sources.json', 'chunked.py', 'storage.py', 'dates.py']),
+        Stage('analyze', ['analyze_data.py', '--all'], [coded],
+              [config.SOURCE_ANALYSIS_FILE, config.DATA_DIR / 'topic_keywords.csv', config.ANALYSIS_RESULTS_DIR],
+              ['analysis.py', 'sources.py', 'data/sources.json', 'storage.py', 'dates.py']),
+    ]
+
+
+def _relative(path: Path) -> str:
+    try:
+        return str(Path(path).resolve().relative_to(config.PROJECT_ROOT))
+    except ValueError:
+        return str(Path(path).resolve())
+
+
+class FileHashes:
+    """sha256 of files, remembered by (size, mtime) so unchanged files are not read again."""
+
+    def __init__(self, known: Dict[str, List]):
+        self.known = known  # relative path -> [size, mtime_ns, digest]
+
+    def file(self, path: Path) -> str:
+        stat = path.stat()
+        key = _relative(path)
+        cached = self.known.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        self.known[key] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def paths(self, paths: Iterable[Path]) -> Dict[str, Optional[str]]:
+        """Digest of every file behind `paths`; None for a path that does not exist.
+
+        A directory stands for all files under it, and a dataset name also covers the
+        Parquet copy stored next to it.
+        """
+        digests = {}
+        for path in map(Path, paths):
+            if path.is_dir():
+                files = sorted(p for p in path.rglob('*') if p.is_file())
+            else:
+                files = [p for p in dict.fromkeys([path, parquet_path(path)]) if p.exists()]
+            if not files:
+                digests[_relative(path)] = None
+            for f in files:
+                digests[_relative(f)] = self.file(f)
+        return digests
+
+
+def _exists(path: Path) -> bool:
+    path = Path(path)
+    return path.exists() or parquet_path(path).exists()
+
+
+def _digest(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _execute(command: List[str], log_path: Path) -> Tuple[int, float]:
+    """Run one stage's script with its output going to the stage log."""
+    start = time.perf_counter()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        result = subprocess.run(command, cwd=config.PROJECT_ROOT, stdout=log, stderr=subprocess.STDOUT,
+                                env={**os.environ, 'PYTHONUNBUFFERED': '1'})
+    return result.returncode, time.perf_counter() - start
+
+
+class Pipeline:
+    """Runs the stages in dependency order, skipping those whose inputs did not change.
+
+    A stage is up to date when the fingerprint of its inputs, command and code and
+    the fingerprint of its outputs both match its last successful run (so an output
+    edited or deleted by hand is rebuilt too). Stages whose dependencies are done run
+    at the same time, up to `workers`. Fingerprints, timings and per-stage logs are
+    kept in PIPELINE_DIR.
+    """
+
+    def __init__(self, stages: Optional[List[Stage]] = None, directory: Optional[Path] = None,
+                 workers: Optional[int] = None):
+        self.stages = {stage.name: stage for stage in (stages or default_stages())}
+        self.directory = Path(directory or config.PIPELINE_DIR)
+        self.state_path = self.directory / 'state.json'
+        self.log_dir = self.directory / 'logs'
+        self.workers = workers or config.PIPELINE_MAX_WORKERS
+        self.state = self._load_state()
+        self.hashes = FileHashes(self.state['files'])
+
+    def _load_state(self) -> Dict:
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'stages': {}, 'files': {}}
+
+    def save(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp, self.state_path)
+
+    # --- graph ------------------------------------------------------------------------
+
+    def dependencies(self, name: str) -> List[str]:
+        inputs = {_relative(p) for p in self.stages[name].inputs}
+        return [other.name for other in self.stages.values()
+                if other.name != name and inputs & {_relative(p) for p in other.outputs}]
+
+    def select(self, names: Optional[Iterable[str]] = None) -> List[str]:
+        """Stages to consider, in declaration order: the named ones, or all but manual ones."""
+        if names:
+            unknown = set(names) - set(self.stages)
+            if unknown:
+                raise ValueError(f"Unknown stage(s): {', '.join(sorted(unknown))} (have {', '.join(self.stages)})")
+            return [n for n in self.stages if n in set(names)]
+        return [n for n, stage in self.stages.items() if not stage.manual]
+
+    # --- fingerprints -----------------------------------------------------------------
+
+    def input_fingerprint(self, stage: Stage) -> str:
+        code = [SCRIPTS_DIR / stage.command[0], SRC_DIR / 'config.py'] + [SRC_DIR / m for m in stage.code]
+        return _digest({'command': stage.command, 'inputs': self.hashes.paths(stage.inputs),
+                        'code': self.hashes.paths(code)})
+
+    def output_fingerprint(self, stage: Stage) -> Optional[str]:
+        outputs = self.hashes.paths(stage.outputs)
+        return None if None in outputs.values() else _digest(outputs)
+
+    def check(self, name: str, force: bool = False) -> Tuple[str, str]:
+        """('run' | 'skip' | 'fail', reason) for a stage whose dependencies are done."""
+        stage = self.stages[name]
+        missing = [_relative(p) for p in stage.inputs if not _exists(p)]
+        outputs = self.output_fingerprint(stage)
+        if missing:
+            if any(_exists(p) for p in stage.outputs):
+                return 'skip', f"inputs missing ({', '.join(missing)}), keeping existing outputs"
+            return 'fail', f"inputs missing: {', '.join(missing)}"
+        if force:
+            return 'run', 'forced'
+        last = self.state['stages'].get(name)
+        if not last:
+            return 'run', 'never run'
+        if outputs is None:
+            return 'run', 'outputs missing'
+        if last.get('inputs') != self.input_fingerprint(stage):
+            return 'run', 'inputs or code changed'
+        if last.get('outputs') != outputs:
+            return 'run', 'outputs changed since the last run'
+        return 'skip', 'up to date'
+
+    # --- running ----------------------------------------------------------------------
+
+    def run(self, names: Optional[Iterable[str]] = None, force: Iterable[str] = (),
+            dry_run: bool = False) -> Dict[str, Dict]:
+        """Run the selected stages; returns {stage: {'status', 'reason', 'seconds'}}."""
+        force = set(force)
+        selected = self.select(names)
+        selected = [n for n in self.stages if n in selected or n in force]  # forcing a stage selects it
+        deps = {name: [d for d in self.dependencies(name) if d in selected] for name in selected}
+        results: Dict[str, Dict] = {}
+        running = {}
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while len(results) < len(selected):
+                for name in selected:
+                    if name in results or name in (n for n, _ in running.values()):
+                        continue
+                    statuses = [results.get(d, {}).get('status') for d in deps[name]]
+                    if any(s in ('failed', 'blocked') for s in statuses):
+                        results[name] = {'status': 'blocked', 'reason': 'a dependency failed', 'seconds': 0.0}
+                        continue
+                    if any(s is None for s in statuses):
+                        continue
+                    # In a dry run, stages after one that would run are assumed to see new inputs
+                    if dry_run and 'would run' in statuses:
+                        action, reason = 'run', 'an upstream stage would run'
+                    else:
+                        action, reason = self.check(name, force=name in force)
+                    if action == 'skip':
+                        results[name] = {'status': 'skipped', 'reason': reason, 'seconds': 0.0}
+                        print(f"- {name}: skipped ({reason})")
+                    elif action == 'fail':
+                        results[name] = {'status': 'failed', 'reason': reason, 'seconds': 0.0}
+                        print(f"✗ {name}: {reason}")
+                    elif dry_run:
+                        results[name] = {'status': 'would run', 'reason': reason, 'seconds': 0.0}
+                        print(f"▶ {name}: would run ({reason})")
+                    else:
+                        stage = self.stages[name]
+                        fingerprint = self.input_fingerprint(stage)
+                        command = [sys.executable, str(SCRIPTS_DIR / stage.command[0])] + stage.command[1:]
+                        print(f"▶ {name}: running ({reason}), log in {_relative(self.log_dir / f'{name}.log')}")
+                        running[pool.submit(_execute, command, self.log_dir / f"{name}.log")] = (name, fingerprint)
+                if running:
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name, fingerprint = running.pop(future)
+                        self._finish(name, fingerprint, *future.result(), results)
+                elif len(results) < len(selected):
+                    raise RuntimeError("Pipeline stages depend on each other in a cycle")
+
+        self.save()
+        self._report(selected, results, time.perf_counter() - start)
+        return results
+
+    def _finish(self, name: str, fingerprint: str, returncode: int, seconds: float, results: Dict[str, Dict]):
+        stage = self.stages[name]
+        outputs = self.output_fingerprint(stage)
+        if returncode == 0 and outputs is not None:
+            self.state['stages'][name] = {
+                'inputs': fingerprint,
+                'outputs': outputs,
+                'seconds': round(seconds, 2),
+                'finished_at': datetime.now().isoformat(timespec='seconds'),
+            }
+            self.save()
+            results[name] = {'status': 'ran', 'reason': '', 'seconds': seconds}
+            print(f"✓ {name}: done in {seconds:.1f}s")
+            return
+        reason = f"exit code {returncode}" if returncode else "finished without writing all of its outputs"
+        results[name] = {'status': 'failed', 'reason': reason, 'seconds': seconds}
+        print(f"✗ {name}: {reason} after {seconds:.1f}s; last lines of {_relative(self.log_dir / f'{name}.log')}:")
+        with open(self.log_dir / f"{name}.log", encoding='utf-8', errors='replace') as f:
+            for line in f.readlines()[-10:]:
+                print(f"    {line.rstrip()}")
+
+    def _report(self, selected: List[str], results: Dict[str, Dict], wall: float):
+        print("\n" + "=" * 60)
+        print(f"{'stage':12s} {'status':10s} {'seconds':>8s}  reason")
+        print("-" * 60)
+        for name in selected:
+            r = results[name]
+            print(f"{name:12s} {r['status']:10s} {r['seconds']:8.1f}  {r['reason']}")
+        busy = sum(r['seconds'] for r in results.values())
+        print("-" * 60)
+        print(f"Wall time {wall:.1f}s for {busy:.1f}s of stage time")
@@ -0,0 +1,272 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from . import config
+
+DATE_FMT = '%Y-%m-%d'
+
+
+def _parse(day: str) -> datetime:
+    return datetime.strptime(day, DATE_FMT)
+
+
+def split_window(from_date: str, to_date: str) -> List[Tuple[str, str]]:
+    """Split an inclusive [from, to] day range into two non-overlapping halves."""
+    start, end = _parse(from_date), _parse(to_date)
+    mid = start + timedelta(days=(end - start).days // 2)
+    return [
+        (from_date, mid.strftime(DATE_FMT)),
+        ((mid + timedelta(days=1)).strftime(DATE_FMT), to_date),
+    ]
+
+
+class WindowPlanner:
+    """Adaptive date-window plan for a search API that caps results per query.
+
+    Windows without a known total are probed once (the probe is the window's first
+    page, so with the response cache it costs nothing extra) and those over `cap` are
+    halved recursively down to single days. Windows the saved plan already sized, and
+    windows the collector's manifest marks done, are not probed again. Probes are real
+    requests against the provider's daily quota, so probing stops when `quota` has
+    nothing left; unprobed windows keep an unknown total and are probed on a later run.
+    Adjacent sparse windows that are still pending are then merged. The merged plan is
+    both saved and returned, so the windows collected (and checkpointed) this run are
+    the windows the next run plans. The plan records the default windows it was built
+    from; when they change (a new START_DATE/END_DATE), saved windows outside the new
+    range are dropped and the uncovered days are planned from the new defaults.
+    """
+
+    def __init__(self, name: str, cap: int, count_fn: Callable[[str, str], Optional[int]],
+                 min_days: int = 1, fill_ratio: float = None, quota=None,
+                 is_done: Optional[Callable[[Tuple[str, str]], bool]] = None):
+        config.PLAN_DIR.mkdir(parents=True, exist_ok=True)
+        self.path = config.PLAN_DIR / f"{name}.json"
+        self.cap = cap
+        self.count_fn = count_fn
+        self.min_days = min_days
+        self.fill_ratio = config.WINDOW_MERGE_FILL if fill_ratio is None else fill_ratio
+        self.quota = quota
+        self.is_done = is_done or (lambda window: False)
+        self.probes = 0
+
+    def load(self) -> Tuple[List[Dict], List[Tuple[str, str]]]:
+        """(saved windows, the default windows they were planned from)."""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                saved = json.load(f)
+            windows = [{'from': w['from'], 'to': w['to'], 'total': w.get('total')} for w in saved['windows']]
+            return windows, [tuple(w) for w in saved.get('defaults', [])]
+        except (OSError, ValueError, KeyError):
+            return [], []
+
+    def save(self, plan: List[Dict], default_windows: List[Tuple[str, str]]):
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'cap': self.cap, 'updated_at': datetime.now().isoformat(timespec='seconds'),
+                       'defaults': [list(w) for w in default_windows], 'windows': plan}, f, indent=2)
+        os.replace(tmp, self.path)
+
+    @staticmethod
+    def reconcile(saved: List[Dict], default_windows: List[Tuple[str, str]]) -> List[Dict]:
+        """Fit a saved plan to new default windows: keep the saved windows that lie inside
+        the new range, and cover the remaining days with the defaults (clipped to the gaps)."""
+        start, end = min(f for f, _ in default_windows), max(t for _, t in default_windows)
+        kept = sorted((w for w in saved if start <= w['from'] and w['to'] <= end), key=lambda w: w['from'])
+        gaps, day = [], _parse(start)
+        for w in kept:
+            if _parse(w['from']) > day:
+                gaps.append((day, _parse(w['from']) - timedelta(days=1)))
+            day = max(day, _parse(w['to']) + timedelta(days=1))
+        if day <= _parse(end):
+            gaps.append((day, _parse(end)))
+        added = [{'from': max(_parse(f), g0).strftime(DATE_FMT), 'to': min(_parse(t), g1).strftime(DATE_FMT),
+                  'total': None}
+                 for f, t in default_windows for g0, g1 in gaps
+                 if max(_parse(f), g0) <= min(_parse(t), g1)]
+        return sorted([dict(w) for w in kept] + added, key=lambda w: (w['from'], w['to']))
+
+    def _probe(self, window: Tuple[str, str]) -> Optional[int]:
+        self.probes += 1
+        try:
+            return self.count_fn(*window)
+        except Exception as e:
+            print(f"  ⚠ Probe {window[0]} to {window[1]} failed: {e}")
+            return None
+
+    def _budget(self) -> Optional[int]:
+        """Probes the provider's daily quota still allows (None: no cap)."""
+        return self.quota.remaining() if self.quota is not None else None
+
+    def _needs_probe(self, window: Dict) -> bool:
+        return window['total'] is None and not self.is_done((window['from'], window['to']))
+
+    def _oversized(self, window: Dict) -> bool:
+        days = (_parse(window['to']) - _parse(window['from'])).days + 1
+        return window['total'] is not None and window['total'] > self.cap and days > self.min_days \
+            and not self.is_done((window['from'], window['to']))
+
+    def refine(self, windows: List[Dict]) -> List[Dict]:
+        """Probe unsized windows level by level, splitting any that saturate the cap."""
+        plan = []
+        pending = [dict(w) for w in windows]
+        with ThreadPoolExecutor(max_workers=config.PAGE_FETCH_WORKERS) as pool:
+            while pending:
+                to_probe = [w for w in pending if self._needs_probe(w)]
+                budget = self._budget()
+                if budget is not None and budget < len(to_probe):
+                    print(f"  ⚠ Daily quota allows {budget} of {len(to_probe)} probes; "
+                          "the rest are planned unsized and probed on a later run")
+                    to_probe = to_probe[:budget]
+                totals = pool.map(self._probe, [(w['from'], w['to']) for w in to_probe])
+                for window, total in zip(to_probe, totals):
+                    window['total'] = total
+                next_pending = []
+                for window in pending:
+                    if self._oversized(window):
+                        next_pending.extend({'from': f, 'to': t, 'total': None}
+                                            for f, t in split_window(window['from'], window['to']))
+                    else:
+                        plan.append(window)
+                pending = next_pending
+        return sorted(plan, key=lambda w: (w['from'], w['to']))
+
+    def merge_sparse(self, plan: List[Dict]) -> List[Dict]:
+        """Merge runs of adjacent pending windows whose combined total still fits the cap.
+
+        Finished windows are kept as they are, so their manifest entries still match.
+        """
+        limit = self.cap * self.fill_ratio
+        merged = []
+        for window in plan:
+            prev = merged[-1] if merged else None
+            if (prev is not None and prev['total'] is not None and window['total'] is not None
+                    and not self.is_done((prev['from'], prev['to']))
+                    and not self.is_done((window['from'], window['to']))
+                    and _parse(window['from']) <= _parse(prev['to']) + timedelta(days=1)
+                    and prev['total'] + window['total'] <= limit):
+                prev['to'] = window['to']
+                prev['total'] += window['total']
+            else:
+                merged.append(dict(window))
+        return merged
+
+    def plan(self, default_windows: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        default_windows = [tuple(w) for w in default_windows]
+        saved, saved_defaults = self.load()
+        if not saved:
+            origin = 'default ranges'
+            start = [{'from': f, 'to': t, 'total': None} for f, t in default_windows]
+        elif saved_defaults == default_windows:
+            origin = 'saved plan'
+            start = saved
+        else:
+            # Plans saved before the defaults were recorded are reconciled too
+            origin = 'saved plan fitted to new date range'
+            start = self.reconcile(saved, default_windows)
+        refined = self.refine(start)
+        merged = self.merge_sparse(refined)
+        self.save(merged, default_windows)
+
+        saturated = sum(1 for w in refined if w['total'] is not None and w['total'] > self.cap)
+        print(f"Window plan: {len(merged)} windows from {len(start)} "
+              f"({origin}), {self.probes} probes, "
+              f"{saturated} still over cap at single-day resolution")
+        return [(w['from'], w['to']) for w in merged]
+
+
+class YieldPlanner:
+    """Orders (domain, period) queries by the new articles they produced in earlier runs.
+
+    Every live query's yield (articles returned, and how many of them were kept) is
+    recorded per domain and period, with the last result page read, so the next run
+    continues with the page after it; responses served from the cache are not counted
+    again. The expected yield of a period is its observed mean shrunk towards the
+    period's mean across all domains, so untried periods start from what they gave
+    elsewhere (or YIELD_PRIOR_NEW with no history at all). Periods are pruned once their
+    results run out, not because one page held nothing new.
+    """
+
+    def __init__(self, name: str, prior: float = None):
+        config.PLAN_DIR.mkdir(parents=True, exist_ok=True)
+        self.path = config.PLAN_DIR / f"{name}_yield.json"
+        self.prior = config.YIELD_PRIOR_NEW if prior is None else prior
+        self.history: Dict[str, Dict[str, Dict]] = self.load()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def period_key(period: Tuple[str, str]) -> str:
+        return f"{period[0]}_{period[1]}"
+
+    def load(self) -> Dict:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.history, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def _stats(self, domain: str, period: Tuple[str, str]) -> Dict:
+        return self.history.get(domain, {}).get(self.period_key(period), {})
+
+    def last_page(self, domain: str, period: Tuple[str, str]) -> int:
+        return self._stats(domain, period).get('page', 0)
+
+    def next_page(self, domain: str, period: Tuple[str, str]) -> int:
+        return self.last_page(domain, period) + 1
+
+    def record(self, domain: str, period: Tuple[str, str], page: int, returned: int, new: int,
+               found: int, page_size: int):
+        """Record one live query: the page read, what it returned and how many articles were kept."""
+        with self._lock:
+            stats = self.history.setdefault(domain, {}).setdefault(
+                self.period_key(period), {'calls': 0, 'returned': 0, 'new': 0})
+            stats['calls'] += 1
+            stats['returned'] += returned
+            stats['new'] += new
+            stats['page'] = page
+            stats['found'] = found
+            # A short page, or having read every result the provider reports, ends the query
+            stats['exhausted'] = returned < page_size or found <= page * page_size
+            stats['updated_at'] = datetime.now().isoformat(timespec='seconds')
+            self.save()
+
+    def period_mean(self, period: Tuple[str, str]) -> float:
+        """New articles per call for this period across every domain tried."""
+        key = self.period_key(period)
+        calls = sum(d[key]['calls'] for d in self.history.values() if key in d)
+        new = sum(d[key]['new'] for d in self.history.values() if key in d)
+        return new / calls if calls else self.prior
+
+    def expected(self, domain: str, period: Tuple[str, str]) -> float:
+        stats = self.history.get(domain, {}).get(self.period_key(period))
+        prior = self.period_mean(period)
+        if not stats:
+            return prior
+        return (stats['new'] + prior) / (stats['calls'] + 1)
+
+    def pruned(self, domain: str, period: Tuple[str, str]) -> bool:
+        return self._stats(domain, period).get('exhausted', False)
+
+    def order(self, domain: str, periods: List[Tuple[str, str]], prune: bool = True) -> List[Tuple[str, str]]:
+        """Periods worth querying for `domain`, highest expected yield first (stable on ties)."""
+        keep = [p for p in periods if not (prune and self.pruned(domain, p))]
+        return sorted(keep, key=lambda p: -self.expected(domain, p))
+
+    def estimate(self, domain: str, periods: List[Tuple[str, str]], target: int) -> Tuple[int, float]:
+        """(calls, expected new articles) to reach `target` when querying in planned order."""
+        calls, total = 0, 0.0
+        for period in self.order(domain, periods):
+            if total >= target:
+                break
+            calls += 1
+            total += self.expected(domain, period)
+        return calls, total
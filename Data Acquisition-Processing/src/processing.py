@@ -1,24 +1,41 @@
 import pandas as pd
-import os
 from . import config
+from .urls import canonicalize_urls
+from .dedup import near_duplicate_clusters, cluster_summary
+from .chunked import ChunkedMerger
+from .merge_index import MergeIndex
+from .storage import dataset_exists, iter_dataset, read_dataset, write_dataset
 
 class DataProcessor:
-    def merge_datasets(self):
+    RAW_FILES = [
+        ('TheNewsAPI', config.RAW_ARTICLES_THENEWSAPI_FILE),
+        ('GNews', config.RAW_ARTICLES_GNEWS_FILE),
+    ]
+
+    def merge_datasets(self, chunksize: int = None):
+        """Merge every raw file into FINAL_ARTICLES_FILE.
+
+        With `chunksize`, the out-of-core path (src/chunked.py) produces the same
+        output while holding at most one month of articles in memory.
+        """
         print("=" * 60)
         print("Merging Datasets")
         print("=" * 60)
+
+        if chunksize:
+            return self._merge_chunked(chunksize)
         
         dfs = []
         
-        if os.path.exists(config.RAW_ARTICLES_THENEWSAPI_FILE):
-            df1 = pd.read_csv(config.RAW_ARTICLES_THENEWSAPI_FILE)
+        if dataset_exists(config.RAW_ARTICLES_THENEWSAPI_FILE):
+            df1 = read_dataset(config.RAW_ARTICLES_THENEWSAPI_FILE)
             print(f"Loaded {len(df1)} articles from TheNewsAPI")
             dfs.append(df1)
         else:
             print(f"Warning: {config.RAW_ARTICLES_THENEWSAPI_FILE} not found")
             
-        if os.path.exists(config.RAW_ARTICLES_GNEWS_FILE):
-            df2 = pd.read_csv(config.RAW_ARTICLES_GNEWS_FILE)
+        if dataset_exists(config.RAW_ARTICLES_GNEWS_FILE):
+            df2 = read_dataset(config.RAW_ARTICLES_GNEWS_FILE)
             print(f"Loaded {len(df2)} articles from GNews")
             dfs.append(df2)
         else:
@@ -28,19 +45,104 @@ class DataProcessor:
             print("No data to merge!")
             return
             
+        # Dates were parsed when the raw files were loaded (storage.apply_schema)
         final_df = pd.concat(dfs, ignore_index=True)
-        
-        # Standardize date
-        final_df['date'] = pd.to_datetime(final_df['date'], errors='coerce')
-        final_df = final_df.sort_values('date')
+        final_df = final_df.sort_values('date', kind='stable')
         
         # Deduplicate
         before_dedup = len(final_df)
         final_df = final_df.drop_duplicates(subset=['title'], keep='first')
+        
+        # Same article under different links (tracking params, Google News wrappers);
+        # decoded offline only, see scripts/canonicalize_urls.py for network resolution
+        final_df['canonical_url'] = canonicalize_urls(final_df['url'])
+        has_url = final_df['canonical_url'] != ''
+        final_df = final_df[~(has_url & final_df.duplicated(subset=['canonical_url'], keep='first'))]
+
+        # Syndicated copies and light rewrites of the same story: one row per cluster goes forward
+        final_df = final_df.reset_index(drop=True)
+        final_df['cluster_id'] = near_duplicate_clusters(final_df['title'], final_df.get('source'))
+        summary = cluster_summary(final_df, final_df['cluster_id'].to_numpy())
+        print(f"Near-duplicate titles: {summary['multi_row_clusters']} clusters with more than one row "
+              f"(largest {summary['largest_cluster']}, Jaccard >= {config.DEDUP_JACCARD_THRESHOLD})")
+        representative = final_df['cluster_id'] == final_df.index
+        write_dataset(final_df[~representative], config.NEAR_DUPLICATES_FILE)
+        final_df = final_df[representative]
         deduped = before_dedup - len(final_df)
         
         if deduped > 0:
             print(f"Removed {deduped} duplicates")
             
-        final_df.to_csv(config.FINAL_ARTICLES_FILE, index=False)
-        print(f"\n✓ Saved {len(final_df)} unique articles to {config.FINAL_ARTICLES_FILE}")
+        saved = write_dataset(final_df, config.FINAL_ARTICLES_FILE)
+        print(f"\n✓ Saved {len(final_df)} unique articles to {saved}")
+
+        self._rebuild_index([final_df])
+
+    def _merge_chunked(self, chunksize: int):
+        raw_files = []
+        for label, path in self.RAW_FILES:
+            if dataset_exists(path):
+                raw_files.append((label, path))
+            else:
+                print(f"Warning: {path} not found")
+        if not raw_files:
+            print("No data to merge!")
+            return
+
+        saved, rows = ChunkedMerger(chunksize).run(raw_files, config.FINAL_ARTICLES_FILE, config.NEAR_DUPLICATES_FILE)
+        print(f"\n✓ Saved {rows} unique articles to {saved}")
+        self._rebuild_index(iter_dataset(config.FINAL_ARTICLES_FILE, chunksize))
+
+    def _rebuild_index(self, chunks):
+        # Start the incremental store from this merge
+        index = MergeIndex()
+        index.rebuild(chunks)
+        for _, path in self.RAW_FILES:
+            index.mark_merged(path)
+        index.save()
+        print(f"✓ Merge index rebuilt ({len(index)} rows in {config.MERGED_DIR})")
+
+    def merge_incremental(self):
+        """Merge only raw rows that arrived since the last merge into the year partitions.
+
+        Rows are deduplicated against the content-hash index of everything merged so
+        far, so the cost follows the size of the new batch, not of the archive.
+        """
+        print("=" * 60)
+        print("Merging New Batches")
+        print("=" * 60)
+
+        index = MergeIndex()
+        if not index.exists:
+            print("No merge index yet, running a full merge first")
+            return self.merge_datasets()
+
+        batches = []
+        for label, path in self.RAW_FILES:
+            batch = index.new_rows(path)
+            print(f"{label}: {len(batch)} new rows")
+            if len(batch):
+                batches.append(batch)
+        if not batches:
+            index.save()
+            print("Nothing new to merge")
+            return
+
+        batch = pd.concat(batches, ignore_index=True)
+        kept, near_duplicates = index.merge(batch)
+        added = index.add_partitions(kept)
+        if len(near_duplicates):
+            previous = read_dataset(config.NEAR_DUPLICATES_FILE) if dataset_exists(config.NEAR_DUPLICATES_FILE) else None
+            write_dataset(pd.concat([previous, near_duplicates], ignore_index=True), config.NEAR_DUPLICATES_FILE)
+        index.save()
+
+        print(f"Removed {len(batch) - len(kept)} duplicates ({len(near_duplicates)} near-duplicate titles)")
+        print(f"\n✓ Added {len(kept)} articles to {config.MERGED_DIR} "
+              f"({', '.join(f'{k}: +{n}' for k, n in added.items()) or 'no partitions changed'}); "
+              f"{len(index)} merged in total")
+
+    def export(self):
+        """Write the partitioned merged dataset out as FINAL_ARTICLES_FILE."""
+        merged = read_dataset(config.MERGED_DIR)
+        saved = write_dataset(merged, config.FINAL_ARTICLES_FILE)
+        print(f"✓ Exported {len(merged)} articles to {saved}")
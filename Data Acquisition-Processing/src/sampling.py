@@ -0,0 +1,302 @@
+from typing import Dict, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from . import config
+
+# A marginal target per value: a count, None for every available row, or 'rest' for what is
+# left of the sample size after the other values of that dimension
+Target = Union[int, None, str]
+RAKING_ITERATIONS = 50
+
+
+class Sample(NamedTuple):
+    rows: pd.DataFrame        # the sampled rows, shuffled
+    allocation: pd.DataFrame  # every stratum with its available and target counts
+    report: pd.DataFrame      # requested / available / selected / shortfall per target
+
+    @property
+    def shortfalls(self) -> pd.DataFrame:
+        return self.report[self.report['shortfall'] > 0]
+
+
+def _labels(values: pd.Series) -> pd.Series:
+    # Quotas come from Python or JSON, so 2019, '2019' and 2019.0 name the same year
+    return values.map(lambda v: str(int(v)) if isinstance(v, (float, np.floating)) and float(v).is_integer() else str(v))
+
+
+class StratifiedSampler:
+    """Draws a sample meeting per-stratum quotas over one or more columns (e.g. leaning × year × topic).
+
+    Targets are given either as `quotas`, a count per joint stratum (a DataFrame with the
+    strata columns and 'n', or a dict keyed by value tuples), or as `marginals`, a target
+    per value of some of the columns ({'leaning': {'Left': 199, 'Center': None}}). Values a
+    marginal does not list are not sampled; columns without a marginal are spread in
+    proportion to what is available. Marginals are turned into joint targets by raking
+    (iterative proportional fitting) capped at the available counts, then rounded so the
+    first marginal's totals are exact; the other marginals' rounding drift is repaired by
+    moving single units between strata, so the report only lists quotas that could not be met.
+
+    Rows are drawn in one vectorized pass: every row gets a random key from `seed`, rows are
+    sorted by (stratum, key) and the first `target` rows of each stratum are kept, so the
+    same input and seed always give the same sample. With a `weights` column the keys are
+    Efraimidis-Spirakis (A-Res) keys, so rows are drawn with probability proportional to
+    their weight. Targets that cannot be met are listed in the report rather than raising.
+    """
+
+    def __init__(self, strata: Sequence[str], marginals: Optional[Dict[str, Dict[str, Target]]] = None,
+                 quotas=None, total: Optional[int] = None, seed: int = config.SAMPLE_SEED,
+                 weights: Optional[str] = None):
+        if marginals and quotas is not None:
+            raise ValueError("Give either marginals or joint quotas, not both")
+        self.strata = list(strata)
+        self.marginals = {dim: dict(targets) for dim, targets in (marginals or {}).items()}
+        unknown = set(self.marginals) - set(self.strata)
+        if unknown:
+            raise ValueError(f"Marginals for columns that are not strata: {sorted(unknown)}")
+        self.quotas = self._quota_frame(quotas) if quotas is not None else None
+        self.total = total
+        self.seed = seed
+        self.weights = weights
+
+    def keys(self, rng: np.random.Generator, df: pd.DataFrame) -> np.ndarray:
+        """Sort key per row; the smallest keys of a stratum are drawn. -log(u)/w orders rows
+        like A-Res's u^(1/w), and rows with no (or zero) weight are never drawn."""
+        keys = -np.log(1.0 - rng.random(len(df)))
+        if self.weights:
+            w = df[self.weights].to_numpy(dtype=float)
+            keys = np.divide(keys, w, out=np.full(len(keys), np.inf), where=w > 0)
+        return keys
+
+    def _quota_frame(self, quotas) -> pd.DataFrame:
+        if isinstance(quotas, dict):
+            keys = [k if isinstance(k, tuple) else (k,) for k in quotas]
+            quotas = pd.DataFrame(keys, columns=self.strata).assign(n=list(quotas.values()))
+        missing = set(self.strata + ['n']) - set(quotas.columns)
+        if missing:
+            raise ValueError(f"Joint quotas need the columns {sorted(missing)}")
+        quotas = quotas[self.strata + ['n']].copy()
+        for column in self.strata:
+            quotas[column] = _labels(quotas[column])
+        return quotas
+
+    def cells(self, df: pd.DataFrame):
+        """(stratum id per row, -1 where a stratum column is missing or the row has no positive
+        weight; strata with available counts). Rows that can never be drawn are not available."""
+        drawable = np.ones(len(df), dtype=bool)
+        if self.weights:
+            drawable = df[self.weights].to_numpy(dtype=float) > 0  # NaN compares False
+        grouped = df[drawable].groupby(self.strata, observed=True, sort=True, dropna=True)
+        cell = np.full(len(df), -1, dtype=np.int64)
+        cell[drawable] = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        cells = grouped.size().reset_index(name='available')
+        for column in self.strata:
+            cells[column] = _labels(cells[column])
+        return cell, cells
+
+    def allocate(self, cells: pd.DataFrame):
+        """Integer target per stratum, and the report of requested vs. selected counts."""
+        available = cells['available'].to_numpy(dtype=np.int64)
+        if self.quotas is not None:
+            return self._allocate_joint(cells, available)
+        if self.marginals:
+            return self._allocate_marginals(cells, available)
+        if self.total is None:
+            raise ValueError("Give marginals, joint quotas or a total sample size")
+        weights = np.minimum(available * self.total / max(available.sum(), 1), available)
+        target = self._round(weights, available, np.zeros(len(cells), dtype=np.int64))
+        report = pd.DataFrame({'dimension': ['total'], 'value': ['all'], 'requested': [self.total],
+                               'available': [available.sum()], 'selected': [target.sum()]})
+        return target, self._with_shortfall(report)
+
+    def _allocate_joint(self, cells: pd.DataFrame, available: np.ndarray):
+        merged = cells.merge(self.quotas, on=self.strata, how='left')
+        target = np.minimum(merged['n'].fillna(0).to_numpy(dtype=np.int64), available)
+        # Requested strata with no rows at all are reported too
+        report = self.quotas.merge(cells, on=self.strata, how='left').rename(columns={'n': 'requested'})
+        report['available'] = report['available'].fillna(0).astype(np.int64)
+        report['selected'] = np.minimum(report['requested'], report['available'])
+        return target, self._with_shortfall(report)
+
+    def _allocate_marginals(self, cells: pd.DataFrame, available: np.ndarray):
+        codes, goals, rows = [], [], []
+        for dim, targets in self.marginals.items():
+            values = pd.Index(_labels(pd.Series(list(targets), dtype=object)))
+            code = values.get_indexer(cells[dim])
+            code[code < 0] = len(values)  # values without a marginal share one slot with goal 0
+            by_value = np.bincount(code, weights=available, minlength=len(values) + 1)
+            goal = np.zeros(len(values) + 1)
+            rest = []
+            for i, wanted in enumerate(targets.values()):
+                if wanted is None:
+                    goal[i] = by_value[i]
+                elif wanted == 'rest':
+                    rest.append(i)
+                else:
+                    goal[i] = wanted
+            if rest:
+                if self.total is None:
+                    raise ValueError(f"'rest' in the {dim} marginal needs a total sample size")
+                goal[rest] = max(0, self.total - goal.sum()) / len(rest)
+            codes.append(code)
+            goals.append(goal)
+            rows += [(dim, value, g, a) for value, g, a in zip(values, goal, by_value)]
+
+        weights = available.astype(float)
+        for _ in range(RAKING_ITERATIONS):
+            for code, goal in zip(codes, goals):
+                sums = np.bincount(code, weights=weights, minlength=len(goal))
+                factor = np.divide(goal, sums, out=np.zeros_like(goal), where=sums > 0)
+                weights = np.minimum(weights * factor[code], available)
+            if all(np.abs(np.bincount(c, weights=weights, minlength=len(g)) - g).max() < 0.5
+                   for c, g in zip(codes, goals)):
+                break
+
+        target = self._repair(self._round(weights, available, codes[0]), weights, available, codes)
+        report = pd.DataFrame(rows, columns=['dimension', 'value', 'requested', 'available'])
+        report['requested'] = report['requested'].round().astype(np.int64)
+        report['available'] = report['available'].astype(np.int64)
+        report['selected'] = np.concatenate([np.bincount(c, weights=target, minlength=len(g))[:-1]
+                                             for c, g in zip(codes, goals)]).astype(np.int64)
+        return target, self._with_shortfall(report)
+
+    @staticmethod
+    def _round(weights: np.ndarray, available: np.ndarray, group: np.ndarray) -> np.ndarray:
+        # Largest remainder within each group, so every group gets round(sum of its weights)
+        base = np.floor(weights + 1e-9).astype(np.int64)
+        size = group.max() + 1 if len(group) else 0
+        missing = (np.round(np.bincount(group, weights=weights, minlength=size)).astype(np.int64)
+                   - np.bincount(group, weights=base, minlength=size).astype(np.int64))
+        frac = np.where(base < available, weights - base, -1.0)
+        order = np.lexsort((-frac, group))
+        starts = np.searchsorted(group[order], group[order])
+        bump = (np.arange(len(order)) - starts < missing[group[order]]) & (frac[order] >= 0)
+        base[order[bump]] += 1
+        return base
+
+    @staticmethod
+    def _repair(target: np.ndarray, weights: np.ndarray, available: np.ndarray, codes) -> np.ndarray:
+        """Move units between strata until every marginal after the first also matches its
+        rounded raked total. A unit only moves between strata that share the value of every
+        other marginal, so the marginals already exact stay exact; the most over-rounded
+        stratum gives to the most under-rounded one with room left."""
+        for d in range(1, len(codes)):
+            code = codes[d]
+            others = [c for i, c in enumerate(codes) if i != d]
+            group = np.unique(np.column_stack(others), axis=0, return_inverse=True)[1].ravel()
+            size = code.max() + 1
+            wanted = np.round(np.bincount(code, weights=weights, minlength=size)).astype(np.int64)
+            for _ in range(int(target.sum())):
+                gap = wanted - np.bincount(code, weights=target, minlength=size).astype(np.int64)
+                if not gap.any():
+                    break
+                excess = weights - target
+                donors = np.flatnonzero((target > 0) & (gap[code] < 0))
+                receivers = np.flatnonzero((target < available) & (gap[code] > 0))
+                # First (largest-excess) receiver per group, then the most over-rounded donor that has one
+                by_group = {}
+                for j in receivers[np.argsort(-excess[receivers], kind='stable')]:
+                    by_group.setdefault(group[j], j)
+                pair = next(((i, by_group[group[i]]) for i in donors[np.argsort(excess[donors], kind='stable')]
+                             if group[i] in by_group), None)
+                if pair is None:
+                    break  # no stratum with room: what is left is a real shortfall
+                target[pair[0]] -= 1
+                target[pair[1]] += 1
+        return target
+
+    @staticmethod
+    def _with_shortfall(report: pd.DataFrame) -> pd.DataFrame:
+        report['shortfall'] = (report['requested'] - report['selected']).clip(lower=0)
+        return report.reset_index(drop=True)
+
+    def sample(self, df: pd.DataFrame) -> Sample:
+        cell, cells = self.cells(df)
+        target, report = self.allocate(cells)
+        keys = self.keys(np.random.default_rng(self.seed), df)
+        chosen = _first(cell, keys, target)
+        chosen = chosen[np.argsort(keys[chosen], kind='stable')]  # shuffled, by the same keys
+        return Sample(df.iloc[chosen].reset_index(drop=True), cells.assign(target=target), report)
+
+
+class ReservoirSampler(StratifiedSampler):
+    """StratifiedSampler in one pass over chunks, for archives that do not fit in memory.
+
+    `update` each chunk in order, then take `result()`. Every stratum keeps a reservoir of
+    its rows with the smallest keys, no larger than the most the stratum could be given
+    (its joint quota, or the smallest marginal target of its values; None and 'rest'
+    targets are bounded by `total`). Rows that fall out can never be drawn, so memory stays
+    at the reservoirs plus one chunk. The keys come from the same seeded stream as the
+    in-memory sampler, so both draw the same rows from the same data.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rng = np.random.default_rng(self.seed)
+        self.kept: Optional[pd.DataFrame] = None
+        self.kept_keys = np.empty(0)
+        self.counts: Optional[pd.DataFrame] = None
+        self.rows_seen = 0
+
+    def capacity(self, cells: pd.DataFrame) -> np.ndarray:
+        """Most rows each stratum can end up with, hence the reservoir size it needs."""
+        if self.quotas is not None:
+            return cells.merge(self.quotas, on=self.strata, how='left')['n'].fillna(0).to_numpy(dtype=float)
+        bound = np.inf if self.total is None else float(self.total)
+        capacity = np.full(len(cells), bound)
+        for dim, targets in self.marginals.items():
+            limits = {label: bound if wanted is None or wanted == 'rest' else float(wanted)
+                      for label, wanted in zip(_labels(pd.Series(list(targets), dtype=object)), targets.values())}
+            capacity = np.minimum(capacity, cells[dim].map(limits).fillna(0).to_numpy(dtype=float))
+        return capacity
+
+    def update(self, chunk: pd.DataFrame):
+        keys = self.keys(self.rng, chunk)
+        self.rows_seen += len(chunk)
+        cell, cells = self.cells(chunk)
+        counts = cells if self.counts is None else pd.concat([self.counts, cells])
+        self.counts = counts.groupby(self.strata, sort=True)['available'].sum().reset_index()
+        # Rows of strata that can get nothing are dropped before they are ever stored
+        wanted = np.flatnonzero(cell >= 0)
+        wanted = wanted[self.capacity(cells)[cell[wanted]] > 0]
+        if self.kept is None:
+            self.kept, self.kept_keys = chunk.iloc[:0], np.empty(0)
+        combined = pd.concat([self.kept, chunk.iloc[wanted]], ignore_index=True)
+        combined_keys = np.concatenate([self.kept_keys, keys[wanted]])
+        cell, cells = self.cells(combined)
+        keep = _first(cell, combined_keys, self.capacity(cells))
+        self.kept, self.kept_keys = combined.iloc[keep].reset_index(drop=True), combined_keys[keep]
+
+    def result(self) -> Sample:
+        if self.counts is None:
+            raise ValueError("No rows were added to the reservoir")
+        target, report = self.allocate(self.counts)
+        cell, cells = self.cells(self.kept)
+        wanted = cells.merge(self.counts.assign(target=target), on=self.strata, how='left')['target']
+        wanted = wanted.to_numpy(dtype=np.int64)
+        kept_target = np.minimum(wanted, cells['available'].to_numpy())
+        if (kept_target < wanted).any():
+            print(f"⚠ {(kept_target < wanted).sum()} strata hit the reservoir bound (total={self.total}); "
+                  "raise the total to draw more of them")
+        chosen = _first(cell, self.kept_keys, kept_target)
+        chosen = chosen[np.argsort(self.kept_keys[chosen], kind='stable')]
+        return Sample(self.kept.iloc[chosen].reset_index(drop=True), self.counts.assign(target=target), report)
+
+
+def _first(cell: np.ndarray, keys: np.ndarray, limit: np.ndarray) -> np.ndarray:
+    """Positions of the `limit[c]` smallest-key rows of every stratum c (cell -1: none)."""
+    valid = np.flatnonzero(cell >= 0)
+    order = valid[np.lexsort((keys[valid], cell[valid]))]
+    sorted_cell = cell[order]
+    rank = np.arange(len(order)) - np.searchsorted(sorted_cell, sorted_cell)
+    return order[rank < limit[sorted_cell]]
+
+
+def print_report(report: pd.DataFrame):
+    """Per-target table of the sample, with a warning for every target that was not met."""
+    print(report.to_string(index=False))
+    for row in report[report['shortfall'] > 0].itertuples(index=False):
+        label = (f"{row.dimension}={row.value}" if 'dimension' in report.columns
+                 else ' × '.join(str(v) for v in row[:len(report.columns) - 4]))
+        print(f"⚠ {label}: selected {row.selected} of {row.requested} requested ({row.available} available)")
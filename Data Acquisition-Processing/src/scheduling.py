@@ -0,0 +1,287 @@
+import atexit
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import requests
+
+from . import config
+from .ratelimit import TokenBucket
+from .storage import dataset_exists, read_dataset
+
+
+def call_with_timeout(fn: Callable[[], Any], timeout: Optional[float]) -> Any:
+    """Run `fn` and give up waiting after `timeout` seconds.
+
+    Blocking library calls (feedparser has no timeout of its own) cannot be cancelled,
+    so a timed-out call is left to finish on a daemon thread and its result discarded.
+    """
+    if not timeout:
+        return fn()
+    outcome = {}
+
+    def target():
+        try:
+            outcome['value'] = fn()
+        except BaseException as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"no response after {timeout:g}s")
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['value']
+
+
+def retry(fn: Callable[[], Any], retries: int = None, backoff: float = None,
+          timeout: Optional[float] = None, label: str = '') -> Any:
+    """Call `fn` up to `retries + 1` times with exponential backoff and jitter."""
+    retries = config.QUERY_RETRIES if retries is None else retries
+    backoff = config.RETRY_BACKOFF if backoff is None else backoff
+    for attempt in range(retries + 1):
+        try:
+            return call_with_timeout(fn, timeout)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+            print(f"  ⚠ {label or 'query'} failed ({e}); retry {attempt + 1}/{retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def fan_out(fn: Callable[[Any], Any], tasks: Iterable[Any], workers: int = None,
+            timeout: Optional[float] = None, retries: int = None,
+            backoff: float = None) -> Iterator[Tuple[Any, Any, Optional[Exception]]]:
+    """Run `fn(task)` for every task on a bounded pool, yielding results as they finish.
+
+    Yields (task, result, error) in completion order, so one slow task does not hold
+    back the rest; each task gets its own timeout and retries.
+    """
+    workers = config.QUERY_MAX_WORKERS if workers is None else workers
+    timeout = config.QUERY_TIMEOUT if timeout is None else timeout
+
+    def run(task):
+        return retry(lambda: fn(task), retries, backoff, timeout, label=str(task))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run, task): task for task in tasks}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
+
+class QuotaExhausted(requests.exceptions.RequestException):
+    """Raised when a provider's daily request budget is used up."""
+
+
+class ProviderQuota(TokenBucket):
+    """Per-second token bucket plus a daily request budget shared by a provider's collectors.
+
+    Daily usage is persisted, so the budget holds across runs and across collectors
+    that use the same API key. Only real requests spend it (the response cache
+    acquires the limiter on misses only). Requests are counted in memory and written
+    out every QUOTA_FLUSH_REQUESTS requests or QUOTA_FLUSH_SECONDS, and at exit.
+    """
+
+    _instances: Dict[str, 'ProviderQuota'] = {}
+    _usage_lock = threading.Lock()
+
+    def __init__(self, provider: str, rate: float = None, daily_limit: int = None, capacity: float = 1):
+        default_rate, default_daily = config.PROVIDER_QUOTAS[provider]
+        super().__init__(default_rate if rate is None else rate, capacity)
+        self.provider = provider
+        self.daily_limit = default_daily if daily_limit is None else daily_limit
+        self._date = None     # UTC day the counts below belong to
+        self._used = 0        # requests recorded in the usage file
+        self._unsaved = 0.0   # requests spent since the last write
+        self._saved_at = time.monotonic()
+
+    @classmethod
+    def for_provider(cls, provider: str) -> 'ProviderQuota':
+        if provider not in cls._instances:
+            cls._instances[provider] = cls(provider)
+        return cls._instances[provider]
+
+    @classmethod
+    def flush_all(cls):
+        for quota in cls._instances.values():
+            quota.flush()
+
+    @staticmethod
+    def _load_usage() -> Dict:
+        try:
+            with open(config.QUOTA_USAGE_FILE, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _stored(self, usage: Dict) -> int:
+        entry = usage.get(self.provider, {})
+        return entry.get('used', 0) if entry.get('date') == self._date else 0
+
+    def _sync(self):
+        """Load today's usage on first use and again after UTC midnight (lock held)."""
+        if self._date != _today():
+            self._date = _today()
+            self._used = self._stored(self._load_usage())
+            self._unsaved = 0.0
+
+    def _write(self):
+        """Add the unsaved requests to the file's count, keeping other writers' requests (lock held)."""
+        if not self._unsaved:
+            return
+        usage = self._load_usage()
+        self._used = max(self._stored(usage), self._used) + int(self._unsaved)
+        self._unsaved -= int(self._unsaved)
+        usage[self.provider] = {'date': self._date, 'used': self._used}
+        config.QUOTA_USAGE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = config.QUOTA_USAGE_FILE.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(usage, f, indent=2)
+        os.replace(tmp, config.QUOTA_USAGE_FILE)
+        self._saved_at = time.monotonic()
+
+    def flush(self):
+        with self._usage_lock:
+            self._write()
+
+    def used_today(self) -> int:
+        with self._usage_lock:
+            self._sync()
+            return int(self._used + self._unsaved)
+
+    def remaining(self) -> Optional[int]:
+        """Requests left today, or None if the provider has no daily cap."""
+        if not self.daily_limit:
+            return None
+        return max(0, self.daily_limit - self.used_today())
+
+    def _spend(self, tokens: float):
+        with self._usage_lock:
+            self._sync()
+            if self.daily_limit and self._used + self._unsaved + tokens > self.daily_limit:
+                self._write()
+                raise QuotaExhausted(f"{self.provider}: daily quota of {self.daily_limit} requests used")
+            self._unsaved += tokens
+            if (self._unsaved >= config.QUOTA_FLUSH_REQUESTS
+                    or time.monotonic() - self._saved_at >= config.QUOTA_FLUSH_SECONDS):
+                self._write()
+
+    def acquire(self, tokens: float = 1.0):
+        self._spend(tokens)
+        super().acquire(tokens)
+
+    async def acquire_async(self, tokens: float = 1.0):
+        self._spend(tokens)
+        await super().acquire_async(tokens)
+
+
+# Write out the requests counted since the last flush
+atexit.register(ProviderQuota.flush_all)
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+
+class Task(NamedTuple):
+    """One unit of collection work: a date window or a source.
+
+    `fetch()` does the network part and may raise; `write(result, error)` filters,
+    checkpoints and returns the number of rows kept. `coverage` names the cells the
+    rows will count towards, e.g. {'year': '2019', 'source': 'foxnews.com'}.
+    """
+    key: str
+    coverage: Dict[str, str]
+    fetch: Callable[[], Any]
+    write: Callable[[Any, Optional[Exception]], int]
+
+
+def coverage_from_dataset(path) -> Dict[str, Counter]:
+    """Article counts per year and per source domain in an existing dataset."""
+    coverage = {'year': Counter(), 'source': Counter()}
+    if not dataset_exists(path):
+        return coverage
+    df = read_dataset(path, columns=['date', 'url'])
+    if 'date' in df:
+        coverage['year'].update(df['date'].dropna().astype(str).str[:4])
+    if 'url' in df:
+        hosts = df['url'].dropna().astype(str).str.extract(r'^https?://(?:www\.)?([^/:]+)', expand=False)
+        coverage['source'].update(hosts.dropna().str.lower())
+    return coverage
+
+
+class QuotaScheduler:
+    """Runs the tasks of several collectors at once, biggest coverage gap first.
+
+    Collectors are grouped by provider and every provider gets one worker, so the APIs
+    are queried in parallel while each stays within its own rate and daily budget.
+    Before each request a worker picks the pending task whose coverage cells lag
+    furthest behind the best-covered cell of the same kind; counts are updated as
+    rows come in, so the remaining quota keeps flowing to what is still missing.
+    """
+
+    def __init__(self, collectors: List, coverage: Optional[Dict[str, Counter]] = None):
+        self.collectors = collectors
+        self.coverage = coverage if coverage is not None else {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def gap(self, task: Task) -> float:
+        """Sum over the task's cells of how far each lags the best-covered cell (0..1 each)."""
+        total = 0.0
+        for dim, value in task.coverage.items():
+            counts = self.coverage.setdefault(dim, Counter())
+            top = max(counts.values(), default=0)
+            total += (top - counts.get(value, 0)) / top if top else 1.0
+        return total
+
+    def _drain(self, provider: str, queue: List[Tuple[Any, Task]]):
+        quota = ProviderQuota.for_provider(provider)
+        stats = self.stats.setdefault(provider, {'tasks': 0, 'rows': 0, 'skipped': 0})
+        while queue:
+            if quota.remaining() == 0:
+                stats['skipped'] = len(queue)
+                print(f"  ⚠ {provider}: daily quota used, {len(queue)} tasks left for the next run")
+                return
+            with self._lock:
+                # max() keeps the first of equal gaps, so ties go in the collector's own order
+                collector, task = max(queue, key=lambda entry: self.gap(entry[1]))
+                queue.remove((collector, task))
+            rows = collector.run_task(task)
+            with self._lock:
+                for dim, value in task.coverage.items():
+                    self.coverage[dim][value] += rows
+                stats['tasks'] += 1
+                stats['rows'] += rows
+
+    def run(self, fresh: bool = False):
+        queues: Dict[str, List[Tuple[Any, Task]]] = {}
+        for collector in self.collectors:
+            if not collector.ready():
+                continue
+            tasks = collector.tasks(fresh)
+            print(f"{collector.name}: {len(tasks)} pending tasks ({collector.provider} quota)")
+            queues.setdefault(collector.provider, []).extend((collector, task) for task in tasks)
+
+        with ThreadPoolExecutor(max_workers=max(1, len(queues))) as pool:
+            list(pool.map(lambda item: self._drain(*item), queues.items()))
+
+        for collector in self.collectors:
+            if collector.manifest is not None:
+                collector.finish()
+        for provider, stats in self.stats.items():
+            remaining = ProviderQuota.for_provider(provider).remaining()
+            print(f"  {provider}: {stats['tasks']} tasks, {stats['rows']} rows, "
+                  f"{'no daily cap' if remaining is None else f'{remaining} requests left today'}")
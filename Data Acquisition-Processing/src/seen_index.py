@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from . import config
+from .storage import csv_path, dataset_exists, parquet_path, read_dataset
+from .urls import canonical_url
+
+KINDS = ('url', 'title')
+
+
+def normalize_title(title) -> str:
+    if not isinstance(title, str):
+        return ''
+    return re.sub(r'\s+', ' ', title).lower().strip()
+
+
+def key_hash(value: str) -> int:
+    """Stable 64-bit hash of an already-normalized key."""
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class SeenIndex:
+    """Persistent index of the article URLs and titles in the merged dataset, shared by all collectors.
+
+    Canonical URLs and normalized titles are stored as sorted 64-bit hashes in one .npy
+    file per kind and memory-mapped, so a lookup is a binary search that never loads
+    the archive into memory. Additions go to an in-memory set and an append-only
+    journal (so a crash loses nothing); `flush()` merges them into the sorted file.
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = Path(directory or config.SEEN_INDEX_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.sorted = {}
+        self.pending = {}
+        for kind in KINDS:
+            self.sorted[kind] = self._load_sorted(kind)
+            self.pending[kind] = self._load_journal(kind)
+
+    def _path(self, kind: str, suffix: str) -> Path:
+        return self.directory / f"{kind}s{suffix}"
+
+    def _load_sorted(self, kind: str) -> np.ndarray:
+        path = self._path(kind, '.npy')
+        if not path.exists():
+            return np.empty(0, dtype=np.uint64)
+        return np.load(path, mmap_mode='r')
+
+    def _load_journal(self, kind: str) -> set:
+        path = self._path(kind, '.journal')
+        if not path.exists():
+            return set()
+        return set(np.fromfile(path, dtype=np.uint64).tolist())
+
+    def count(self, kind: str) -> int:
+        return len(self.sorted[kind]) + len(self.pending[kind])
+
+    def __len__(self) -> int:
+        return self.count('url')
+
+    @staticmethod
+    def normalize(kind: str, value) -> str:
+        return canonical_url(value) if kind == 'url' else normalize_title(value)
+
+    def _contains(self, kind: str, h: int) -> bool:
+        if h in self.pending[kind]:
+            return True
+        keys = self.sorted[kind]
+        i = np.searchsorted(keys, np.uint64(h))
+        return i < len(keys) and keys[i] == h
+
+    def seen(self, url=None, title=None) -> bool:
+        """True if the URL or the title has been collected before."""
+        for kind, value in (('url', url), ('title', title)):
+            key = self.normalize(kind, value)
+            if key and self._contains(kind, key_hash(key)):
+                return True
+        return False
+
+    def add(self, url=None, title=None):
+        self.add_many([url], [title])
+
+    def add_many(self, urls: Iterable = (), titles: Iterable = ()):
+        with self._lock:
+            self._add_many(urls, titles)
+
+    def _add_many(self, urls: Iterable, titles: Iterable):
+        for kind, values in (('url', urls), ('title', titles)):
+            hashes = {key_hash(k) for k in (self.normalize(kind, v) for v in values) if k}
+            hashes -= self.pending[kind]
+            if not hashes:
+                continue
+            self.pending[kind] |= hashes
+            with open(self._path(kind, '.journal'), 'ab') as f:
+                np.fromiter(hashes, dtype=np.uint64, count=len(hashes)).tofile(f)
+
+    def add_rows(self, rows: Iterable[Dict]):
+        rows = list(rows)
+        self.add_many([r.get('url') for r in rows], [r.get('title') for r in rows])
+
+    def check_and_add(self, url=None, title=None) -> bool:
+        """Record an article and return True if it was not seen before (thread-safe)."""
+        with self._lock:
+            if self.seen(url, title):
+                return False
+            self._add_many([url], [title])
+            return True
+
+    def contains_titles(self, titles: pd.Series) -> np.ndarray:
+        """Vectorized title membership for a whole column."""
+        return self._contains_many('title', titles.map(normalize_title))
+
+    def contains_urls(self, urls: pd.Series) -> np.ndarray:
+        return self._contains_many('url', urls.map(lambda u: self.normalize('url', u)))
+
+    def _contains_many(self, kind: str, keys: pd.Series) -> np.ndarray:
+        hashes = np.fromiter((key_hash(k) if k else 0 for k in keys), dtype=np.uint64, count=len(keys))
+        stored = self.sorted[kind]
+        hit = np.zeros(len(hashes), dtype=bool)
+        if len(stored):
+            idx = np.minimum(np.searchsorted(stored, hashes), len(stored) - 1)
+            hit = stored[idx] == hashes
+        if self.pending[kind]:
+            hit |= np.isin(hashes, np.fromiter(self.pending[kind], dtype=np.uint64))
+        return hit & (keys != '').to_numpy()
+
+    def flush(self):
+        """Merge journaled additions into the sorted files."""
+        with self._lock:
+            for kind in KINDS:
+                if not self.pending[kind]:
+                    continue
+                new = np.fromiter(self.pending[kind], dtype=np.uint64, count=len(self.pending[kind]))
+                merged = np.union1d(np.asarray(self.sorted[kind]), new)
+                path = self._path(kind, '.npy')
+                tmp = self._path(kind, '.tmp.npy')
+                np.save(tmp, merged)
+                self.sorted[kind] = None  # release the memory map before replacing the file
+                os.replace(tmp, path)
+                self._path(kind, '.journal').unlink(missing_ok=True)
+                self.sorted[kind] = np.load(path, mmap_mode='r')
+                self.pending[kind] = set()
+
+    def sync_dataset(self, path) -> int:
+        """Import the url/title columns of a dataset if it changed since the last import.
+
+        The dataset is read through storage.read_dataset, so either copy counts: the Parquet
+        file, or the CSV export when EXPORT_CSV is on (whichever is newer).
+        """
+        if not dataset_exists(path):
+            return 0
+        meta_path = self.directory / 'sources.json'
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                sources: Dict[str, float] = json.load(f)
+        except (OSError, ValueError):
+            sources = {}
+        key = str(csv_path(path))
+        mtime = max(p.stat().st_mtime for p in (csv_path(path), parquet_path(path)) if p.exists())
+        if sources.get(key) == mtime:
+            return 0
+
+        df = read_dataset(path, columns=KINDS)
+        self.add_many(df.get('url', ()), df.get('title', ()))
+        self.flush()
+        sources[key] = mtime
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(sources, f, indent=2)
+        print(f"Seen-index: imported {len(df)} rows from {Path(key).stem} ({len(self)} URLs indexed)")
+        return len(df)
+
+    def summary(self) -> str:
+        return f"seen-index: {self.count('url'):,} URLs, {self.count('title'):,} titles"
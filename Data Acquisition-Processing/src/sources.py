@@ -0,0 +1,212 @@
+import json
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from . import config
+
+
+class Source(NamedTuple):
+    """One news outlet from the registry. `since` / `leaning_since` are the registry
+    versions that added the outlet and its leaning."""
+    name: str
+    country: str
+    leaning: Optional[str]
+    aliases: List[str]
+    domains: List[str]
+    newsapi_id: Optional[str] = None
+    since: int = 1
+    leaning_since: int = 1
+
+    @property
+    def keys(self) -> List[str]:
+        """Lower-case names the outlet is matched by: aliases, then domains."""
+        return self.aliases + self.domains
+
+    def leaning_at(self, version: int) -> Optional[str]:
+        return self.leaning if version >= self.leaning_since else None
+
+
+def _key(source) -> str:
+    return str(source).lower().strip()
+
+
+class SourceRegistry:
+    """The versioned source registry (SOURCE_REGISTRY_FILE), indexed by domain and alias.
+
+    Sources are kept in file order, which is also the order names are matched in by
+    SourceClassifier. Every alias and domain maps to exactly one source, and the
+    collection lists may only name registered domains; both are checked on load.
+    """
+
+    def __init__(self, data: Dict):
+        self.version: int = data['version']
+        self.rules: Dict[str, List[str]] = data['rules']
+        self.sources = [Source(**entry) for entry in data['sources']]
+        self.by_alias: Dict[str, Source] = {}
+        self.by_domain: Dict[str, Source] = {}
+        for source in self.sources:
+            for index, names in ((self.by_alias, source.aliases), (self.by_domain, source.domains)):
+                for name in names:
+                    if name in self.by_alias or name in self.by_domain:
+                        raise ValueError(f"Source registry: '{name}' is listed for more than one source")
+                    index[name] = source
+        self.by_newsapi_id = {s.newsapi_id: s for s in self.sources if s.newsapi_id}
+        self.collections: Dict[str, Dict[str, List[str]]] = data['collections']
+        for collection in self.collections.values():
+            for domains in collection.values():
+                unknown = [d for d in domains if d not in self.by_domain]
+                if unknown:
+                    raise ValueError(f"Source registry: collection lists unregistered domains {unknown}")
+
+    @classmethod
+    def load(cls, path=None) -> 'SourceRegistry':
+        with open(Path(path or config.SOURCE_REGISTRY_FILE), encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def at(self, version: Optional[int] = None) -> List[Source]:
+        """Sources that existed in registry `version` (default: the current one)."""
+        version = self.version if version is None else version
+        return [s for s in self.sources if s.since <= version]
+
+    def lookup(self, source) -> Optional[Source]:
+        """Source for a display name or domain (exact, case-insensitive, 'www.' ignored)."""
+        key = _key(source)
+        if key.startswith('www.'):
+            key = key[4:]
+        return self.by_alias.get(key) or self.by_domain.get(key)
+
+    def leaning(self, source) -> str:
+        found = self.lookup(source)
+        return (found.leaning if found else None) or 'Other'
+
+    def collection(self, name: str) -> Dict[str, List[str]]:
+        """Domains a collector queries, by group (e.g. {'center': [...], 'right': [...]})."""
+        return {group: list(domains) for group, domains in self.collections[name].items()}
+
+    def newsapi_sources(self) -> Dict[str, List[str]]:
+        """NewsAPI source ids by group, in the order they are requested."""
+        return {group: [self.by_domain[d].newsapi_id for d in domains]
+                for group, domains in self.collections['newsapi'].items()}
+
+
+REGISTRY = SourceRegistry.load()
+
+
+class PatternMatcher:
+    """Aho-Corasick automaton over a fixed, ordered list of patterns.
+
+    Built once; `first_match` then scans a text in one pass, whatever the number of
+    patterns, and returns the index of the earliest pattern (in list order) that
+    occurs anywhere in it. Each state stores the smallest pattern index among the
+    patterns ending there or at any of its suffix states.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.best: List[int] = [-1]
+        for index, pattern in enumerate(patterns):
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                nxt = self.goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][char] = nxt
+                    self.goto.append({})
+                    self.best.append(-1)
+                state = nxt
+            if self.best[state] < 0:
+                self.best[state] = index
+        self._link()
+
+    def _link(self):
+        fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and char not in self.goto[f]:
+                    f = fail[f]
+                fail[nxt] = self.goto[f].get(char, 0) if self.goto[f].get(char) != nxt else 0
+                inherited = self.best[fail[nxt]]
+                if inherited >= 0 and (self.best[nxt] < 0 or inherited < self.best[nxt]):
+                    self.best[nxt] = inherited
+        self.fail = fail
+
+    def first_match(self, text: str) -> int:
+        state, found = 0, -1
+        goto, fail, best = self.goto, self.fail, self.best
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            b = best[state]
+            if b >= 0 and (found < 0 or b < found):
+                found = b
+        return found
+
+
+class SourceClassifier:
+    """North American flag and political leaning of source names.
+
+    Same rules as the per-row loops it replaces: names are lower-cased and stripped,
+    excluded international names are never North American, an exact alias or domain
+    wins, and otherwise the first registry name contained in the source decides
+    (names under 5 characters only match exactly, except the short_substrings rule).
+    Exact names go through the registry's hash indexes; substrings through
+    PatternMatchers compiled once. `classify` handles each distinct name once.
+    `version` classifies as of an older registry version.
+    """
+
+    def __init__(self, registry: Optional[SourceRegistry] = None, version: Optional[int] = None,
+                 exclusions: Optional[Iterable[str]] = None):
+        self.registry = registry or REGISTRY
+        self.version = self.registry.version if version is None else version
+        rules = self.registry.rules
+        sources = self.registry.at(self.version)
+        countries = set(rules['north_american_countries'])
+        short = set(rules['short_substrings'])
+
+        north_american = [k for s in sources if s.country in countries for k in s.keys]
+        self.north_american = set(north_american)
+        self.leanings = {k: s.leaning_at(self.version) for s in sources for k in s.keys if s.leaning_at(self.version)}
+        self._na_matcher = PatternMatcher([k for k in north_american if len(k) >= 5 or k in short])
+        # Short aliases ('ap') would match inside unrelated names (japantimes, snapchat)
+        substrings = [k for k in self.leanings if len(k) >= 5 or k in short]
+        self._labels = [self.leanings[k] for k in substrings]
+        self._leaning_matcher = PatternMatcher(substrings)
+        exclusions = rules['international_exclusions'] if exclusions is None else exclusions
+        self._exclusion_matcher = PatternMatcher(list(exclusions))
+
+    def is_north_american(self, source) -> bool:
+        s = _key(source)
+        if self._exclusion_matcher.first_match(s) >= 0:
+            return False
+        return s in self.north_american or self._na_matcher.first_match(s) >= 0
+
+    def leaning(self, source) -> str:
+        s = _key(source)
+        if s in self.leanings:
+            return self.leanings[s]
+        match = self._leaning_matcher.first_match(s)
+        return self._labels[match] if match >= 0 else 'Other'
+
+    def classify(self, sources: pd.Series) -> pd.DataFrame:
+        """'is_north_american' and 'leaning' for every row, aligned with `sources`."""
+        if isinstance(sources.dtype, pd.CategoricalDtype):
+            codes, uniques = sources.cat.codes.to_numpy(), list(sources.cat.categories) + [np.nan]
+        else:
+            codes, uniques = pd.factorize(sources, use_na_sentinel=False)
+            uniques = list(uniques)
+        # Categorical codes use -1 for missing values, which indexes the trailing NaN
+        north_american = np.array([self.is_north_american(s) for s in uniques], dtype=bool)
+        leanings = np.array([self.leaning(s) for s in uniques], dtype=object)
+        return pd.DataFrame({'is_north_american': north_american[codes], 'leaning': leanings[codes]},
+                            index=sources.index)
@@ -0,0 +1,221 @@
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+import pandas as pd
+
+from . import config
+from .dates import as_datetime
+
+try:
+    import pyarrow
+    import pyarrow.parquet as pq
+except ImportError:
+    pyarrow = pq = None
+
+# Explicit dtypes for every column a stage hands to the next. Low-cardinality labels are
+# categoricals, dates are native datetimes; anything not listed keeps pandas' inference.
+SCHEMA: Dict[str, str] = {
+    'article_id': 'string',
+    'source': 'category',
+    'date': 'datetime64[ns]',
+    'title': 'string',
+    'description': 'string',
+    'url': 'string',
+    'canonical_url': 'string',
+    'snippet': 'string',
+    'cluster_id': 'Int64',
+    'is_north_american': 'boolean',
+    'leaning': 'category',
+    'PRIMARY_TOPIC': 'category',
+    'SENTIMENT (Pos/Neg/Neu)': 'category',
+    'sentiment': 'category',
+}
+
+
+def parquet_path(path) -> Path:
+    return Path(path).with_suffix('.parquet')
+
+
+def csv_path(path) -> Path:
+    return Path(path).with_suffix('.csv')
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast the columns named in SCHEMA that are present; others are left alone."""
+    for column, dtype in SCHEMA.items():
+        if column not in df.columns or str(df[column].dtype) == dtype:
+            continue
+        if dtype.startswith('datetime'):
+            df[column] = as_datetime(df[column], column)
+        elif dtype == 'boolean':
+            df[column] = df[column].map(
+                lambda v: v if isinstance(v, bool) else {'true': True, 'false': False}.get(str(v).strip().lower())
+            ).astype('boolean')
+        else:
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def _use_parquet(path: Path) -> bool:
+    """Read the Parquet copy unless the CSV was edited after it was written."""
+    parquet, csv = parquet_path(path), csv_path(path)
+    if pyarrow is None or not parquet.exists():
+        return False
+    return not csv.exists() or parquet.stat().st_mtime >= csv.stat().st_mtime
+
+
+def dataset_exists(path) -> bool:
+    return parquet_path(path).exists() or csv_path(path).exists()
+
+
+def read_dataset(path, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Load a dataset by its .csv or .parquet name (or a partition directory), typed per SCHEMA.
+
+    Parquet is preferred; the CSV is only parsed when no (up to date) Parquet copy
+    exists, e.g. for files checked in or edited by hand. `columns` projects the read
+    so unused text columns are never loaded.
+    """
+    path = Path(path)
+    columns = list(columns) if columns is not None else None
+    if path.is_dir():
+        return read_partitions(path, columns)
+    if _use_parquet(path):
+        return pd.read_parquet(parquet_path(path), columns=columns)
+
+    csv = csv_path(path)
+    usecols = (lambda c: c in columns) if columns is not None else None
+    df = pd.read_csv(csv, usecols=usecols, low_memory=False)
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    return apply_schema(df)
+
+
+def write_dataset(df: pd.DataFrame, path, export_csv: Optional[bool] = None) -> Path:
+    """Save a dataset as typed Parquet, plus a CSV export for people and spreadsheets.
+
+    Returns the path of the primary copy. Without pyarrow the CSV is the only copy.
+    """
+    path = Path(path)
+    export_csv = config.EXPORT_CSV if export_csv is None else export_csv
+    df = apply_schema(df.copy())
+    if pyarrow is None:
+        df.to_csv(csv_path(path), index=False)
+        return csv_path(path)
+
+    if export_csv:
+        df.to_csv(csv_path(path), index=False)
+    # Written after the export so the Parquet copy is never older than its CSV
+    tmp = parquet_path(path).with_suffix('.parquet.tmp')
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, parquet_path(path))
+    return parquet_path(path)
+
+
+def iter_dataset(path, chunksize: int, columns: Optional[Iterable[str]] = None) -> Iterator[pd.DataFrame]:
+    """read_dataset in chunks of at most `chunksize` rows, for files larger than memory."""
+    path = Path(path)
+    columns = list(columns) if columns is not None else None
+    if _use_parquet(path):
+        with pq.ParquetFile(parquet_path(path)) as f:
+            names = [c for c in columns if c in f.schema_arrow.names] if columns is not None else None
+            for batch in f.iter_batches(batch_size=chunksize, columns=names):
+                yield apply_schema(batch.to_pandas())
+        return
+    usecols = (lambda c: c in columns) if columns is not None else None
+    for chunk in pd.read_csv(csv_path(path), usecols=usecols, chunksize=chunksize, low_memory=False):
+        if columns is not None:
+            chunk = chunk[[c for c in columns if c in chunk.columns]]
+        yield apply_schema(chunk)
+
+
+class DatasetWriter:
+    """write_dataset for data that arrives in chunks.
+
+    The Parquet copy goes through one ParquetWriter whose schema is fixed by the first
+    chunk (categoricals as int32 dictionaries, so later chunks with more categories
+    still fit), and the CSV export is appended to. Memory stays at one chunk.
+    """
+
+    def __init__(self, path, export_csv: Optional[bool] = None):
+        self.path = Path(path)
+        self.export_csv = config.EXPORT_CSV if export_csv is None else export_csv
+        self.rows = 0
+        self._schema = None
+        self._writer = None
+        self._tmp = parquet_path(self.path).with_suffix('.parquet.tmp')
+
+    def _arrow_schema(self, chunk: pd.DataFrame):
+        inferred = pyarrow.Schema.from_pandas(chunk, preserve_index=False)
+        fields = []
+        for field in inferred:
+            if pyarrow.types.is_dictionary(field.type):
+                field = field.with_type(pyarrow.dictionary(pyarrow.int32(), field.type.value_type))
+            elif pyarrow.types.is_null(field.type):
+                # All missing in the first chunk: take the type the schema promises
+                dtype = SCHEMA.get(field.name, 'string')
+                field = field.with_type({'Int64': pyarrow.int64(), 'boolean': pyarrow.bool_()}.get(
+                    dtype, pyarrow.timestamp('us') if dtype.startswith('datetime') else pyarrow.string()))
+            fields.append(field)
+        # Keep the pandas metadata so the file reads back with the same dtypes
+        return pyarrow.schema(fields, metadata=inferred.metadata)
+
+    def write(self, chunk: pd.DataFrame):
+        chunk = apply_schema(chunk.copy())
+        if pyarrow is None or self.export_csv:
+            chunk.to_csv(csv_path(self.path), index=False, mode='a' if self.rows else 'w', header=not self.rows)
+        if pyarrow is not None:
+            if self._writer is None:
+                self._schema = self._arrow_schema(chunk)
+                self._writer = pq.ParquetWriter(self._tmp, self._schema)
+            self._writer.write_table(pyarrow.Table.from_pandas(chunk, schema=self._schema, preserve_index=False))
+        self.rows += len(chunk)
+
+    def close(self) -> Path:
+        if pyarrow is None:
+            return csv_path(self.path)
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            os.replace(self._tmp, parquet_path(self.path))
+        return parquet_path(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- Partitioned datasets ----------------------------------------------------------------
+#
+# A directory with one date-sorted Parquet file per year ('year=2024.parquet'), so adding
+# rows rewrites only the years they fall in.
+
+def partition_key(dates: pd.Series) -> pd.Series:
+    return dates.dt.year.astype('Int64').astype('string').fillna('unknown')
+
+
+def partition_path(directory, key: str) -> Path:
+    return Path(directory) / f"year={key}.parquet"
+
+
+def read_partitions(directory, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    files = sorted(Path(directory).glob('year=*.parquet'))
+    if not files:
+        return pd.DataFrame(columns=list(columns) if columns is not None else None)
+    parts = [pd.read_parquet(f, columns=list(columns) if columns is not None else None) for f in files]
+    return apply_schema(pd.concat(parts, ignore_index=True))
+
+
+def update_partition(directory, key: str, rows: pd.DataFrame) -> int:
+    """Add rows to one partition, keeping it sorted by date; returns its new length."""
+    path = partition_path(directory, key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        rows = pd.concat([pd.read_parquet(path), rows], ignore_index=True)
+    rows = apply_schema(rows.sort_values('date', kind='stable').reset_index(drop=True))
+    tmp = path.with_suffix('.parquet.tmp')
+    rows.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return len(rows)
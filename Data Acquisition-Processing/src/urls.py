@@ -0,0 +1,186 @@
+import base64
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import pandas as pd
+import requests
+
+from . import config
+from .cache import ResponseCache
+from .ratelimit import TokenBucket
+
+# Query parameters that identify a click or a locale, not an article
+TRACKING_PARAMS = {'oc', 'hl', 'gl', 'ceid', 'ref', 'cmpid', 'fbclid', 'gclid', 'mc_cid', 'mc_eid'}
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL so that the same article always maps to the same key.
+
+    Lowercases the scheme and host, drops 'www.', fragments, tracking/locale query
+    parameters and trailing slashes, and sorts what is left of the query string.
+    """
+    if not isinstance(url, str) or not url.strip():
+        return ''
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith('utm_')
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(('https' if parts.scheme in ('http', 'https') else parts.scheme,
+                       host, path, urlencode(query), ''))
+
+
+# --- Google News RSS article URLs -------------------------------------------------------
+#
+# news.google.com/rss/articles/<id> ids are base64url-encoded protobuf messages. Older ids
+# carry the publisher URL in field 4 (or an AMP URL in field 26) and decode locally; newer
+# ids carry an opaque 'AU_yqL...' token that only Google can resolve.
+
+GNEWS_ID_PATTERN = r'news\.google\.com/(?:rss/)?articles/([A-Za-z0-9_-]+)'
+GNEWS_BATCHEXECUTE_URL = 'https://news.google.com/_/DotsSplashUi/data/batchexecute'
+GNEWS_RESOLVE_URL = 'gnews://resolve'  # cache namespace for resolved ids
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value, shift = 0, 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def _protobuf_strings(data: bytes) -> Dict[int, bytes]:
+    """Top-level length-delimited fields of a protobuf message (field number -> bytes)."""
+    fields, pos = {}, 0
+    while pos < len(data):
+        key, pos = _read_varint(data, pos)
+        field, wire_type = key >> 3, key & 0x07
+        if wire_type == 0:
+            _, pos = _read_varint(data, pos)
+        elif wire_type == 2:
+            length, pos = _read_varint(data, pos)
+            fields.setdefault(field, data[pos:pos + length])
+            pos += length
+        elif wire_type == 1:
+            pos += 8
+        elif wire_type == 5:
+            pos += 4
+        else:
+            break
+    return fields
+
+
+def decode_gnews_id(article_id: str) -> Optional[str]:
+    """Publisher URL embedded in a Google News article id, or None if it needs a lookup."""
+    try:
+        data = base64.urlsafe_b64decode(article_id + '=' * (-len(article_id) % 4))
+        fields = _protobuf_strings(data)
+    except (ValueError, IndexError):
+        return None
+    for field in (4, 26):
+        value = fields.get(field, b'')
+        if value.startswith((b'http://', b'https://')):
+            return value.decode('utf-8', errors='replace')
+    return None
+
+
+def resolve_gnews_id(article_id: str, session: requests.Session) -> Optional[str]:
+    """Ask Google News for the publisher URL of an opaque article id (two requests)."""
+    page = session.get(f"https://news.google.com/rss/articles/{article_id}", timeout=config.HTTP_TIMEOUT)
+    page.raise_for_status()
+    if 'news.google.com' not in urlsplit(page.url).netloc:
+        return page.url  # redirected straight to the publisher
+    signature = re.search(r'data-n-a-sg="([^"]+)"', page.text)
+    timestamp = re.search(r'data-n-a-ts="([^"]+)"', page.text)
+    if not signature or not timestamp:
+        return None
+    payload = [
+        'Fbv4je',
+        f'["garturlreq",[["X","X",["X","X"],null,null,1,1,"US:en",null,1,null,null,null,null,null,0,1],'
+        f'"X","X",1,[1,1,1],1,1,null,0,0,null,0],"{article_id}",{timestamp.group(1)},"{signature.group(1)}"]',
+    ]
+    response = session.post(
+        GNEWS_BATCHEXECUTE_URL,
+        data={'f.req': json.dumps([[payload]])},
+        headers={'Content-Type': 'application/x-www-form-urlencoded;charset=UTF-8'},
+        timeout=config.HTTP_TIMEOUT,
+    )
+    response.raise_for_status()
+    try:
+        body = json.loads(response.text.split('\n\n', 1)[1])
+        return json.loads(body[0][2])[1]
+    except (IndexError, TypeError, ValueError):
+        return None
+
+
+class GNewsResolver:
+    """Bounded, cached network fallback for ids that cannot be decoded offline.
+
+    Resolved ids are stored permanently in a ResponseCache, so each id costs network
+    round-trips at most once; at most `limit` new ids are looked up per call.
+    """
+
+    def __init__(self, cache: Optional[ResponseCache] = None, limit: Optional[int] = None):
+        self.cache = cache if cache is not None else ResponseCache(config.URL_CACHE_DIR, ttl=0, max_bytes=0)
+        self.limit = config.GNEWS_RESOLVE_LIMIT if limit is None else limit
+        self.limiter = TokenBucket(config.GNEWS_RESOLVE_REQUESTS_PER_SECOND, capacity=1)
+        self.session = requests.Session()
+
+    def resolve_one(self, article_id: str) -> Optional[str]:
+        try:
+            return self.cache.call(GNEWS_RESOLVE_URL, {'id': article_id},
+                                   lambda: resolve_gnews_id(article_id, self.session), self.limiter)
+        except requests.exceptions.RequestException as e:
+            print(f"  ⚠ Could not resolve {article_id[:24]}...: {e}")
+            return None
+
+    def resolve(self, article_ids: List[str]) -> Dict[str, Optional[str]]:
+        resolved = {i: self.cache.get(GNEWS_RESOLVE_URL, {'id': i}) for i in article_ids}
+        missing = [i for i, url in resolved.items() if url is None]
+        if self.cache.replay:
+            missing = []
+        elif len(missing) > self.limit:
+            print(f"  Resolving {self.limit} of {len(missing)} unresolved ids (GNEWS_RESOLVE_LIMIT)")
+            missing = missing[:self.limit]
+        with ThreadPoolExecutor(max_workers=config.GNEWS_RESOLVE_WORKERS) as pool:
+            for article_id, url in zip(missing, pool.map(self.resolve_one, missing)):
+                resolved[article_id] = url
+        return resolved
+
+
+def canonicalize_urls(urls: pd.Series, resolver: Optional[GNewsResolver] = None, verbose: bool = True) -> pd.Series:
+    """Vectorized canonical_url column for a Series of article URLs.
+
+    Google News ids are extracted with one regex pass and decoded once per unique id;
+    ids that cannot be decoded locally go to `resolver` (skipped when None) and keep
+    their Google News URL if still unresolved. Every URL is then normalized once per
+    unique value and mapped back.
+    """
+    urls = urls.astype('string')
+    ids = urls.str.extract(GNEWS_ID_PATTERN, expand=False)
+    unique_ids = ids.dropna().unique()
+    publisher = {i: decode_gnews_id(i) for i in unique_ids}
+
+    undecoded = [i for i, url in publisher.items() if url is None]
+    if undecoded and resolver is not None:
+        publisher.update(resolver.resolve(undecoded))
+
+    decoded = sum(1 for url in publisher.values() if url)
+    if len(unique_ids) and verbose:
+        print(f"Google News ids: {decoded}/{len(unique_ids)} resolved to publisher URLs")
+
+    resolved = ids.map(publisher).astype('string')
+    targets = resolved.fillna(urls)
+    unique_targets = targets.dropna().unique()
+    canonical = dict(zip(unique_targets, map(canonical_url, unique_targets)))
+    return targets.map(canonical).fillna('').astype(str)
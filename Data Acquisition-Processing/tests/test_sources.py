@@ -0,0 +1,28 @@
+import sys
+import os
+
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.sources import SourceClassifier
+
+
+@pytest.mark.parametrize('source', ['japantimes.co.jp', 'japantoday.com', 'app.buzzsumo.com',
+                                    'Apple Insider', 'snapchat'])
+def test_short_alias_does_not_match_inside_names(source):
+    # 'ap' (Associated Press, registry v2) is under 5 characters, so it only matches exactly
+    assert SourceClassifier().leaning(source) == 'Other'
+
+
+@pytest.mark.parametrize('source', ['AP', ' ap ', 'Associated Press', 'apnews.com'])
+def test_short_alias_matches_exactly(source):
+    assert SourceClassifier().leaning(source) == 'Center'
+
+
+def test_short_substrings_still_match():
+    # The short_substrings rule keeps e.g. 'cnn' matching inside longer names
+    classified = SourceClassifier().classify(pd.Series(['CNN International', 'snapchat']))
+    assert classified['leaning'].tolist() == ['Left', 'Other']
@@ -4,33 +4,40 @@ import time
 import csv
 from urllib.parse import urlparse
 import os
+import hashlib
+import re
+import argparse
+import asyncio
+import aiohttp
+from concurrent.futures import ProcessPoolExecutor
+
+# Optional faster parser backends
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
 
 URLS = []  # Left blank for space
 
+HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
+OUTPUT_FILE = "scraped_articles.tsv"
+FIELDNAMES = ["URL", "Source", "Headline", "Summary"]
+DOMAIN_DELAY = 5  # minimum seconds between two requests to the same host
+CONCURRENCY = 16  # requests in flight across all hosts (async mode)
+CONNECTIONS_PER_HOST = 2
+SUMMARY_MIN_LENGTH = 75
 
-def scrape_article(url):
-    # Fetch HTML content
-    try:
-        headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        html_content = response.text
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching URL: {e}")
-        return None
 
-    # Extract Source
-    source_name = "source not found"  # default value
-    try:
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc
-        clean_domain = domain.replace("www.", "")
-        source_name = clean_domain.split(".")[0].capitalize()
-    except Exception as e:
-        print(f"Could not parse the source from URL: {e}")
+def is_summary(text):
+    return len(text) > SUMMARY_MIN_LENGTH and "." in text
 
-    # Parse HTML content
-    soup = BeautifulSoup(html_content, "html.parser")
+
+def parse_bs4(html_content, features="html.parser"):
+    soup = BeautifulSoup(html_content, features)
     headline = "Headline Not Found"  # Default value
     h1_tag = soup.find("h1")
     if h1_tag:
@@ -40,42 +47,161 @@ def scrape_article(url):
         if title_tag:
             headline = title_tag.get_text(strip=True).split(" | ")[0]
 
-    # Find the summary (or first paragraph)
+    # Walk paragraphs in document order and stop at the first summary candidate
     summary = "summary not found"  # default value
-    paragraphs = soup.find_all("p")
-    for p in paragraphs:
+    p = soup.find("p")
+    while p is not None:
         text = p.get_text(strip=True)
-        if len(text) > 75 and "." in text:
+        if is_summary(text):
             summary = text
             break
-    return {"URL": url, "Source": source_name, "Headline": headline, "Summary": summary}
+        p = p.find_next("p")
+    return headline, summary
 
 
-def main(urls):
-    all_results = []
-    print(f"Starting to scrape {len(urls)} articles")
+XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>")
+
+
+def _lxml_text(element):
+    # Same result as BeautifulSoup's get_text(strip=True)
+    return "".join(t.strip() for t in element.itertext())
+
+
+def parse_lxml(html_content):
+    headline, summary = "Headline Not Found", "summary not found"
+    if not html_content.strip():
+        return headline, summary
+    # lxml refuses str input that carries an XML encoding declaration
+    doc = lxml_html.fromstring(XML_DECLARATION.sub("", html_content, count=1))
+    # html.parser's get_text() leaves out script and style text; match it
+    for element in doc.iter("script", "style"):
+        element.text = None
+    h1_tag = next(doc.iter("h1"), None)
+    if h1_tag is not None:
+        headline = _lxml_text(h1_tag)
+    else:
+        title_tag = next(doc.iter("title"), None)
+        if title_tag is not None:
+            headline = _lxml_text(title_tag).split(" | ")[0]
+
+    for p in doc.iter("p"):
+        text = _lxml_text(p)
+        if is_summary(text):
+            summary = text
+            break
+    return headline, summary
+
+
+def parse_selectolax(html_content):
+    headline, summary = "Headline Not Found", "summary not found"
+    tree = HTMLParser(html_content)
+    tree.strip_tags(["script", "style"])
+    h1_tag = tree.css_first("h1")
+    if h1_tag is not None:
+        headline = h1_tag.text(separator="", strip=True)
+    else:
+        title_tag = tree.css_first("title")
+        if title_tag is not None:
+            headline = title_tag.text(separator="", strip=True).split(" | ")[0]
+
+    for p in tree.css("p"):
+        text = p.text(separator="", strip=True)
+        if is_summary(text):
+            summary = text
+            break
+    return headline, summary
+
+
+PARSER_BACKENDS = {"html.parser": parse_bs4}
+if lxml_html is not None:
+    PARSER_BACKENDS["lxml"] = parse_lxml
+if HTMLParser is not None:
+    PARSER_BACKENDS["selectolax"] = parse_selectolax
+# lxml and selectolax are optional and faster; pick them with --parser
+# (scripts/bench_parsers.py checks they agree with html.parser)
+PARSER = "html.parser"
+
+
+def source_from_url(url):
+    source_name = "source not found"  # default value
+    try:
+        parsed_url = urlparse(url)
+        domain = parsed_url.netloc
+        clean_domain = domain.replace("www.", "")
+        source_name = clean_domain.split(".")[0].capitalize()
+    except Exception as e:
+        print(f"Could not parse the source from URL: {e}")
+    return source_name
+
+
+def extract_article(html_content, url, parser=PARSER):
+    try:
+        headline, summary = PARSER_BACKENDS[parser](html_content)
+    except Exception as e:
+        # One malformed page should not stop the run
+        print(f"Error parsing {url}: {e}")
+        return None
+    return {
+        "URL": url,
+        "Source": source_from_url(url),
+        "Headline": headline,
+        "Summary": summary,
+    }
+
 
-    output_file = "scraped_articles.tsv"
+def save_fixture(html_content, url, directory):
+    """Keep the raw page so parser backends can be benchmarked offline."""
+    os.makedirs(directory, exist_ok=True)
+    name = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16] + ".html"
+    with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+        f.write(html_content)
+
+
+def scrape_article(url, parser=PARSER, save_html=None):
+    # Fetch HTML content
+    try:
+        response = requests.get(url, headers=HEADERS, timeout=10)
+        response.raise_for_status()
+        html_content = response.text
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching URL: {e}")
+        return None
+    if save_html:
+        save_fixture(html_content, url, save_html)
+    return extract_article(html_content, url, parser)
+
+
+def open_output(output_file):
     file_exists = os.path.exists(output_file)
-    fieldnames = ["URL", "Source", "Headline", "Summary"]
-
-    with open(output_file, "a", newline="", encoding="utf-8") as tsvfile:
-        writer = csv.DictWriter(
-            tsvfile,
-            fieldnames=fieldnames,
-            delimiter="\t",
-            quoting=csv.QUOTE_MINIMAL,
-        )
-        if not file_exists:
-            print(f"File '{output_file}' created. Writing header...")
-            writer.writeheader()
-        else:
-            print(f"File '{output_file}' found. Appending rows...")
+    tsvfile = open(output_file, "a", newline="", encoding="utf-8")
+    writer = csv.DictWriter(
+        tsvfile,
+        fieldnames=FIELDNAMES,
+        delimiter="\t",
+        quoting=csv.QUOTE_MINIMAL,
+    )
+    if not file_exists:
+        print(f"File '{output_file}' created. Writing header...")
+        writer.writeheader()
+    else:
+        print(f"File '{output_file}' found. Appending rows...")
+    return tsvfile, writer
+
+
+def main(
+    urls,
+    output_file=OUTPUT_FILE,
+    domain_delay=DOMAIN_DELAY,
+    parser=PARSER,
+    save_html=None,
+):
+    print(f"Starting to scrape {len(urls)} articles")
 
-        print(f"Starting to scrape {len(urls)} articles")
+    tsvfile, writer = open_output(output_file)
+    with tsvfile:
         for i, url in enumerate(urls):
             print(f"Processing article {i+1}/{len(urls)}: {url}")
-            result = scrape_article(url)
+            result = scrape_article(url, parser, save_html)
             if result:
                 try:
                     writer.writerow(result)
@@ -83,11 +209,178 @@ def main(urls):
                     print(f"Error writing row for {url}: {e}")
             else:
                 print(f"Skipping failed URL: {url}")
-            time.sleep(5)
+            time.sleep(domain_delay)
+    print(
+        f"Successfully processed files. New rows successfully appended to {output_file}"
+    )
+
+
+class DomainThrottle:
+    """Spaces requests to the same host at least `delay` seconds apart.
+
+    Different hosts do not wait on each other, so total time is bounded by the
+    busiest domain instead of the number of URLs.
+    """
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.locks = {}
+        self.last_request = {}
+
+    async def wait(self, host):
+        lock = self.locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            loop = asyncio.get_running_loop()
+            elapsed = loop.time() - self.last_request.get(host, float("-inf"))
+            if elapsed < self.delay:
+                await asyncio.sleep(self.delay - elapsed)
+            self.last_request[host] = loop.time()
+
+
+async def scrape_article_async(session, url, parser=PARSER, pool=None, save_html=None):
+    try:
+        async with session.get(url, headers=HEADERS) as response:
+            response.raise_for_status()
+            html_content = await response.text(errors="replace")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Error fetching URL {url}: {e}")
+        return None
+    if save_html:
+        save_fixture(html_content, url, save_html)
+    if pool is None:
+        return extract_article(html_content, url, parser)
+    # Parsing is CPU-bound; run it in the process pool so the event loop keeps fetching
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, extract_article, html_content, url, parser)
+
+
+async def main_async(
+    urls,
+    output_file=OUTPUT_FILE,
+    concurrency=CONCURRENCY,
+    domain_delay=DOMAIN_DELAY,
+    parser=PARSER,
+    workers=None,
+    save_html=None,
+):
+    print(
+        f"Starting to scrape {len(urls)} articles "
+        f"(concurrency={concurrency}, {domain_delay}s per-domain delay)"
+    )
+    throttle = DomainThrottle(domain_delay)
+    semaphore = asyncio.Semaphore(concurrency)
+    # One pooled connector; limit_per_host gives each host its own small connection pool
+    connector = aiohttp.TCPConnector(
+        limit=concurrency, limit_per_host=CONNECTIONS_PER_HOST
+    )
+    timeout = aiohttp.ClientTimeout(total=10)
+
+    async def bounded(url):
+        # Wait for the host's turn before taking a slot, so a busy domain
+        # cannot hold every slot while it sleeps
+        await throttle.wait(urlparse(url).netloc.lower())
+        async with semaphore:
+            return url, await scrape_article_async(
+                session, url, parser, pool, save_html
+            )
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 0 else None
+    tsvfile, writer = open_output(output_file)
+    with tsvfile:
+        async with aiohttp.ClientSession(
+            connector=connector, timeout=timeout
+        ) as session:
+            tasks = [asyncio.create_task(bounded(url)) for url in urls]
+            # Rows are streamed to the TSV in completion order
+            for done, task in enumerate(asyncio.as_completed(tasks), 1):
+                url, result = await task
+                if result:
+                    try:
+                        writer.writerow(result)
+                        tsvfile.flush()
+                    except ValueError as e:
+                        print(f"Error writing row for {url}: {e}")
+                    print(f"[{done}/{len(urls)}] {url}")
+                else:
+                    print(f"[{done}/{len(urls)}] Skipping failed URL: {url}")
+    if pool is not None:
+        pool.shutdown()
     print(
         f"Successfully processed files. New rows successfully appended to {output_file}"
     )
 
 
+def load_urls(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            # Prefer publisher URLs decoded by canonicalize_urls.py over Google News redirects
+            rows = list(csv.DictReader(f))
+            return [
+                row.get("canonical_url") or row.get("url")
+                for row in rows
+                if row.get("canonical_url") or row.get("url")
+            ]
+        return [line.strip() for line in f if line.strip()]
+
+
 if __name__ == "__main__":
-    main(URLS)
+    parser = argparse.ArgumentParser(
+        description="Scrape headline and summary from article URLs"
+    )
+    parser.add_argument(
+        "--urls-file",
+        help="Text file with one URL per line, or a CSV with canonical_url/url columns",
+    )
+    parser.add_argument(
+        "--output", default=OUTPUT_FILE, help="TSV file to append rows to"
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Scrape concurrently with per-domain politeness",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=CONCURRENCY,
+        help="Maximum requests in flight (async mode)",
+    )
+    parser.add_argument(
+        "--domain-delay",
+        type=float,
+        default=DOMAIN_DELAY,
+        help="Minimum seconds between requests to one host",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=sorted(PARSER_BACKENDS),
+        default=PARSER,
+        help="HTML parser backend",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes for HTML extraction in async mode (0 = parse inline)",
+    )
+    parser.add_argument(
+        "--save-html", help="Directory to keep fetched pages in (benchmark fixtures)"
+    )
+    args = parser.parse_args()
+
+    urls = load_urls(args.urls_file) if args.urls_file else URLS
+    if args.use_async:
+        asyncio.run(
+            main_async(
+                urls,
+                args.output,
+                args.concurrency,
+                args.domain_delay,
+                args.parser,
+                args.workers,
+                args.save_html,
+            )
+        )
+    else:
+        main(urls, args.output, args.domain_delay, args.parser, args.save_html)
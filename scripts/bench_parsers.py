@@ -0,0 +1,88 @@
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from article_scraper import PARSER_BACKENDS, extract_article
+
+FIXTURES_DIR = (
+    "html_fixtures"  # filled by: article_scraper.py --save-html html_fixtures
+)
+
+
+def load_fixtures(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def bench_backend(pages, parser, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [extract_article(html, name, parser) for name, html in pages]
+    elapsed = time.perf_counter() - start
+    return len(pages) * repeat / elapsed, results
+
+
+def bench_pool(pages, parser, workers, repeat):
+    names = [name for name, _ in pages] * repeat
+    htmls = [html for _, html in pages] * repeat
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Warm up the workers so process start-up is not timed
+        list(
+            pool.map(
+                extract_article, htmls[:workers], names[:workers], [parser] * workers
+            )
+        )
+        start = time.perf_counter()
+        list(
+            pool.map(extract_article, htmls, names, [parser] * len(htmls), chunksize=8)
+        )
+    return len(htmls) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pages/second for each HTML parser backend over saved fixtures"
+    )
+    parser.add_argument(
+        "--fixtures", default=FIXTURES_DIR, help="Directory of *.html files"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Passes over the fixtures"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=0, help="Also time a process pool of this size"
+    )
+    args = parser.parse_args()
+
+    pages = load_fixtures(args.fixtures)
+    if not pages:
+        print(f"No fixtures in '{args.fixtures}'.")
+        print(
+            "Collect some with: python article_scraper.py --urls-file urls.txt --save-html html_fixtures"
+        )
+        return
+    total_mb = sum(len(html) for _, html in pages) / 1e6
+    print(f"{len(pages)} fixtures ({total_mb:.1f} MB), {args.repeat} passes\n")
+
+    _, reference = bench_backend(pages, "html.parser", 1)
+    print(f"{'backend':12s} {'pages/s':>10s} {'pool pages/s':>14s}  agreement")
+    for backend in PARSER_BACKENDS:
+        rate, results = bench_backend(pages, backend, args.repeat)
+        same = sum(r == ref for r, ref in zip(results, reference))
+        pool_rate = (
+            f"{bench_pool(pages, backend, args.workers, args.repeat):14.1f}"
+            if args.workers
+            else f"{'-':>14s}"
+        )
+        print(
+            f"{backend:12s} {rate:10.1f} {pool_rate}  {same}/{len(pages)} match html.parser"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Standalone dataset reader for the scripts in this folder.
+
+Reads a dataset by its .csv or .parquet name the way the pipeline's src/storage.py does
+(the Parquet copy when it is at least as new as the CSV), without importing the pipeline
+package, whose config creates its data directories on import.
+"""
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (pandas needs it for Parquet)
+except ImportError:
+    pyarrow = None
+
+
+def read_dataset(path, columns=None):
+    stem = os.path.splitext(path)[0]
+    parquet, csv = stem + ".parquet", stem + ".csv"
+    columns = list(columns) if columns is not None else None
+    if pyarrow is not None and os.path.exists(parquet) and (
+        not os.path.exists(csv) or os.path.getmtime(parquet) >= os.path.getmtime(csv)
+    ):
+        return pd.read_parquet(parquet, columns=columns)
+    usecols = (lambda c: c in columns) if columns is not None else None
+    return pd.read_csv(csv, usecols=usecols)
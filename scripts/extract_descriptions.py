@@ -1,6 +1,8 @@
-import pandas as pd
 import os
 
+# Parquet when present, CSV otherwise (standalone; does not import the pipeline package)
+from dataset_loader import read_dataset
+
 INPUT_FILE = "ANNOTATED_trump_dataset_500.csv"
 POS_OUTPUT_TXT = "pos_descriptions.txt"
 NEG_OUTPUT_TXT = "neg_descriptions.txt"
@@ -20,12 +22,12 @@ def extract_descriptions(filter_col, description_col, target_value):
     safe_name = target_value.strip().lower().replace(" ", "_")
     output_txt = f"{safe_name}_descriptions.txt"
     try:
-        df = pd.read_csv(INPUT_FILE, low_memory=False)
+        df = read_dataset(INPUT_FILE, columns=[filter_col, description_col])
         filtered_df = df[
             df[filter_col].astype(str).str.strip().str.upper() == sentiment_upper
         ]
         # Extract descriptions
-        descriptions = filtered_df[description_col].astype(str).tolist()
+        descriptions = filtered_df[description_col].dropna().astype(str).tolist()
         # Combine descriptions
         combined_text = "\n\n".join(descriptions)
 
@@ -1,7 +1,9 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+# Parquet when present, CSV otherwise (standalone; does not import the pipeline package)
+from dataset_loader import read_dataset
+
 # Define the path to the uploaded file.
 FILE_PATH = "../data/ANNOTATED_trump_dataset_500.csv"
 # The column we want to analyze
@@ -14,8 +16,8 @@ def plot_topic_distribution(file_path, column_name):
     column, and plots the results as a horizontal bar chart.
     """
     try:
-        # Load the CSV file into a pandas DataFrame
-        df = pd.read_csv(file_path)
+        # Load only the column being plotted
+        df = read_dataset(file_path, columns=[column_name])
     except FileNotFoundError:
         print(f"Error: The file '{file_path}' was not found.")
         return
@@ -89,7 +91,7 @@ def plot_sentiment_distribution(file_path, column_name):
     """
     try:
         # 1. Load the data
-        df = pd.read_csv(file_path)
+        df = read_dataset(file_path, columns=[column_name])
         print(f"Successfully loaded {file_path}. Total rows: {len(df)}")
 
         if column_name not in df.columns:
@@ -5,6 +5,9 @@ import sys
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+# Parquet when present, CSV otherwise (standalone; does not import the pipeline package)
+from dataset_loader import read_dataset
+
 INPUT_PATH = "../data/ANNOTATED_trump_dataset_500.csv"
 TEXT_COLS = ["title", "description"]
 TOPIC_COLS = "PRIMARY_TOPIC"
@@ -27,7 +30,7 @@ TOP_10 = 10
 def load_and_prepare_data(input_path, text_cols, topic_cols, expected_cats):
     try:
         # Load Data:
-        df = pd.read_csv(INPUT_PATH)
+        df = read_dataset(input_path, columns=text_cols + [topic_cols])
         # Fill missing values with empty strings
         for col in text_cols:
             df[col] = df[col].fillna("")
@@ -42,7 +45,9 @@ def load_and_prepare_data(input_path, text_cols, topic_cols, expected_cats):
             )
         # Group by topic and combine all text into 1 string per topic
         topic_text_agg = (
-            df.groupby(topic_cols)["combined_text"].apply(" ".join).to_dict()
+            df.groupby(topic_cols, observed=True)["combined_text"]
+            .apply(" ".join)
+            .to_dict()
         )
         if not topic_text_agg:
             raise ValueError(